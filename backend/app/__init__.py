@@ -14,11 +14,21 @@ def create_app(config_class=Config):
     app = Flask(__name__)
     app.config.from_object(config_class)
 
-    # Initialize extensions
+    # Initialize extensions; SQLite runs in WAL mode, server databases pre-ping
+    from app.utils.db_config import engine_options, install_sqlite_pragmas
+    app.config.setdefault(
+        'SQLALCHEMY_ENGINE_OPTIONS', engine_options(app.config['SQLALCHEMY_DATABASE_URI'])
+    )
     db.init_app(app)
+    with app.app_context():
+        install_sqlite_pragmas(db.engine)
     CORS(app)
     socketio.init_app(app, cors_allowed_origins="*")
 
+    # Live auction state backend (memory, sql or redis)
+    from app.services.state_store import init_state_store
+    init_state_store(app)
+
     # Register error handlers
     from app.utils.error_handlers import register_error_handlers
     register_error_handlers(app)
@@ -32,10 +42,17 @@ def create_app(config_class=Config):
 
     # Import core models to ensure they're registered with SQLAlchemy
     with app.app_context():
-        from app.models import room, team, player, auction_player, team_rating, simple_user
+        from app.models import (
+            room, team, player, auction_player, team_rating, simple_user, auction_state,
+            results_snapshot
+        )
         # Note: Additional models (user, achievement, trade, tournament, alliance, 
-        # notification, auction_history) are available but not imported by default
+        # notification) are available but not imported by default
         # to avoid relationship conflicts with the core spec models
         db.create_all()
 
+        # Serve players from memory; reloaded when the table changes
+        from app.services.player_catalog import load_player_catalog
+        load_player_catalog()
+
     return app
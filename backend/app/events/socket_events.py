@@ -1,11 +1,121 @@
 """WebSocket event handlers for real-time auction communication."""
-from flask import request
+import threading
+from flask import request, current_app
 from flask_socketio import emit, join_room, leave_room
 from app import socketio, db
 from app.services.room_service import get_room_participants, start_auction as start_auction_service
-from app.services.auction_service import place_bid as place_bid_service, present_next_player, handle_timer_expiry
-from app.models.room import Room
-from app.models.team import Team
+from app.services.auction_service import (
+    place_bid as place_bid_service, present_next_player, handle_timer_expiry, get_timer_duration,
+    get_bid_seq, get_upcoming_players
+)
+from app.services.analysis_queue import submit_room_analysis
+from app.services.timer_scheduler import timer_scheduler
+from app.services.player_catalog import get_player_data
+
+
+# Seconds between scheduler polls in the timer background task
+TIMER_TICK = 0.1
+
+_timer_loop_started = False
+_timer_loop_lock = threading.Lock()
+
+
+def start_timer_loop(app):
+    """Start the background task that settles expired lots (once per process)."""
+    global _timer_loop_started
+    
+    with _timer_loop_lock:
+        if _timer_loop_started:
+            return
+        _timer_loop_started = True
+    
+    socketio.start_background_task(_run_timer_loop, app)
+
+
+def _run_timer_loop(app):
+    """Settle every lot whose server-side deadline has passed."""
+    while True:
+        for room_code in timer_scheduler.pop_expired():
+            with app.app_context():
+                try:
+                    settle_lot(room_code)
+                except Exception:
+                    db.session.rollback()
+                    app.logger.exception(f"Failed to settle lot in room {room_code}")
+                finally:
+                    db.session.remove()
+        socketio.sleep(TIMER_TICK)
+
+
+def settle_lot(room_code):
+    """
+    Sell the current lot to the highest bidder and present the next player.
+    
+    Nothing happens unless the lot's shared deadline has passed, so stale
+    timers and duplicate client reports cannot close a lot early.
+    
+    Args:
+        room_code: Code of the room
+        
+    Returns:
+        dict or None: Information about the sold player, or None if no lot
+            was settled
+    """
+    # Handle timer expiry and assign player
+    sold_info = handle_timer_expiry(room_code, check_deadline=True)
+    
+    if not sold_info:
+        return None
+    
+    # Broadcast player sold event; a lot whose player no longer exists is
+    # skipped without one
+    if sold_info['player'] is not None:
+        socketio.emit('player_sold', {
+            'player': {
+                'id': sold_info['player'].id,
+                'name': sold_info['player'].name,
+                'role': sold_info['player'].role
+            },
+            'sold_to': sold_info['sold_to'],
+            'sold_price': sold_info['sold_price'],
+            'team_id': sold_info['team_id'],
+            'requeued': sold_info['requeued']
+        }, room=room_code)
+    
+    # Present next player
+    next_player = present_next_player(room_code)
+    if next_player:
+        socketio.emit('player_presented', {
+            'player': get_player_data(next_player.id),
+            'current_bid': next_player.base_price,
+            'timer_duration': get_timer_duration(room_code),
+            'seq': get_bid_seq(room_code),
+            'up_next': serialize_up_next(room_code)
+        }, room=room_code)
+    else:
+        # Auction completed - queue AI analysis off the socket thread
+        queued, queue_message, job_ids = submit_room_analysis(room_code)
+        
+        socketio.emit('auction_completed', {
+            'message': 'All players have been sold!',
+            'room_code': room_code,
+            'analysis_jobs': job_ids
+        }, room=room_code)
+        
+        if not queued:
+            socketio.emit('error', {'message': f'Failed to queue analysis: {queue_message}'}, room=room_code)
+    
+    return sold_info
+
+
+def serialize_up_next(room_code):
+    """Summarize the next few lots for the "up next" display."""
+    return [{
+        'id': player.id,
+        'name': player.name,
+        'role': player.role,
+        'base_price': player.base_price
+    } for player in get_upcoming_players(room_code)]
 
 
 @socketio.on('connect')
@@ -129,21 +239,16 @@ def handle_start_auction(data):
     player = present_next_player(room_code)
     if player:
         emit('player_presented', {
-            'player': {
-                'id': player.id,
-                'name': player.name,
-                'role': player.role,
-                'country': player.country,
-                'base_price': player.base_price,
-                'batting_score': player.batting_score,
-                'bowling_score': player.bowling_score,
-                'overall_score': player.overall_score,
-                'is_overseas': player.is_overseas
-            },
+            'player': get_player_data(player.id),
             'current_bid': player.base_price,
-            'timer_duration': 60
+            'timer_duration': get_timer_duration(room_code),
+            'seq': get_bid_seq(room_code),
+            'up_next': serialize_up_next(room_code)
         }, room=room_code)
     
+    # Lots now close on the server clock
+    start_timer_loop(current_app._get_current_object())
+    
     print(f"Auction started in room {room_code}")
 
 
@@ -154,7 +259,8 @@ def handle_place_bid(data):
     
     Expected data: {
         'room_code': str,
-        'username': str
+        'username': str,
+        'seq': int (optional, sequence number of the state the bidder saw)
     }
     """
     room_code = data.get('room_code')
@@ -165,32 +271,29 @@ def handle_place_bid(data):
         return
     
     # Place the bid
-    result = place_bid_service(room_code, username)
+    result = place_bid_service(room_code, username, data.get('seq'))
     
     if not result.success:
-        emit('bid_error', {'message': result.message}, room=request.sid)
+        emit('bid_error', {'message': result.message, 'seq': result.seq}, room=request.sid)
         return
     
-    # Get team info for purse update
-    room = Room.query.filter_by(code=room_code).first()
-    if room:
-        team = Team.query.filter_by(room_id=room.id, username=username).first()
-        if team:
-            # Broadcast bid placed event to all users
-            emit('bid_placed', {
-                'username': username,
-                'bid_amount': result.new_bid,
-                'current_highest': result.new_bid,
-                'highest_bidder': result.highest_bidder
-            }, room=room_code)
-            
-            # Broadcast purse update
-            emit('purse_updated', {
-                'username': username,
-                'team_id': team.id,
-                'new_purse': team.purse_left,
-                'team_name': team.team_name
-            }, room=room_code)
+    # Broadcast bid placed event to all users
+    emit('bid_placed', {
+        'username': username,
+        'bid_amount': result.new_bid,
+        'current_highest': result.new_bid,
+        'highest_bidder': result.highest_bidder,
+        'timer_remaining': result.timer_remaining,
+        'seq': result.seq
+    }, room=room_code)
+    
+    # Broadcast purse update from the room's team ledger
+    emit('purse_updated', {
+        'username': username,
+        'team_id': result.team['team_id'],
+        'new_purse': result.team['purse_left'],
+        'team_name': result.team['team_name']
+    }, room=room_code)
     
     print(f"Bid placed by {username} in room {room_code}: {result.new_bid}")
 
@@ -198,7 +301,11 @@ def handle_place_bid(data):
 @socketio.on('timer_expired')
 def handle_timer_expired(data):
     """
-    Handle timer expiry for current player.
+    Handle a client's report that the current lot's timer ran out.
+    
+    Lots are settled by the server-side scheduler; this only settles early
+    if the lot's shared deadline has already passed and the lot is still
+    open, so duplicate reports from many clients cannot sell a lot twice.
     
     Expected data: {
         'room_code': str
@@ -210,48 +317,8 @@ def handle_timer_expired(data):
         emit('error', {'message': 'Room code is required'})
         return
     
-    # Handle timer expiry and assign player
-    sold_info = handle_timer_expiry(room_code)
-    
-    if sold_info:
-        # Broadcast player sold event
-        emit('player_sold', {
-            'player': {
-                'id': sold_info['player'].id,
-                'name': sold_info['player'].name,
-                'role': sold_info['player'].role
-            },
-            'sold_to': sold_info['sold_to'],
-            'sold_price': sold_info['sold_price'],
-            'team_id': sold_info['team_id']
-        }, room=room_code)
-        
-        # Present next player
-        next_player = present_next_player(room_code)
-        if next_player:
-            emit('player_presented', {
-                'player': {
-                    'id': next_player.id,
-                    'name': next_player.name,
-                    'role': next_player.role,
-                    'country': next_player.country,
-                    'base_price': next_player.base_price,
-                    'batting_score': next_player.batting_score,
-                    'bowling_score': next_player.bowling_score,
-                    'overall_score': next_player.overall_score,
-                    'is_overseas': next_player.is_overseas
-                },
-                'current_bid': next_player.base_price,
-                'timer_duration': 30
-            }, room=room_code)
-        else:
-            # Auction completed
-            emit('auction_completed', {
-                'message': 'All players have been sold!',
-                'room_code': room_code
-            }, room=room_code)
-    
-    print(f"Timer expired in room {room_code}")
+    if settle_lot(room_code):
+        print(f"Timer expired in room {room_code}")
 
 
 @socketio.on('get_auction_state')
@@ -275,22 +342,13 @@ def handle_get_auction_state(data):
     
     player_data = None
     if state.current_player:
-        player_data = {
-            'id': state.current_player.id,
-            'name': state.current_player.name,
-            'role': state.current_player.role,
-            'country': state.current_player.country,
-            'base_price': state.current_player.base_price,
-            'batting_score': state.current_player.batting_score,
-            'bowling_score': state.current_player.bowling_score,
-            'overall_score': state.current_player.overall_score,
-            'is_overseas': state.current_player.is_overseas
-        }
+        player_data = get_player_data(state.current_player.id)
     
     emit('auction_state', {
         'current_player': player_data,
         'current_bid': state.current_bid,
         'highest_bidder': state.highest_bidder,
         'timer_remaining': state.timer_remaining,
-        'auction_complete': state.auction_complete
+        'auction_complete': state.auction_complete,
+        'seq': state.seq
     })
@@ -6,6 +6,8 @@ from app.models.player import Player
 from app.models.auction_player import AuctionPlayer
 from app.models.team_player import TeamPlayer
 from app.models.team_rating import TeamRating
+from app.models.auction_state import AuctionStateRecord
+from app.models.results_snapshot import ResultsSnapshot
 
 __all__ = [
     'User',
@@ -14,5 +16,7 @@ __all__ = [
     'Player',
     'AuctionPlayer',
     'TeamPlayer',
-    'TeamRating'
+    'TeamRating',
+    'AuctionStateRecord',
+    'ResultsSnapshot'
 ]
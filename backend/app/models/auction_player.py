@@ -6,6 +6,10 @@ from app import db
 class AuctionPlayer(db.Model):
     """AuctionPlayer model for room-specific player state."""
     __tablename__ = 'auction_players'
+    __table_args__ = (
+        db.UniqueConstraint('room_id', 'player_id', name='uq_auction_players_room_player'),
+        db.Index('ix_auction_players_room_sold', 'room_id', 'is_sold'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     room_id = db.Column(db.Integer, db.ForeignKey('rooms.id'), nullable=False)
@@ -0,0 +1,17 @@
+"""AuctionStateRecord model."""
+from datetime import datetime
+from app import db
+
+
+class AuctionStateRecord(db.Model):
+    """Live auction state for a room, used by the SQL state store."""
+    __tablename__ = 'auction_states'
+
+    room_code = db.Column(db.String(20), primary_key=True)
+    current_player_id = db.Column(db.Integer, nullable=True)
+    current_bid = db.Column(db.Float, nullable=True)
+    highest_bidder = db.Column(db.String(100), nullable=True)
+    lot_deadline = db.Column(db.Float, nullable=True)  # Unix time the current lot closes
+    bid_seq = db.Column(db.Integer, nullable=False, default=0)
+    settings = db.Column(db.JSON, nullable=False, default=dict)  # bid_increment, timer_duration, ...
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -0,0 +1,18 @@
+"""ResultsSnapshot model."""
+from datetime import datetime
+from app import db
+
+
+class ResultsSnapshot(db.Model):
+    """Results of a completed room, stored once and served as they are."""
+    __tablename__ = 'results_snapshots'
+    # Room codes are reused, so a snapshot belongs to one room row and code
+    __table_args__ = (db.UniqueConstraint('room_id', 'room_code'),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    room_id = db.Column(db.Integer, db.ForeignKey('rooms.id', ondelete='CASCADE'),
+                        nullable=False)
+    room_code = db.Column(db.String(10), nullable=False)
+    etag = db.Column(db.String(40), nullable=False)
+    results = db.Column(db.JSON, nullable=False)  # room_code, teams and winner
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
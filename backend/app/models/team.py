@@ -6,6 +6,9 @@ from app import db
 class Team(db.Model):
     """Team model for user teams in auction."""
     __tablename__ = 'teams'
+    __table_args__ = (
+        db.UniqueConstraint('room_id', 'username', name='uq_teams_room_username'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     room_id = db.Column(db.Integer, db.ForeignKey('rooms.id'), nullable=False)
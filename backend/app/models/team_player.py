@@ -6,6 +6,10 @@ from app import db
 class TeamPlayer(db.Model):
     """TeamPlayer model for players in a team."""
     __tablename__ = 'team_players'
+    __table_args__ = (
+        db.UniqueConstraint('team_id', 'player_id', name='uq_team_players_team_player'),
+        db.Index('ix_team_players_team_xi', 'team_id', 'in_playing_xi'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     team_id = db.Column(db.Integer, db.ForeignKey('teams.id'), nullable=False)
@@ -1,28 +1,31 @@
 """Player-related API routes."""
-from flask import jsonify
+from flask import jsonify, request, Response
 from app.routes import api_bp
-from app.models.player import Player
+from app.services.player_catalog import get_player_catalog
 
 
 @api_bp.route('/players', methods=['GET'])
 def get_players():
-    """Get all players."""
+    """
+    Get all players.
+    
+    Served from the pre-encoded player catalog with an ETag, and gzipped
+    for clients that accept it.
+    """
     try:
-        players = Player.query.all()
+        catalog = get_player_catalog()
         
-        return jsonify({
-            'players': [{
-                'id': p.id,
-                'name': p.name,
-                'role': p.role,
-                'country': p.country,
-                'base_price': p.base_price,
-                'batting_score': p.batting_score,
-                'bowling_score': p.bowling_score,
-                'overall_score': p.overall_score,
-                'is_overseas': p.is_overseas
-            } for p in players]
-        }), 200
+        if request.if_none_match.contains(catalog.etag):
+            response = Response(status=304)
+        elif 'gzip' in request.accept_encodings:
+            response = Response(catalog.list_gzip, status=200, mimetype='application/json')
+            response.headers['Content-Encoding'] = 'gzip'
+        else:
+            response = Response(catalog.list_json, status=200, mimetype='application/json')
+        
+        response.set_etag(catalog.etag)
+        response.vary.add('Accept-Encoding')
+        return response
         
     except Exception as e:
         return jsonify({
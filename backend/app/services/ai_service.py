@@ -1,10 +1,10 @@
 """AI analysis service for team selection and rating."""
-from itertools import combinations
 from app import db
 from app.models.team import Team
 from app.models.team_player import TeamPlayer
 from app.models.player import Player
 from app.models.team_rating import TeamRating
+from app.services.xi_solver import solve_playing_xi
 
 
 def select_playing_xi(team_id):
@@ -34,30 +34,18 @@ def select_playing_xi(team_id):
     # Get player objects
     players = [Player.query.get(tp.player_id) for tp in team_players]
     
-    # Generate all possible 11-player combinations
-    best_combination = None
-    best_score = -1
-    
-    for combo in combinations(players, 11):
-        if is_valid_combination(combo):
-            score = sum(p.overall_score for p in combo)
-            if score > best_score:
-                best_score = score
-                best_combination = combo
+    # Solve for the best valid XI
+    best_combination = solve_playing_xi(players)
     
     if best_combination:
         # Mark players as in playing XI
+        selected_ids = {player.id for player in best_combination}
         for tp in team_players:
-            tp.in_playing_xi = False
-        
-        for player in best_combination:
-            tp = TeamPlayer.query.filter_by(team_id=team_id, player_id=player.id).first()
-            if tp:
-                tp.in_playing_xi = True
+            tp.in_playing_xi = tp.player_id in selected_ids
         
         db.session.commit()
         
-        return list(best_combination)
+        return best_combination
     
     return []
 
@@ -169,6 +157,31 @@ def calculate_team_rating(team_id):
     ).all()
     bench = [Player.query.get(tp.player_id) for tp in bench_tps]
     
+    # Store in database
+    team_rating = TeamRating.query.filter_by(team_id=team_id).first()
+    if not team_rating:
+        team_rating = TeamRating(team_id=team_id)
+        db.session.add(team_rating)
+    
+    for field, value in compute_rating_components(playing_xi, bench).items():
+        setattr(team_rating, field, value)
+    
+    db.session.commit()
+    
+    return team_rating
+
+
+def compute_rating_components(playing_xi, bench):
+    """
+    Compute team rating components from a playing XI and bench.
+    
+    Args:
+        playing_xi: List of Player objects in the playing XI
+        bench: List of Player objects on the bench
+        
+    Returns:
+        dict: Values for each TeamRating column
+    """
     # Calculate batting rating
     batting_players = [p for p in playing_xi if p.role in ['BAT', 'AR', 'WK']]
     batting_rating = sum(p.batting_score for p in batting_players) / len(batting_players) if batting_players else 0
@@ -200,22 +213,14 @@ def calculate_team_rating(team_id):
     # Assuming max possible overall_score is 100
     normalized_rating = min(100, max(0, overall_rating))
     
-    # Store in database
-    team_rating = TeamRating.query.filter_by(team_id=team_id).first()
-    if not team_rating:
-        team_rating = TeamRating(team_id=team_id)
-        db.session.add(team_rating)
-    
-    team_rating.overall_rating = normalized_rating
-    team_rating.batting_rating = batting_rating
-    team_rating.bowling_rating = bowling_rating
-    team_rating.balance_score = balance_score
-    team_rating.bench_depth = bench_depth
-    team_rating.role_coverage = role_coverage
-    
-    db.session.commit()
-    
-    return team_rating
+    return {
+        'overall_rating': normalized_rating,
+        'batting_rating': batting_rating,
+        'bowling_rating': bowling_rating,
+        'balance_score': balance_score,
+        'bench_depth': bench_depth,
+        'role_coverage': role_coverage
+    }
 
 
 def determine_winner(room_code):
@@ -234,18 +239,19 @@ def determine_winner(room_code):
     if not room:
         return None
     
-    # Get all teams in the room
-    teams = Team.query.filter_by(room_id=room.id).all()
+    # Get all teams in the room with their ratings in one query
+    rows = db.session.query(Team, TeamRating).outerjoin(
+        TeamRating, TeamRating.team_id == Team.id
+    ).filter(Team.room_id == room.id).order_by(Team.id).all()
     
-    if not teams:
+    if not rows:
         return None
     
     # Find team with highest rating
     best_team = None
     best_rating = -1
     
-    for team in teams:
-        team_rating = TeamRating.query.filter_by(team_id=team.id).first()
+    for team, team_rating in rows:
         if team_rating and team_rating.overall_rating > best_rating:
             best_rating = team_rating.overall_rating
             best_team = team
@@ -0,0 +1,443 @@
+"""Background AI analysis queue.
+
+Selecting the playing XI, impact player and rating for every team is
+CPU-bound work that used to run inline with the Socket.IO handlers, so one
+finishing auction stalled bids and timers in every other room on the same
+worker. Analysis is now submitted to a bounded process pool, one job per
+team; results are written back and a ``results_ready`` event is emitted to
+the room as each job finishes.
+
+A room is marked completed once every job of its latest submission has
+succeeded. If any of them failed, the room stays open and an
+``analysis_failed`` event asks for the analysis to be submitted again.
+
+Finished jobs stay queryable for ``AI_JOB_TTL`` seconds, and at most
+``AI_MAX_FINISHED_JOBS`` of them are kept; older ones are evicted.
+"""
+import threading
+import uuid
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from functools import partial
+from flask import current_app
+from app import db, socketio
+from app.models.room import Room
+from app.models.team import Team
+from app.models.team_player import TeamPlayer
+from app.models.player import Player
+from app.models.team_rating import TeamRating
+from app.services.ai_service import compute_rating_components
+from app.services.xi_solver import solve_playing_xi
+
+
+DEFAULT_WORKERS = 2
+DEFAULT_MAX_PENDING_JOBS = 50
+DEFAULT_JOB_TTL = 3600
+DEFAULT_MAX_FINISHED_JOBS = 1000
+
+# Picklable snapshot of a squad member sent to worker processes
+SquadPlayer = namedtuple('SquadPlayer', [
+    'id', 'role', 'batting_score', 'bowling_score',
+    'overall_score', 'is_overseas', 'in_playing_xi'
+])
+
+_executor = None
+_executor_lock = threading.Lock()
+
+# job_id -> job record, finished job IDs oldest first, and batch_id -> the
+# unfinished jobs and failed teams of one submission; guarded by _jobs_lock
+_jobs = {}
+_finished_jobs = OrderedDict()
+_batches = {}
+_jobs_lock = threading.Lock()
+
+
+def analyse_squad(squad):
+    """
+    Compute playing XI, impact player and rating for one squad.
+
+    Runs inside a worker process, so it only touches the plain
+    ``SquadPlayer`` tuples it is given.
+
+    Args:
+        squad: List of SquadPlayer tuples
+
+    Returns:
+        dict: ``playing_xi`` (list of player IDs, or None if the XI was not
+            changed), ``impact_player_id`` and ``rating`` (dict or None)
+    """
+    playing_xi_ids = None
+    if len(squad) >= 11:
+        best_combination = solve_playing_xi(squad)
+        if best_combination:
+            playing_xi_ids = [p.id for p in best_combination]
+
+    if playing_xi_ids is None:
+        in_xi = {p.id for p in squad if p.in_playing_xi}
+    else:
+        in_xi = set(playing_xi_ids)
+
+    playing_xi = [p for p in squad if p.id in in_xi]
+    bench = [p for p in squad if p.id not in in_xi]
+
+    # Highest-rated bench player becomes the impact player
+    impact_player_id = None
+    best_score = -1
+    for player in bench:
+        if player.overall_score > best_score:
+            best_score = player.overall_score
+            impact_player_id = player.id
+
+    rating = compute_rating_components(playing_xi, bench) if playing_xi else None
+
+    return {
+        'playing_xi': playing_xi_ids,
+        'impact_player_id': impact_player_id,
+        'rating': rating
+    }
+
+
+def apply_team_analysis(team_id, result):
+    """
+    Persist the output of ``analyse_squad`` for a team.
+
+    Args:
+        team_id: ID of the team
+        result: Dictionary returned by ``analyse_squad``
+    """
+    team_players = TeamPlayer.query.filter_by(team_id=team_id).all()
+
+    if result['playing_xi'] is not None:
+        selected_ids = set(result['playing_xi'])
+        for tp in team_players:
+            tp.in_playing_xi = tp.player_id in selected_ids
+
+    if result['impact_player_id'] is not None:
+        for tp in team_players:
+            tp.is_impact_player = tp.player_id == result['impact_player_id']
+
+    if result['rating'] is not None:
+        team_rating = TeamRating.query.filter_by(team_id=team_id).first()
+        if not team_rating:
+            team_rating = TeamRating(team_id=team_id)
+            db.session.add(team_rating)
+
+        for field, value in result['rating'].items():
+            setattr(team_rating, field, value)
+
+    db.session.commit()
+
+
+def _get_executor():
+    """Create the shared process pool on first use."""
+    global _executor
+
+    with _executor_lock:
+        if _executor is None:
+            workers = current_app.config.get('AI_WORKERS', DEFAULT_WORKERS)
+            _executor = ProcessPoolExecutor(max_workers=workers)
+        return _executor
+
+
+def _discard_executor(executor):
+    """Drop a broken process pool, so the next submission starts a new one."""
+    global _executor
+
+    with _executor_lock:
+        if _executor is executor:
+            _executor = None
+    executor.shutdown(wait=False)
+
+
+def shutdown_executor(wait=True):
+    """Shut down the shared process pool, if one was started."""
+    global _executor
+
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=wait)
+            _executor = None
+
+
+def _evict_finished_jobs(config, now):
+    """
+    Forget finished jobs past their TTL, and the oldest beyond the cap.
+
+    Callers must hold ``_jobs_lock``.
+
+    Args:
+        config: Flask config mapping
+        now: Current UTC time
+    """
+    ttl = config.get('AI_JOB_TTL', DEFAULT_JOB_TTL)
+    max_finished = config.get('AI_MAX_FINISHED_JOBS', DEFAULT_MAX_FINISHED_JOBS)
+
+    while _finished_jobs:
+        job_id, finished_at = next(iter(_finished_jobs.items()))
+        if len(_finished_jobs) <= max_finished and (now - finished_at).total_seconds() < ttl:
+            break
+        del _finished_jobs[job_id]
+        _jobs.pop(job_id, None)
+
+
+def _load_room_squads(room):
+    """
+    Load every team's squad in a room with a single joined query.
+
+    Args:
+        room: Room object
+
+    Returns:
+        dict: team_id -> list of SquadPlayer tuples
+    """
+    rows = db.session.query(Team.id, TeamPlayer.in_playing_xi, Player).outerjoin(
+        TeamPlayer, TeamPlayer.team_id == Team.id
+    ).outerjoin(
+        Player, Player.id == TeamPlayer.player_id
+    ).filter(Team.room_id == room.id).all()
+
+    squads = {}
+    for team_id, in_playing_xi, player in rows:
+        squad = squads.setdefault(team_id, [])
+        if player is not None:
+            squad.append(SquadPlayer(
+                id=player.id,
+                role=player.role,
+                batting_score=player.batting_score,
+                bowling_score=player.bowling_score,
+                overall_score=player.overall_score,
+                is_overseas=player.is_overseas,
+                in_playing_xi=bool(in_playing_xi)
+            ))
+
+    return squads
+
+
+def submit_room_analysis(room_code):
+    """
+    Queue AI analysis for every team in a room.
+
+    Args:
+        room_code: Code of the room
+
+    Returns:
+        tuple: (success: bool, message: str, job_ids: list)
+    """
+    room = Room.query.filter_by(code=room_code).first()
+    if not room:
+        return False, "Room not found", []
+
+    squads = _load_room_squads(room)
+    if not squads:
+        return False, "No teams to analyse", []
+
+    max_pending = current_app.config.get('AI_MAX_PENDING_JOBS', DEFAULT_MAX_PENDING_JOBS)
+    app = current_app._get_current_object()
+    executor = _get_executor()
+
+    job_ids = []
+    batch_id = uuid.uuid4().hex
+    with _jobs_lock:
+        _evict_finished_jobs(app.config, datetime.utcnow())
+        pending = sum(1 for job in _jobs.values() if not job['done'].is_set())
+        if pending + len(squads) > max_pending:
+            return False, "Analysis queue is full", []
+
+        for team_id, squad in squads.items():
+            job_id = uuid.uuid4().hex
+            _jobs[job_id] = {
+                'job_id': job_id,
+                'batch_id': batch_id,
+                'room_code': room_code,
+                'team_id': team_id,
+                'status': 'queued',
+                'error': None,
+                'submitted_at': datetime.utcnow(),
+                'finished_at': None,
+                'future': None,
+                'done': threading.Event()
+            }
+            job_ids.append(job_id)
+        _batches[batch_id] = {'pending': set(job_ids), 'failed_teams': []}
+
+    for index, job_id in enumerate(job_ids):
+        job = _jobs[job_id]
+        try:
+            future = executor.submit(analyse_squad, squads[job['team_id']])
+        except Exception as e:
+            # A worker died (BrokenProcessPool) or the pool was shut down;
+            # the jobs not handed over would otherwise stay queued forever
+            if isinstance(e, BrokenProcessPool):
+                _discard_executor(executor)
+            _fail_jobs(app.config, job_ids[index:], f'Could not queue analysis: {e}')
+            return False, f"Analysis could not be queued: {e}", job_ids
+        job['executor'] = executor
+        job['future'] = future
+        future.add_done_callback(partial(_on_job_done, app, job_id))
+
+    return True, "Analysis queued", job_ids
+
+
+def _fail_jobs(config, job_ids, error):
+    """Mark jobs that never reached a worker as failed."""
+    with _jobs_lock:
+        jobs = [_jobs[job_id] for job_id in job_ids]
+        for job in jobs:
+            _record_finish(config, job, 'failed', error)
+    for job in jobs:
+        job['done'].set()
+
+
+def _on_job_done(app, job_id, future):
+    """
+    Hand a finished job over to a Socket.IO background task.
+
+    Done callbacks run on the executor's management thread, where the
+    database session and ``socketio.emit`` are not safe to use under
+    eventlet; the background task runs where the server's async mode
+    expects.
+    """
+    socketio.start_background_task(_finish_job, app, job_id, future)
+
+
+def _record_finish(config, job, status, error):
+    """
+    Mark a job finished and settle its submission if it was the last one.
+
+    Callers must hold ``_jobs_lock``.
+
+    Args:
+        config: Flask config mapping
+        job: Job record
+        status: 'completed' or 'failed'
+        error: Error message of a failed job
+
+    Returns:
+        list or None: IDs of the submission's failed teams once every job
+            of it has finished, or None while some are still running
+    """
+    job['status'] = status
+    job['error'] = error
+    job['finished_at'] = datetime.utcnow()
+    _finished_jobs[job['job_id']] = job['finished_at']
+    _evict_finished_jobs(config, job['finished_at'])
+
+    batch = _batches[job['batch_id']]
+    batch['pending'].discard(job['job_id'])
+    if status == 'failed':
+        batch['failed_teams'].append(job['team_id'])
+    if batch['pending']:
+        return None
+
+    del _batches[job['batch_id']]
+    return batch['failed_teams']
+
+
+def _finish_job(app, job_id, future):
+    """Persist a finished job's result and notify the room."""
+    job = _jobs[job_id]
+
+    with app.app_context():
+        try:
+            apply_team_analysis(job['team_id'], future.result())
+            status, error = 'completed', None
+        except BrokenProcessPool as e:
+            _discard_executor(job['executor'])
+            status, error = 'failed', str(e)
+        except Exception as e:
+            db.session.rollback()
+            status, error = 'failed', str(e)
+
+        with _jobs_lock:
+            failed_teams = _record_finish(app.config, job, status, error)
+
+        # Only a submission whose every job succeeded completes the room;
+        # completed rooms are snapshotted, so partial results never are
+        room_complete = failed_teams == []
+        if room_complete:
+            Room.query.filter_by(code=job['room_code']).update({'status': 'completed'})
+            db.session.commit()
+
+        socketio.emit('results_ready', {
+            'job_id': job_id,
+            'team_id': job['team_id'],
+            'status': status,
+            'room_complete': room_complete
+        }, room=job['room_code'])
+
+        if failed_teams:
+            socketio.emit('analysis_failed', {
+                'room_code': job['room_code'],
+                'failed_teams': failed_teams,
+                'message': 'Analysis failed for some teams; retry it to finish the room'
+            }, room=job['room_code'])
+
+        db.session.remove()
+
+    job['done'].set()
+
+
+def _serialize_job(job):
+    """Convert a job record to a JSON-safe dictionary."""
+    status = job['status']
+    if status == 'queued' and job['future'] is not None and job['future'].running():
+        status = 'running'
+
+    return {
+        'job_id': job['job_id'],
+        'room_code': job['room_code'],
+        'team_id': job['team_id'],
+        'status': status,
+        'error': job['error'],
+        'submitted_at': job['submitted_at'].isoformat(),
+        'finished_at': job['finished_at'].isoformat() if job['finished_at'] else None
+    }
+
+
+def get_job_status(job_id):
+    """
+    Get the status of an analysis job.
+
+    Args:
+        job_id: ID of the job
+
+    Returns:
+        dict or None: Job status, or None if the job is unknown
+    """
+    with _jobs_lock:
+        job = _jobs.get(job_id)
+        return _serialize_job(job) if job else None
+
+
+def get_room_jobs(room_code):
+    """
+    Get the status of every analysis job for a room.
+
+    Args:
+        room_code: Code of the room
+
+    Returns:
+        list: Job status dictionaries
+    """
+    with _jobs_lock:
+        return [_serialize_job(job) for job in _jobs.values() if job['room_code'] == room_code]
+
+
+def wait_for_jobs(job_ids, timeout=None):
+    """
+    Block until the given jobs have been persisted.
+
+    Jobs that were already evicted count as finished.
+
+    Args:
+        job_ids: IDs of the jobs to wait for
+        timeout: Maximum seconds to wait per job
+
+    Returns:
+        bool: True if every job finished in time
+    """
+    with _jobs_lock:
+        jobs = [_jobs.get(job_id) for job_id in job_ids]
+    return all(job is None or job['done'].wait(timeout) for job in jobs)
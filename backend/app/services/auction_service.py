@@ -1,45 +1,215 @@
 """Auction engine service."""
+import math
+import random
+import threading
+import time
+import uuid
 from datetime import datetime
+from flask import current_app
+from sqlalchemy import func, case, insert, select, literal
+from sqlalchemy.exc import IntegrityError
 from app import db
 from app.models.room import Room
 from app.models.player import Player
 from app.models.auction_player import AuctionPlayer
 from app.models.team import Team
 from app.models.team_player import TeamPlayer
+from app.services.timer_scheduler import timer_scheduler
+from app.services.state_store import get_state_store
+from app.services.player_catalog import get_player_data
+from app.services.lot_queue import (
+    ORDERING_STRATEGIES, DEFAULT_ORDERING, build_lot_queue, get_lot_queue
+)
+
+
+# Lot timer for players offered again after drawing no bids
+ACCELERATED_TIMER_DURATION = 10
+
+# Times settlement re-reads the state after losing its claim to a bid
+SETTLE_ATTEMPTS = 5
+
+
+# Per-room locks serializing bid acceptance; rooms never contend with each other
+_room_locks = {}
+_room_locks_guard = threading.Lock()
+
+
+def get_room_lock(room_code):
+    """
+    Get the lock that serializes bids and settlement for a room.
+    
+    Args:
+        room_code: Code of the room
+        
+    Returns:
+        threading.Lock: Lock for the room
+    """
+    lock = _room_locks.get(room_code)
+    if lock is None:
+        with _room_locks_guard:
+            lock = _room_locks.setdefault(room_code, threading.Lock())
+    return lock
 
 
 class AuctionState:
     """Class to represent current auction state."""
     def __init__(self, room_code, current_player=None, current_bid=None, 
-                 highest_bidder=None, timer_remaining=None, auction_complete=False):
+                 highest_bidder=None, timer_remaining=None, auction_complete=False,
+                 seq=None):
         self.room_code = room_code
         self.current_player = current_player
         self.current_bid = current_bid
         self.highest_bidder = highest_bidder
         self.timer_remaining = timer_remaining
         self.auction_complete = auction_complete
+        self.seq = seq
 
 
 class BidResult:
     """Class to represent bid result."""
-    def __init__(self, success, message, new_bid=None, highest_bidder=None):
+    def __init__(self, success, message, new_bid=None, highest_bidder=None,
+                 timer_remaining=None, seq=None, team=None):
         self.success = success
         self.message = message
         self.new_bid = new_bid
         self.highest_bidder = highest_bidder
+        self.timer_remaining = timer_remaining
+        self.seq = seq
+        self.team = team
+
+
+def _load_team_ledger(room_id):
+    """
+    Load the purse ledger for every team in a room with a single query.
+    
+    The ledger lives in the room's auction state so bids can be checked
+    without touching the database; it is written back at settlement.
+    
+    Args:
+        room_id: ID of the room
+        
+    Returns:
+        dict: username -> {'team_id', 'team_name', 'logo_url',
+            'initial_purse', 'purse_left', 'squad_size', 'overseas_count'},
+            in team order
+    """
+    rows = db.session.query(
+        Team.id,
+        Team.username,
+        Team.team_name,
+        Team.logo_url,
+        Team.initial_purse,
+        Team.purse_left,
+        func.count(TeamPlayer.id),
+        func.coalesce(func.sum(case((Player.is_overseas, 1), else_=0)), 0)
+    ).outerjoin(
+        TeamPlayer, TeamPlayer.team_id == Team.id
+    ).outerjoin(
+        Player, Player.id == TeamPlayer.player_id
+    ).filter(Team.room_id == room_id).group_by(Team.id).order_by(Team.id).all()
+    
+    return {
+        username: {
+            'team_id': team_id,
+            'team_name': team_name,
+            'logo_url': logo_url,
+            'initial_purse': initial_purse,
+            'purse_left': purse_left,
+            'squad_size': squad_size,
+            'overseas_count': overseas_count
+        }
+        for (team_id, username, team_name, logo_url, initial_purse,
+             purse_left, squad_size, overseas_count) in rows
+    }
 
 
-# Global state to track current auction state for each room
-# In production, this should be stored in Redis or similar
-_auction_states = {}
+def _count_lots(room_id):
+    """
+    Count a room's lots and how many of them are sold, in one query.
+    
+    Args:
+        room_id: ID of the room
+        
+    Returns:
+        tuple: (lots_total: int, lots_sold: int)
+    """
+    total, sold = db.session.query(
+        func.count(AuctionPlayer.id),
+        func.coalesce(func.sum(case((AuctionPlayer.is_sold, 1), else_=0)), 0)
+    ).filter(AuctionPlayer.room_id == room_id).one()
+    return total, sold
+
+
+def _get_lot_counts(room_code, state):
+    """
+    Get a room's lot counters, counting them once if the state predates them.
+    
+    The counters are kept in the auction state: ``lots_total`` is set when
+    the auction is initialized and ``lots_sold`` is bumped at settlement.
+    
+    Args:
+        room_code: Code of the room
+        state: Caller's copy of the room's auction state; the counters are
+            filled in if they were missing
+        
+    Returns:
+        tuple: (lots_total: int, lots_sold: int)
+    """
+    if state.get('lots_total') is not None:
+        return state['lots_total'], state.get('lots_sold') or 0
+    
+    room_id = state.get('room_id')
+    if room_id is None:
+        room = Room.query.filter_by(code=room_code).first()
+        if not room:
+            return 0, 0
+        room_id = room.id
+    
+    total, sold = _count_lots(room_id)
+    get_state_store().update(room_code, lots_total=total, lots_sold=sold)
+    state.update(lots_total=total, lots_sold=sold)
+    return total, sold
 
 
-def initialize_auction(room_code):
+def _get_team_ledger(room_code, state):
+    """
+    Get a room's team ledger, building it if the state predates it.
+    
+    Args:
+        room_code: Code of the room
+        state: Caller's copy of the room's auction state; ``room_id`` and
+            ``teams`` are filled in if they were missing
+        
+    Returns:
+        dict or None: username -> ledger entry, or None if the room is gone
+    """
+    teams = state.get('teams')
+    if teams is not None:
+        return teams
+    
+    room_id = state.get('room_id')
+    if room_id is None:
+        room = Room.query.filter_by(code=room_code).first()
+        if not room:
+            return None
+        room_id = room.id
+    
+    teams = _load_team_ledger(room_id)
+    get_state_store().update(room_code, room_id=room_id, teams=teams)
+    state.update(room_id=room_id, teams=teams)
+    return teams
+
+
+def initialize_auction(room_code, ordering=None):
     """
     Initialize auction for a room by creating AuctionPlayer records.
     
+    Also orders the room's lots, which fixes the order players come up.
+    
     Args:
         room_code: Code of the room
+        ordering: Lot ordering strategy ('marquee', 'role_sets' or
+            'shuffled'); defaults to the AUCTION_LOT_ORDER setting
         
     Returns:
         tuple: (success: bool, message: str)
@@ -48,198 +218,444 @@ def initialize_auction(room_code):
     if not room:
         return False, "Room not found"
     
-    # Get all players
-    all_players = Player.query.all()
-    
-    # Create AuctionPlayer records for this room
-    for player in all_players:
-        # Check if already exists
-        existing = AuctionPlayer.query.filter_by(
-            room_id=room.id, 
-            player_id=player.id
-        ).first()
-        
-        if not existing:
-            auction_player = AuctionPlayer(
-                room_id=room.id,
-                player_id=player.id,
-                is_sold=False
+    ordering = ordering or current_app.config.get('AUCTION_LOT_ORDER', DEFAULT_ORDERING)
+    if ordering not in ORDERING_STRATEGIES:
+        return False, f"Unknown lot ordering: {ordering}"
+    
+    # Create AuctionPlayer records for every player the room does not have
+    # yet, in a single INSERT ... SELECT
+    existing = select(AuctionPlayer.player_id).where(AuctionPlayer.room_id == room.id)
+    try:
+        db.session.execute(
+            insert(AuctionPlayer).from_select(
+                ['room_id', 'player_id', 'is_sold'],
+                select(literal(room.id), Player.id, literal(False)).where(Player.id.not_in(existing))
             )
-            db.session.add(auction_player)
-    
-    db.session.commit()
-    
-    # Initialize auction state
-    _auction_states[room_code] = {
+        )
+        db.session.commit()
+    except IntegrityError:
+        # A concurrent initialization already created the rows
+        db.session.rollback()
+    
+    # Order every lot in the room; players already sold are skipped as they come up
+    seed = random.randrange(2 ** 31) if ordering == 'shuffled' else None
+    epoch = uuid.uuid4().hex
+    _build_room_lot_queue(room_code, room.id, ordering, seed, epoch)
+    
+    lots_total, lots_sold = _count_lots(room.id)
+    
+    # Initialize auction state, including the purse ledger used by bids
+    get_state_store().set(room_code, {
+        'room_id': room.id,
+        'state_epoch': epoch,  # Tells apart seqs and lot orders of successive states
+        'teams': _load_team_ledger(room.id),
+        'lots_total': lots_total,
+        'lots_sold': lots_sold,
         'current_player_id': None,
         'current_bid': None,
         'highest_bidder': None,
+        'lot_deadline': None,  # Wall-clock time the current lot closes
+        'bid_seq': 0,  # Bumped on every accepted bid and every new lot
         'bid_increment': 5.0,  # Default bid increment in Lakhs
-        'timer_duration': 30  # 30 seconds per player (as per requirements)
-    }
+        'timer_duration': 30,  # 30 seconds per player (as per requirements)
+        'accelerated_timer_duration': ACCELERATED_TIMER_DURATION,
+        'bid_extension': 10,  # Minimum seconds left on the clock after a bid
+        'lot_order': ordering,
+        'lot_seed': seed,  # Lets another process rebuild a shuffled queue
+        'lot_cursor': 0,
+        'lot_unsold': [],
+        'lot_round': 1
+    })
     
     return True, "Auction initialized successfully"
 
 
-def present_next_player(room_code):
+def _build_room_lot_queue(room_code, room_id, ordering, seed, epoch):
     """
-    Present the next unsold player for auction.
+    Order a room's lots from all of its players.
+    
+    Only the columns the ordering strategies need are loaded. Sold players
+    are kept, so every process derives the same order whenever it builds it.
     
     Args:
         room_code: Code of the room
+        room_id: ID of the room
+        ordering: Lot ordering strategy name
+        seed: Seed for randomized strategies
+        epoch: ``state_epoch`` of the auction state the order belongs to
         
     Returns:
-        Player or None: Next player to auction, or None if all sold
+        LotQueue: A queue at the start of the order
     """
-    room = Room.query.filter_by(code=room_code).first()
-    if not room:
-        return None
+    players = db.session.query(Player.id, Player.role, Player.base_price).join(
+        AuctionPlayer, AuctionPlayer.player_id == Player.id
+    ).filter(
+        AuctionPlayer.room_id == room_id
+    ).all()
     
-    # Find next unsold player
-    unsold_auction_player = AuctionPlayer.query.filter_by(
-        room_id=room.id,
-        is_sold=False
-    ).first()
+    return build_lot_queue(room_code, players, ordering, seed, epoch=epoch)
+
+
+def _load_lot_queue(room_code, room_id, state):
+    """
+    Get a room's lot queue at the cursor kept in its auction state.
+    
+    The order is rebuilt if this process has not cached it for the state,
+    e.g. after a restart or when another worker started the auction.
     
-    if not unsold_auction_player:
-        # All players sold
+    Args:
+        room_code: Code of the room
+        room_id: ID of the room
+        state: The room's auction state
+        
+    Returns:
+        LotQueue: The queue
+    """
+    queue = get_lot_queue(room_code, state)
+    if queue is None:
+        _build_room_lot_queue(
+            room_code, room_id,
+            state.get('lot_order') or DEFAULT_ORDERING,
+            state.get('lot_seed'),
+            state.get('state_epoch')
+        )
+        queue = get_lot_queue(room_code, state)
+    return queue
+
+
+def _timer_remaining(state):
+    """Seconds left on the current lot by the shared deadline, or None if none is set."""
+    deadline = state.get('lot_deadline')
+    if deadline is None or state['current_player_id'] is None:
         return None
+    return max(0.0, deadline - time.time())
+
+
+def present_next_player(room_code):
+    """
+    Present the next player from the room's lot queue.
     
-    player = unsold_auction_player.player
+    The lot, its deadline and the queue's new position are written with one
+    compare-and-set, so processes sharing the state store agree on them.
     
-    # Update auction state
-    if room_code not in _auction_states:
-        _auction_states[room_code] = {
-            'bid_increment': 5.0,
-            'timer_duration': 60  # 60 seconds (1 minute)
-        }
+    Args:
+        room_code: Code of the room
+        
+    Returns:
+        Player or None: Next player to auction, or None if all sold
+    """
+    room = Room.query.filter_by(code=room_code).first()
+    if not room:
+        return None
     
-    _auction_states[room_code]['current_player_id'] = player.id
-    _auction_states[room_code]['current_bid'] = player.base_price
-    _auction_states[room_code]['highest_bidder'] = None
+    store = get_state_store()
+    with get_room_lock(room_code):
+        state = store.get(room_code)
+        if state is None:
+            state = {
+                'room_id': room.id,
+                'state_epoch': uuid.uuid4().hex,
+                'bid_seq': 0,
+                'bid_increment': 5.0,
+                'timer_duration': 60,  # 60 seconds (1 minute)
+                'accelerated_timer_duration': ACCELERATED_TIMER_DURATION,
+                'bid_extension': 10
+            }
+            store.set(room_code, state)
+        
+        queue = _load_lot_queue(room_code, room.id, state)
+        
+        # Take the next lot, skipping players sold or removed since the order was built
+        player = None
+        while player is None:
+            player_id = queue.next_lot()
+            if player_id is None:
+                # All players sold
+                return None
+            player = Player.query.join(
+                AuctionPlayer, AuctionPlayer.player_id == Player.id
+            ).filter(
+                AuctionPlayer.room_id == room.id,
+                AuctionPlayer.player_id == player_id,
+                AuctionPlayer.is_sold.is_(False)
+            ).first()
+        
+        # Unsold players come back round on a shorter clock
+        fields = {}
+        timer_duration = state['timer_duration']
+        if queue.accelerated:
+            timer_duration = min(
+                timer_duration,
+                state.get('accelerated_timer_duration', ACCELERATED_TIMER_DURATION)
+            )
+            fields['timer_duration'] = timer_duration
+        
+        # A new lot invalidates bids aimed at the previous one
+        presented = store.compare_and_set(
+            room_code, state.get('bid_seq') or 0,
+            current_player_id=player.id,
+            current_bid=player.base_price,
+            highest_bidder=None,
+            lot_deadline=time.time() + timer_duration,
+            **queue.cursor_state(),
+            **fields
+        )
+        if not presented:
+            # Another process presented a lot first; its timer runs there
+            state = store.get(room_code) or {}
+            current_player_id = state.get('current_player_id')
+            return Player.query.get(current_player_id) if current_player_id else None
+        
+        # Wake this process when the lot is due
+        timer_scheduler.schedule(room_code, timer_duration)
     
     return player
 
 
-def place_bid(room_code, username):
+def get_upcoming_players(room_code, count=3):
+    """
+    Peek at the next lots in a room's queue without taking them.
+    
+    Args:
+        room_code: Code of the room
+        count: Maximum number of players to return
+        
+    Returns:
+        list: Player objects in auction order
+    """
+    state = get_state_store().get(room_code)
+    if state is None or state.get('room_id') is None:
+        return []
+    
+    player_ids = _load_lot_queue(room_code, state['room_id'], state).peek(count)
+    if not player_ids:
+        return []
+    
+    players = {p.id: p for p in Player.query.join(
+        AuctionPlayer, AuctionPlayer.player_id == Player.id
+    ).filter(
+        AuctionPlayer.room_id == state['room_id'],
+        AuctionPlayer.is_sold.is_(False),
+        Player.id.in_(player_ids)
+    ).all()}
+    return [players[player_id] for player_id in player_ids if player_id in players]
+
+
+def place_bid(room_code, username, expected_seq=None):
     """
     Place a bid for the current player.
     
+    Bids in a room are accepted one at a time under the room's lock, and
+    every accepted bid gets the next value of the room's ``bid_seq``. The
+    store's compare-and-set on that sequence keeps acceptance atomic even
+    across processes sharing a SQL or Redis store. Purses are checked
+    against the room's team ledger, so a bid runs no SQL queries.
+    
     Args:
         room_code: Code of the room
         username: Username of the bidder
+        expected_seq: Sequence number of the state the bidder saw; if given
+            and the room has moved on, the bid is rejected as stale
         
     Returns:
         BidResult: Result of the bid attempt
     """
-    # Get auction state
-    if room_code not in _auction_states:
-        return BidResult(False, "Auction not initialized", None, None)
-    
-    state = _auction_states[room_code]
-    
-    if state['current_player_id'] is None:
-        return BidResult(False, "No player currently being auctioned", None, None)
-    
-    # Get room and team
-    room = Room.query.filter_by(code=room_code).first()
-    if not room:
-        return BidResult(False, "Room not found", None, None)
-    
-    team = Team.query.filter_by(room_id=room.id, username=username).first()
-    if not team:
-        return BidResult(False, "Team not found", None, None)
-    
-    # Calculate new bid
-    current_bid = state['current_bid']
-    bid_increment = state['bid_increment']
-    new_bid = current_bid + bid_increment
-    
-    # Check if team has sufficient purse
-    if team.purse_left < new_bid:
-        return BidResult(False, "Insufficient purse for this bid", None, None)
+    store = get_state_store()
+    with get_room_lock(room_code):
+        state = store.get(room_code)
+        if state is None:
+            return BidResult(False, "Auction not initialized", None, None)
+        
+        if state['current_player_id'] is None:
+            return BidResult(False, "No player currently being auctioned", None, None)
+        
+        teams = _get_team_ledger(room_code, state)
+        if teams is None:
+            return BidResult(False, "Room not found", None, None)
+        
+        team = teams.get(username)
+        if not team:
+            return BidResult(False, "Team not found", None, None)
+        
+        seq = state.get('bid_seq') or 0
+        if expected_seq is not None and expected_seq != seq:
+            return BidResult(False, "Bid is stale, the auction has moved on", None, None, seq=seq)
+        
+        # Calculate new bid
+        new_bid = state['current_bid'] + state['bid_increment']
+        
+        # Check if team has sufficient purse
+        if team['purse_left'] < new_bid:
+            return BidResult(False, "Insufficient purse for this bid", None, None)
+        
+        # Keep the lot open long enough for others to respond
+        now = time.time()
+        deadline = max(state.get('lot_deadline') or now, now + state.get('bid_extension', 10))
+        
+        # Another process may have accepted a bid since we read the state
+        if not store.compare_and_set(room_code, seq, current_bid=new_bid, highest_bidder=username,
+                                     lot_deadline=deadline):
+            return BidResult(False, "Bid was superseded by another bid, please try again", None, None)
     
-    # Update bid
-    state['current_bid'] = new_bid
-    state['highest_bidder'] = username
+    # The process running the lot's timer rechecks the shared deadline when it fires
+    timer_scheduler.extend(room_code, state.get('bid_extension', 10))
+    timer_remaining = math.ceil(deadline - now)
     
-    return BidResult(True, "Bid placed successfully", new_bid, username)
+    return BidResult(True, "Bid placed successfully", new_bid, username, timer_remaining,
+                     seq=seq + 1, team=team)
 
 
-def handle_timer_expiry(room_code):
+def handle_timer_expiry(room_code, check_deadline=False):
     """
     Handle timer expiry and assign player to highest bidder.
     
+    A player with no bids is requeued for the accelerated round instead of
+    being marked sold, unless the room is already in that round.
+    
     Args:
         room_code: Code of the room
+        check_deadline: Only settle if the lot's shared deadline has passed;
+            if a bid pushed it out, this process's timer is rescheduled
         
     Returns:
-        dict: Information about the sold player
+        dict: Information about the sold player; ``requeued`` is True if
+            the player will be offered again
     """
-    if room_code not in _auction_states:
-        return None
-    
-    state = _auction_states[room_code]
-    
-    if state['current_player_id'] is None:
-        return None
-    
-    room = Room.query.filter_by(code=room_code).first()
-    if not room:
-        return None
-    
-    player_id = state['current_player_id']
-    sold_price = state['current_bid']
-    highest_bidder = state['highest_bidder']
-    
-    # Get auction player record
-    auction_player = AuctionPlayer.query.filter_by(
-        room_id=room.id,
-        player_id=player_id
-    ).first()
-    
-    if not auction_player:
-        return None
+    # Hold the room lock so no bid lands between reading and clearing the lot
+    with get_room_lock(room_code):
+        return _settle_current_lot(room_code, check_deadline)
+
+
+def _settle_current_lot(room_code, check_deadline=False):
+    """
+    Sell the current lot; callers must hold the room lock.
     
-    # Mark as sold
-    auction_player.is_sold = True
-    auction_player.sold_price = sold_price
-    auction_player.sold_at = datetime.utcnow()
+    The room lock only serializes this process. Against other processes
+    sharing the store, the lot is claimed with a compare-and-set on
+    bid_seq that also writes the team ledger and lot counters, so a bid
+    landing after the state was read fails the claim and the newer state
+    is settled instead, and no other writer's ledger change is lost.
     
-    # If there was a bidder, assign to team
-    if highest_bidder:
-        team = Team.query.filter_by(room_id=room.id, username=highest_bidder).first()
+    The lot's player is checked before the claim. A lot whose player is
+    missing or already sold is cleared without a sale, so once the claim
+    wins the auction always moves on to the next lot.
+    """
+    store = get_state_store()
+    for _ in range(SETTLE_ATTEMPTS):
+        state = store.get(room_code)
+        if state is None or state['current_player_id'] is None:
+            return None
+        
+        remaining = _timer_remaining(state) if check_deadline else None
+        if remaining:
+            # A bid on another process pushed the deadline out
+            timer_scheduler.schedule(room_code, remaining)
+            return None
+        
+        teams = _get_team_ledger(room_code, state)
+        if teams is None:
+            return None
+        lots_total, lots_sold = _get_lot_counts(room_code, state)
+        
+        room_id = state['room_id']
+        player_id = state['current_player_id']
+        sold_price = state['current_bid']
+        auction_player = AuctionPlayer.query.filter_by(
+            room_id=room_id,
+            player_id=player_id
+        ).first()
+        player = Player.query.get(player_id)
+        sellable = auction_player is not None and not auction_player.is_sold and player is not None
+        
+        # Players with no bids are held back for the accelerated round
+        highest_bidder = state['highest_bidder']
+        team = teams.get(highest_bidder) if sellable and highest_bidder else None
+        queue = _load_lot_queue(room_code, state['room_id'], state)
+        requeued = sellable and team is None and queue.requeue(player_id)
+        
+        ledger = {}
+        if sellable and not requeued:
+            ledger['lots_sold'] = lots_sold + 1
         if team:
-            auction_player.sold_to_team_id = team.id
-            
-            # Create team player record
-            team_player = TeamPlayer(
-                team_id=team.id,
+            team = dict(
+                team,
+                purse_left=team['purse_left'] - sold_price,
+                squad_size=team['squad_size'] + 1,
+                overseas_count=team['overseas_count'] + (1 if player.is_overseas else 0)
+            )
+            ledger['teams'] = dict(teams, **{highest_bidder: team})
+        
+        # Clearing the lot bumps bid_seq, which rejects every later bid on it
+        if store.compare_and_set(room_code, state['bid_seq'],
+                                 current_player_id=None, current_bid=None, highest_bidder=None,
+                                 lot_deadline=None, **queue.cursor_state(), **ledger):
+            break
+        db.session.rollback()
+    else:
+        return None
+    timer_scheduler.cancel(room_code)
+    
+    if sellable and not requeued:
+        # The claim makes this the lot's only seller, so the update only
+        # misses if the player was sold outside the auction since we read it
+        sold = AuctionPlayer.query.filter_by(id=auction_player.id, is_sold=False).update({
+            'is_sold': True,
+            'sold_price': sold_price,
+            'sold_at': datetime.utcnow(),
+            'sold_to_team_id': team['team_id'] if team else None
+        }, synchronize_session=False)
+        if sold != 1:
+            current_app.logger.warning(f"Lot {player_id} in room {room_code} was sold elsewhere")
+        elif team:
+            db.session.add(TeamPlayer(
+                team_id=team['team_id'],
                 player_id=player_id,
                 price=sold_price
-            )
-            db.session.add(team_player)
-            
-            # Update team purse
-            team.purse_left -= sold_price
+            ))
+            # Write the ledger's purse through to the database
+            Team.query.filter_by(id=team['team_id']).update({'purse_left': team['purse_left']})
+    elif not sellable:
+        current_app.logger.warning(f"Lot {player_id} in room {room_code} has no unsold player; skipped")
     
     db.session.commit()
     
-    # Clear current player from state
-    state['current_player_id'] = None
-    state['current_bid'] = None
-    state['highest_bidder'] = None
-    
-    player = Player.query.get(player_id)
-    
     return {
         'player': player,
         'sold_price': sold_price,
-        'sold_to': highest_bidder,
-        'team_id': auction_player.sold_to_team_id
+        'sold_to': highest_bidder if team else None,
+        'team_id': team['team_id'] if team else None,
+        'requeued': requeued
     }
 
 
+def get_timer_duration(room_code):
+    """
+    Get the per-lot timer duration for a room.
+    
+    Args:
+        room_code: Code of the room
+        
+    Returns:
+        int: Timer duration in seconds
+    """
+    state = get_state_store().get(room_code) or {}
+    return state.get('timer_duration', 30)
+
+
+def get_bid_seq(room_code):
+    """
+    Get a room's current bid sequence number.
+    
+    Args:
+        room_code: Code of the room
+        
+    Returns:
+        int: Sequence number clients should quote when bidding
+    """
+    state = get_state_store().get(room_code) or {}
+    return state.get('bid_seq') or 0
+
+
 def get_current_auction_state(room_code):
     """
     Get current state of the auction.
@@ -250,32 +666,128 @@ def get_current_auction_state(room_code):
     Returns:
         AuctionState: Current auction state
     """
-    if room_code not in _auction_states:
+    state = get_state_store().get(room_code)
+    if state is None:
         return AuctionState(room_code, auction_complete=False)
     
-    state = _auction_states[room_code]
-    
     current_player = None
     if state['current_player_id']:
         current_player = Player.query.get(state['current_player_id'])
     
-    # Check if auction is complete
-    room = Room.query.filter_by(code=room_code).first()
-    auction_complete = False
-    if room:
-        unsold_count = AuctionPlayer.query.filter_by(
-            room_id=room.id,
-            is_sold=False
-        ).count()
-        # Only mark as complete if there are auction players and all are sold
-        total_count = AuctionPlayer.query.filter_by(room_id=room.id).count()
-        auction_complete = (total_count > 0 and unsold_count == 0)
+    # Only complete if there are auction players and all are sold
+    lots_total, lots_sold = _get_lot_counts(room_code, state)
+    auction_complete = lots_total > 0 and lots_sold >= lots_total
+    
+    timer_remaining = _timer_remaining(state)
+    if timer_remaining is None:
+        timer_remaining = state.get('timer_duration', 30)
+    else:
+        timer_remaining = math.ceil(timer_remaining)
     
     return AuctionState(
         room_code=room_code,
         current_player=current_player,
         current_bid=state['current_bid'],
         highest_bidder=state['highest_bidder'],
-        timer_remaining=state.get('timer_duration', 30),
-        auction_complete=auction_complete
+        timer_remaining=timer_remaining,
+        auction_complete=auction_complete,
+        seq=state.get('bid_seq')
     )
+
+
+def _state_version(room_code, state):
+    """Version tag of an auction state; changes whenever the state does."""
+    return f"{room_code}-{state.get('state_epoch') or 0}-{state.get('bid_seq') or 0}"
+
+
+def get_auction_state_version(room_code):
+    """
+    Get a tag identifying the current version of a room's auction state.
+    
+    Every bid, lot and settlement bumps the room's ``bid_seq``, so the tag
+    only changes when the state does. It is read from the state store alone
+    and serves as the ETag for state polls.
+    
+    Args:
+        room_code: Code of the room
+        
+    Returns:
+        str or None: Version tag, or None if the auction has not started
+    """
+    state = get_state_store().get(room_code)
+    if state is None:
+        return None
+    return _state_version(room_code, state)
+
+
+def get_auction_state_summary(room_code):
+    """
+    Build the auction state served to polling clients.
+    
+    Once the auction has started, everything comes from the state store:
+    the current lot from the player catalog, squads and purses from the
+    team ledger and completion from the lot counters. Before that, teams
+    are loaded with one grouped query.
+    
+    Args:
+        room_code: Code of the room
+        
+    Returns:
+        tuple: (summary: dict, version: str or None); version is None if
+            the auction has not started
+    """
+    state = get_state_store().get(room_code)
+    if state is None:
+        room = Room.query.filter_by(code=room_code).first()
+        teams = _load_team_ledger(room.id) if room else {}
+        return {
+            'room_code': room_code,
+            'current_player': None,
+            'current_bid': None,
+            'highest_bidder': None,
+            'timer_remaining': None,
+            'auction_complete': False,
+            'seq': None,
+            'teams': _serialize_teams(teams)
+        }, None
+    
+    teams = _get_team_ledger(room_code, state) or {}
+    lots_total, lots_sold = _get_lot_counts(room_code, state)
+    
+    timer_remaining = _timer_remaining(state)
+    if timer_remaining is None:
+        timer_remaining = state.get('timer_duration', 30)
+    else:
+        timer_remaining = math.ceil(timer_remaining)
+    
+    current_player = None
+    if state['current_player_id']:
+        current_player = get_player_data(state['current_player_id'])
+    
+    return {
+        'room_code': room_code,
+        'current_player': current_player,
+        'current_bid': state['current_bid'],
+        'highest_bidder': state['highest_bidder'],
+        'timer_remaining': timer_remaining,
+        'auction_complete': lots_total > 0 and lots_sold >= lots_total,
+        'seq': state.get('bid_seq'),
+        'teams': _serialize_teams(teams)
+    }, _state_version(room_code, state)
+
+
+def _serialize_teams(teams):
+    """Convert a team ledger to the team list sent to clients."""
+    return [
+        {
+            'team_id': team['team_id'],
+            'team_name': team['team_name'],
+            'logo_url': team.get('logo_url'),
+            'username': username,
+            'initial_purse': team.get('initial_purse'),
+            'purse_left': team['purse_left'],
+            'squad_size': team['squad_size'],
+            'overseas_count': team['overseas_count']
+        }
+        for username, team in teams.items()
+    ]
@@ -0,0 +1,300 @@
+"""Columnar player catalogs and their compiled file format.
+
+A catalog keeps players as a struct of arrays: one NumPy array per numeric
+column, and one array of codes into a shared string table per text column.
+Roles and countries repeat across thousands of players, so each distinct
+string is stored once.
+
+Compiled catalogs are uncompressed ``.npz`` files. Loading one maps the
+file into memory and views each column in place, so no row is parsed or
+copied until it is used. Each file records a digest of the source it was
+compiled from, and of the files the build depends on, such as the scoring
+module; ``load_or_compile`` recompiles it when any of them changes.
+
+The Streamlit app keeps an identical copy in ``services/columnar_catalog.py``.
+"""
+import hashlib
+import io
+import os
+import struct
+import zipfile
+from typing import Callable, Dict, Iterable, List, Optional
+import numpy as np
+import pandas as pd
+
+# Bumped when the file layout changes; older files are recompiled
+CATALOG_FORMAT = 1
+
+STRING_COLUMNS = ('name', 'role', 'country')
+NUMERIC_COLUMNS = {
+    'id': np.int64,
+    'base_price': np.float64,
+    'batting_score': np.float64,
+    'bowling_score': np.float64,
+    'overall_score': np.float64,
+    'is_overseas': np.bool_,
+}
+COLUMN_ORDER = ('id', 'name', 'role', 'country', 'base_price',
+                'batting_score', 'bowling_score', 'overall_score', 'is_overseas')
+
+
+class StringTable:
+    """Distinct strings stored once, as one UTF-8 buffer and end offsets."""
+    
+    def __init__(self, data: np.ndarray, offsets: np.ndarray):
+        """
+        Args:
+            data: uint8 array of the UTF-8 strings, back to back
+            offsets: int64 array of each string's end offset in ``data``
+        """
+        self.data = data
+        self.offsets = offsets
+        self._strings = None
+    
+    @classmethod
+    def encode(cls, values) -> tuple:
+        """
+        Build a table from values, coding each value by its table entry.
+        
+        Args:
+            values: Strings to encode
+        
+        Returns:
+            tuple: (StringTable, int32 array of codes, one per value)
+        """
+        codes, strings = pd.factorize(pd.Series(values, dtype=object).astype(str))
+        encoded = [string.encode('utf-8') for string in strings]
+        offsets = np.cumsum([len(item) for item in encoded], dtype=np.int64)
+        data = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+        return cls(data, offsets), codes.astype(np.int32)
+    
+    def strings(self) -> List[str]:
+        """Decode every string in the table, once."""
+        if self._strings is None:
+            buffer = self.data.tobytes()
+            starts = np.concatenate(([0], self.offsets[:-1])).tolist()
+            self._strings = [buffer[start:end].decode('utf-8')
+                             for start, end in zip(starts, self.offsets.tolist())]
+        return self._strings
+    
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        """Get the strings for an array of codes."""
+        return np.asarray(self.strings(), dtype=object)[codes] if len(codes) else np.empty(0, dtype=object)
+    
+    def __len__(self):
+        return len(self.offsets)
+
+
+class ColumnarCatalog:
+    """Players as a struct of arrays."""
+    
+    def __init__(self, columns: Dict[str, np.ndarray], strings: StringTable,
+                 source_digest: Optional[str] = None):
+        """
+        Args:
+            columns: Array per column; text columns hold string table codes
+            strings: String table of the text columns
+            source_digest: Digest of the source the catalog was compiled from
+        """
+        self.columns = columns
+        self.strings = strings
+        self.source_digest = source_digest
+    
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, source_digest: Optional[str] = None) -> 'ColumnarCatalog':
+        """
+        Build a catalog from a DataFrame of players.
+        
+        Args:
+            df: DataFrame with the player columns; ``id`` is optional
+            source_digest: Digest of the source the frame was read from
+        
+        Returns:
+            ColumnarCatalog: The catalog
+        """
+        # One table for every text column, coded column by column
+        text = [df[column].to_numpy(dtype=object) for column in STRING_COLUMNS]
+        strings, codes = StringTable.encode(np.concatenate(text) if len(df) else [])
+        
+        columns = {}
+        for i, column in enumerate(STRING_COLUMNS):
+            columns[column] = codes[i * len(df):(i + 1) * len(df)]
+        for column, dtype in NUMERIC_COLUMNS.items():
+            if column in df.columns:
+                columns[column] = df[column].to_numpy(dtype=dtype)
+        return cls(columns, strings, source_digest)
+    
+    @classmethod
+    def from_rows(cls, rows, fields=COLUMN_ORDER) -> 'ColumnarCatalog':
+        """Build a catalog from row tuples, such as a database query's result."""
+        return cls.from_frame(pd.DataFrame.from_records(list(rows), columns=list(fields)))
+    
+    def __len__(self):
+        return len(self.columns['name'])
+    
+    @property
+    def fields(self) -> List[str]:
+        """Names of the catalog's columns, in the usual player field order."""
+        return [column for column in COLUMN_ORDER if column in self.columns]
+    
+    def column(self, name) -> np.ndarray:
+        """Get a column, with text columns decoded to strings."""
+        if name in STRING_COLUMNS:
+            return self.strings.decode(self.columns[name])
+        return self.columns[name]
+    
+    def column_lists(self) -> Dict[str, list]:
+        """Get every column as a list of Python values."""
+        return {field: self.column(field).tolist() for field in self.fields}
+    
+    def records(self) -> List[Dict]:
+        """Get the players as dictionaries of Python values, for bulk inserts."""
+        lists = self.column_lists()
+        return [dict(zip(lists, values)) for values in zip(*lists.values())]
+    
+    def to_frame(self) -> pd.DataFrame:
+        """Get the players as a DataFrame."""
+        return pd.DataFrame({field: self.column(field) for field in self.fields})
+
+
+def save_catalog(catalog: ColumnarCatalog, path) -> None:
+    """
+    Write a catalog to a compiled ``.npz`` file.
+    
+    Arrays are stored uncompressed so the file can be memory-mapped. The
+    file is written beside the target and renamed over it.
+    
+    Args:
+        catalog: Catalog to write
+        path: Path of the file
+    """
+    arrays = {f'column_{name}': np.ascontiguousarray(values)
+              for name, values in catalog.columns.items()}
+    arrays['strings_data'] = catalog.strings.data
+    arrays['strings_offsets'] = catalog.strings.offsets
+    arrays['format'] = np.array(CATALOG_FORMAT, dtype=np.int64)
+    arrays['source_digest'] = np.frombuffer((catalog.source_digest or '').encode('ascii'), dtype=np.uint8)
+    
+    path = str(path)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        np.savez(f, **arrays)
+    os.replace(tmp_path, path)
+
+
+def _map_npz(path) -> Dict[str, np.ndarray]:
+    """Map an uncompressed ``.npz`` file and view each member in place."""
+    with zipfile.ZipFile(path) as archive:
+        members = archive.infolist()
+    
+    buffer = np.memmap(path, dtype=np.uint8, mode='r')
+    arrays = {}
+    for member in members:
+        if member.compress_type != zipfile.ZIP_STORED:
+            raise ValueError(f'{path} is compressed and cannot be mapped')
+        
+        # Local file header: fixed 30 bytes, then the name and extra field
+        name_length, extra_length = struct.unpack_from('<HH', buffer, member.header_offset + 26)
+        start = member.header_offset + 30 + name_length + extra_length
+        
+        header = io.BytesIO(buffer[start:start + 4096].tobytes())
+        version = np.lib.format.read_magic(header)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(header)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(header)
+        
+        offset = start + header.tell()
+        count = int(np.prod(shape, dtype=np.int64))
+        array = np.frombuffer(buffer, dtype=dtype, count=count, offset=offset)
+        arrays[member.filename[:-len('.npy')]] = array.reshape(shape, order='F' if fortran_order else 'C')
+    return arrays
+
+
+def load_catalog(path) -> ColumnarCatalog:
+    """
+    Load a compiled catalog without copying it.
+    
+    Args:
+        path: Path of the ``.npz`` file
+    
+    Returns:
+        ColumnarCatalog: Catalog whose columns are read-only views of the file
+    
+    Raises:
+        ValueError: If the file is not a catalog of the current format
+    """
+    arrays = _map_npz(path)
+    if 'format' not in arrays or int(arrays['format']) != CATALOG_FORMAT:
+        raise ValueError(f'{path} is not a catalog of format {CATALOG_FORMAT}')
+    
+    columns = {name[len('column_'):]: values
+               for name, values in arrays.items() if name.startswith('column_')}
+    strings = StringTable(arrays['strings_data'], arrays['strings_offsets'])
+    source_digest = arrays['source_digest'].tobytes().decode('ascii') or None
+    return ColumnarCatalog(columns, strings, source_digest)
+
+
+def file_digest(path) -> str:
+    """Get the SHA-256 hex digest of a file's contents."""
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def sources_digest(source_path, dependencies: Iterable = ()) -> str:
+    """
+    Get the digest recorded in a catalog compiled from a source.
+    
+    Args:
+        source_path: Path of the file the catalog is compiled from
+        dependencies: Paths of other files the build reads, such as the
+            module that scores the players
+    
+    Returns:
+        str: The source's digest, combined with the dependencies' digests
+    """
+    digest = file_digest(source_path)
+    dependencies = list(dependencies)
+    if not dependencies:
+        return digest
+    
+    combined = hashlib.sha256(digest.encode('ascii'))
+    for path in dependencies:
+        combined.update(file_digest(path).encode('ascii'))
+    return combined.hexdigest()
+
+
+def load_or_compile(catalog_path, source_path, build: Callable[[], pd.DataFrame],
+                    dependencies: Iterable = ()) -> ColumnarCatalog:
+    """
+    Load a compiled catalog, compiling it first if its source has changed.
+    
+    When the compiled file is missing, of an older format or compiled from
+    a different version of the source or its dependencies, ``build`` reads
+    the source and the new catalog is written in its place. If it cannot be
+    written, as on a read-only filesystem, the new catalog is still returned.
+    
+    Args:
+        catalog_path: Path of the compiled ``.npz`` file
+        source_path: Path of the file the catalog is compiled from
+        build: Reads the source into a DataFrame of players
+        dependencies: Paths of other files whose changes should recompile
+            the catalog, such as the module that scores the players
+    
+    Returns:
+        ColumnarCatalog: The catalog
+    """
+    digest = sources_digest(source_path, dependencies)
+    try:
+        catalog = load_catalog(catalog_path)
+        if catalog.source_digest == digest:
+            return catalog
+    except (OSError, ValueError, zipfile.BadZipFile):
+        pass
+    
+    catalog = ColumnarCatalog.from_frame(build(), source_digest=digest)
+    try:
+        save_catalog(catalog, catalog_path)
+    except OSError as e:
+        print(f"Could not write compiled player catalog {catalog_path}: {e}")
+    return catalog
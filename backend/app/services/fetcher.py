@@ -0,0 +1,181 @@
+"""Concurrent page fetching for the scraper.
+
+Player and season pages are fetched on a bounded thread pool, each thread
+with its own HTTP session, so a season's pages download together instead
+of one blocking request at a time. Fetched pages are kept in an on-disk
+cache with their ETag and Last-Modified validators; later fetches send
+conditional requests and reuse the cached body when the server answers
+304 Not Modified. Connection errors, timeouts and transient statuses
+(429 and 5xx) are retried with exponential backoff.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+import requests
+from config import Config
+
+
+# Statuses worth retrying; anything else is returned or raised at once
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class PageCache:
+    """
+    On-disk cache of fetched pages and the validators they were served with.
+
+    Each page is one file: a line of JSON with its URL and validators, then
+    the body. The file is written beside its target and renamed over it, so
+    a reader always sees a body together with the validators it was served
+    with.
+    """
+
+    def __init__(self, directory):
+        self.directory = str(directory)
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, url):
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, key + '.page')
+
+    def lookup(self, url) -> Optional[Tuple[bytes, Dict[str, str]]]:
+        """
+        Get a cached page with the request headers that revalidate it.
+
+        Returns:
+            (body, headers), or None if the page is not cached
+        """
+        try:
+            with open(self._path(url), 'rb') as f:
+                meta = json.loads(f.readline())
+                body = f.read()
+        except (FileNotFoundError, ValueError):
+            return None
+
+        headers = {}
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+        return body, headers
+
+    def put(self, url, content: bytes, headers) -> None:
+        """
+        Store a page with its validators.
+
+        Pages served without an ETag or Last-Modified cannot be revalidated
+        and are not stored.
+        """
+        etag = headers.get('ETag')
+        last_modified = headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return
+
+        meta = json.dumps({'url': url, 'etag': etag, 'last_modified': last_modified})
+        path = self._path(url)
+        # Write then rename, so a reader never sees half a page
+        tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(meta.encode('utf-8') + b'\n')
+            f.write(content)
+        os.replace(tmp_path, path)
+
+
+class PageFetcher:
+    """
+    Fetch pages concurrently through a cache, retrying transient failures.
+
+    Args:
+        cache_dir: Directory of the page cache, or None to disable caching
+        max_workers: Most pages fetched at once
+        retries: Retries after the first attempt of each page
+        backoff: Delay before the first retry, in seconds; doubles each retry
+        timeout: Connect and read timeout of each request, in seconds
+    """
+
+    def __init__(self, cache_dir=None, max_workers=None, retries=None,
+                 backoff=None, timeout=10):
+        self.cache = PageCache(cache_dir) if cache_dir else None
+        self.max_workers = max_workers or Config.SCRAPER_WORKERS
+        self.retries = Config.SCRAPER_RETRIES if retries is None else retries
+        self.backoff = Config.SCRAPER_BACKOFF if backoff is None else backoff
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _session(self) -> requests.Session:
+        # Sessions are not thread-safe, so each worker thread keeps its own
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            self._local.session = session
+        return session
+
+    def _retry_delay(self, attempt, response=None) -> float:
+        delay = self.backoff * (2 ** attempt)
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        if retry_after and retry_after.isdigit():
+            delay = max(delay, float(retry_after))
+        return delay
+
+    def fetch(self, url) -> bytes:
+        """
+        Fetch one page, from the cache if the server says it is unchanged.
+
+        Args:
+            url: URL of the page
+
+        Returns:
+            Body of the page
+
+        Raises:
+            requests.RequestException: If the page could not be fetched
+                after all retries
+        """
+        entry = self.cache.lookup(url) if self.cache else None
+        cached, headers = entry if entry else (None, {})
+
+        for attempt in range(self.retries + 1):
+            try:
+                response = self._session().get(url, headers=headers, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.retries:
+                    raise
+                time.sleep(self._retry_delay(attempt))
+                continue
+
+            if response.status_code in RETRY_STATUSES and attempt < self.retries:
+                time.sleep(self._retry_delay(attempt, response))
+                continue
+            break
+
+        if response.status_code == 304 and cached is not None:
+            return cached
+
+        response.raise_for_status()
+        if self.cache:
+            self.cache.put(url, response.content, response.headers)
+        return response.content
+
+    def fetch_all(self, urls: Iterable[str]) -> List[bytes]:
+        """
+        Fetch many pages concurrently.
+
+        Args:
+            urls: URLs of the pages
+
+        Returns:
+            Bodies of the pages, in the order of ``urls``
+
+        Raises:
+            requests.RequestException: If any page could not be fetched
+        """
+        urls = list(urls)
+        if len(urls) <= 1:
+            return [self.fetch(url) for url in urls]
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(urls)),
+                                thread_name_prefix='scraper-fetch') as executor:
+            return list(executor.map(self.fetch, urls))
@@ -0,0 +1,218 @@
+"""Per-room auction lot queues.
+
+The order in which players come up is decided once, when the auction is
+initialized, instead of asking the database for "any unsold player" before
+every lot. Each room gets a ``LotQueue`` over a fixed order of player IDs,
+so taking the next lot is O(1) and the next few lots can be shown as "up
+next".
+
+Players who draw no bids are held back and offered again, with a shorter
+timer, in an accelerated round once the main queue runs out.
+
+The order is derived from the room's players, ordering and seed, so every
+process computes the same one and caches it. How far the room has got
+through it is a small cursor (``LotQueue.cursor_state``) kept in the room's
+auction state, so all processes sharing a state store agree on the next lot.
+"""
+import random
+import threading
+
+
+# Role sets are auctioned in this order; other roles come last
+ROLE_SET_ORDER = ('BAT', 'WK', 'AR', 'BOWL')
+
+
+def order_marquee(players, rng):
+    """Most expensive players first, so marquee sets open the auction."""
+    return [p.id for p in sorted(players, key=lambda p: (-p.base_price, p.id))]
+
+
+def order_role_sets(players, rng):
+    """Batsmen, then wicket-keepers, all-rounders and bowlers; marquee within each set."""
+    rank = {role: i for i, role in enumerate(ROLE_SET_ORDER)}
+    return [p.id for p in sorted(
+        players,
+        key=lambda p: (rank.get(p.role, len(ROLE_SET_ORDER)), -p.base_price, p.id)
+    )]
+
+
+def order_shuffled(players, rng):
+    """Random order, reproducible from the room's seed."""
+    ids = sorted(p.id for p in players)
+    rng.shuffle(ids)
+    return ids
+
+
+ORDERING_STRATEGIES = {
+    'marquee': order_marquee,
+    'role_sets': order_role_sets,
+    'shuffled': order_shuffled,
+}
+
+DEFAULT_ORDERING = 'marquee'
+
+
+class LotQueue:
+    """Ordered queue of the player IDs still to be auctioned in a room."""
+
+    def __init__(self, player_ids, requeue_unsold=True, cursor=0, unsold=(), round=1):
+        """
+        Args:
+            player_ids: Player IDs in auction order
+            requeue_unsold: Whether players with no bids get a second round
+            cursor: Number of lots already taken in the current round
+            unsold: Player IDs held back for the accelerated round
+            round: 1 for the main round, 2 for the accelerated round
+        """
+        self._order = tuple(player_ids)
+        self._unsold = list(unsold)
+        self._requeue_unsold = requeue_unsold
+        self.cursor = cursor
+        self.round = round
+
+    @classmethod
+    def from_state(cls, player_ids, state, requeue_unsold=True):
+        """Rebuild a queue over ``player_ids`` at the cursor stored in ``state``."""
+        return cls(
+            player_ids, requeue_unsold,
+            cursor=state.get('lot_cursor') or 0,
+            unsold=state.get('lot_unsold') or (),
+            round=state.get('lot_round') or 1
+        )
+
+    def cursor_state(self):
+        """Get the queue's position as auction state fields."""
+        return {
+            'lot_cursor': self.cursor,
+            'lot_unsold': list(self._unsold),
+            'lot_round': self.round
+        }
+
+    @property
+    def accelerated(self):
+        """True once the queue is offering unsold players again."""
+        return self.round > 1
+
+    def _pending(self):
+        return self._unsold if self.accelerated else self._order
+
+    def next_lot(self):
+        """
+        Take the next player to auction.
+
+        Starts the accelerated round when the main queue is exhausted and
+        players were held back.
+
+        Returns:
+            int or None: Player ID, or None when the auction is over
+        """
+        if not self.accelerated and self.cursor >= len(self._order) and self._unsold:
+            self.round += 1
+            self.cursor = 0
+
+        pending = self._pending()
+        if self.cursor >= len(pending):
+            return None
+        self.cursor += 1
+        return pending[self.cursor - 1]
+
+    def peek(self, count=1):
+        """
+        Look at upcoming lots without taking them.
+
+        Returns:
+            list: Up to ``count`` player IDs in auction order
+        """
+        upcoming = list(self._pending()[self.cursor:self.cursor + count])
+        if len(upcoming) < count and not self.accelerated:
+            upcoming.extend(self._unsold[:count - len(upcoming)])
+        return upcoming
+
+    def requeue(self, player_id):
+        """
+        Hold back a player who drew no bids for the accelerated round.
+
+        Returns:
+            bool: True if the player was requeued; False in the accelerated
+                round or when requeueing is disabled
+        """
+        if not self._requeue_unsold or self.accelerated:
+            return False
+        self._unsold.append(player_id)
+        return True
+
+    def __len__(self):
+        remaining = len(self._pending()) - self.cursor
+        return remaining if self.accelerated else remaining + len(self._unsold)
+
+
+# room_code -> (state_epoch, player IDs in auction order)
+_orders = {}
+_orders_lock = threading.Lock()
+
+
+def order_lots(players, ordering=DEFAULT_ORDERING, seed=None):
+    """
+    Order players with a strategy.
+
+    Args:
+        players: Player-like objects with ``id``, ``role`` and ``base_price``
+        ordering: Name of a strategy in ``ORDERING_STRATEGIES``
+        seed: Seed for randomized strategies
+
+    Returns:
+        list: Player IDs in auction order
+
+    Raises:
+        ValueError: If the ordering is unknown
+    """
+    strategy = ORDERING_STRATEGIES.get(ordering)
+    if strategy is None:
+        raise ValueError(f"Unknown lot ordering: {ordering}")
+    return strategy(players, random.Random(seed))
+
+
+def build_lot_queue(room_code, players, ordering=DEFAULT_ORDERING, seed=None, requeue_unsold=True,
+                    epoch=None):
+    """
+    Order a room's players and cache the order, replacing any existing one.
+
+    Args:
+        room_code: Code of the room
+        players: Player-like objects with ``id``, ``role`` and ``base_price``
+        ordering: Name of a strategy in ``ORDERING_STRATEGIES``
+        seed: Seed for randomized strategies
+        requeue_unsold: Whether players with no bids get a second round
+        epoch: ``state_epoch`` of the auction state the order belongs to
+
+    Returns:
+        LotQueue: A queue at the start of the new order
+
+    Raises:
+        ValueError: If the ordering is unknown
+    """
+    order = tuple(order_lots(players, ordering, seed))
+    with _orders_lock:
+        _orders[room_code] = (epoch, order)
+    return LotQueue(order, requeue_unsold)
+
+
+def get_lot_queue(room_code, state):
+    """
+    Get a room's lot queue at the cursor stored in its auction state.
+
+    Returns:
+        LotQueue or None: The queue, or None if this process has not cached
+            the order for this state
+    """
+    with _orders_lock:
+        cached = _orders.get(room_code)
+    if cached is None or cached[0] != state.get('state_epoch'):
+        return None
+    return LotQueue.from_state(cached[1], state)
+
+
+def discard_lot_queue(room_code):
+    """Forget a room's cached lot order."""
+    with _orders_lock:
+        _orders.pop(room_code, None)
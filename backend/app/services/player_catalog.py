@@ -0,0 +1,197 @@
+"""In-process player catalog.
+
+The player table only changes when it is seeded or imported, yet every
+``/api/players`` request and every lot used to fetch players from the
+database and rebuild the same dictionaries. The catalog loads all players
+once, as one list per column read straight from a column query, and
+encodes each player's JSON and the full (gzipped) list for
+``/api/players`` the first time they are asked for.
+
+Each load gets a new version number. Any ORM insert, update or delete of a
+player marks the catalog stale, both at flush and again at commit, and the
+next reader reloads it. ``import_players_from_csv`` and ``seed_players``
+also invalidate it explicitly.
+"""
+import gzip
+import hashlib
+import json
+import threading
+from functools import cached_property
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+from app import db
+from app.models.player import Player
+
+
+PLAYER_FIELDS = (
+    'id', 'name', 'role', 'country', 'base_price',
+    'batting_score', 'bowling_score', 'overall_score', 'is_overseas'
+)
+
+
+def serialize_player(player):
+    """
+    Convert a player to the dictionary sent to clients.
+
+    Args:
+        player: Player object (or any object with the player fields)
+
+    Returns:
+        dict: Player data
+    """
+    return {field: getattr(player, field) for field in PLAYER_FIELDS}
+
+
+def _encode(value):
+    return json.dumps(value, separators=(',', ':')).encode('utf-8')
+
+
+class PlayerCatalog:
+    """Immutable snapshot of every player, held column by column."""
+
+    def __init__(self, columns, version):
+        """
+        Args:
+            columns: Dict of player field to a list of values, in catalog order
+            version: Version number of this snapshot
+        """
+        self.version = version
+        self._columns = {field: columns[field] for field in PLAYER_FIELDS}
+        self._rows = {player_id: row for row, player_id in enumerate(self._columns['id'])}
+        self._player_json = {}
+
+    def _data(self, row):
+        return {field: values[row] for field, values in self._columns.items()}
+
+    def get(self, player_id):
+        """
+        Get a player's data.
+
+        Returns:
+            dict or None: A copy of the player's data, or None if unknown
+        """
+        row = self._rows.get(player_id)
+        return self._data(row) if row is not None else None
+
+    def get_json(self, player_id):
+        """Get a player's JSON bytes, or None if unknown; encoded on first use."""
+        encoded = self._player_json.get(player_id)
+        if encoded is None:
+            row = self._rows.get(player_id)
+            if row is None:
+                return None
+            encoded = self._player_json[player_id] = _encode(self._data(row))
+        return encoded
+
+    # The full list is encoded and compressed on its first request rather
+    # than at load, keeping the reload after every import cheap
+    @cached_property
+    def list_json(self):
+        return _encode({'players': [self._data(row) for row in range(len(self))]})
+
+    @cached_property
+    def list_gzip(self):
+        return gzip.compress(self.list_json, compresslevel=6, mtime=0)
+
+    @cached_property
+    def etag(self):
+        return hashlib.sha1(self.list_json).hexdigest()
+
+    def __contains__(self, player_id):
+        return player_id in self._rows
+
+    def __len__(self):
+        return len(self._rows)
+
+
+_catalog = None
+_version = 0
+_catalog_lock = threading.Lock()
+
+# Set when a player row changes; cleared once the change is committed
+_changed_since_commit = False
+
+
+def load_player_catalog():
+    """
+    Load the catalog from the database, replacing the current one.
+
+    Must be called inside an application context.
+
+    Returns:
+        PlayerCatalog: The new catalog
+    """
+    global _catalog, _version
+
+    # Plain column rows; building 10k ORM objects took most of the load
+    rows = db.session.execute(
+        select(*[getattr(Player, field) for field in PLAYER_FIELDS]).order_by(Player.id)
+    ).all()
+    columns = {field: list(values) for field, values in zip(PLAYER_FIELDS, zip(*rows))}
+    if not rows:
+        columns = {field: [] for field in PLAYER_FIELDS}
+    with _catalog_lock:
+        _version += 1
+        _catalog = PlayerCatalog(columns, _version)
+        return _catalog
+
+
+def get_player_catalog():
+    """
+    Get the current catalog, reloading it if it was invalidated.
+
+    Returns:
+        PlayerCatalog: The current catalog
+    """
+    catalog = _catalog
+    if catalog is None:
+        catalog = load_player_catalog()
+    return catalog
+
+
+def invalidate_player_catalog():
+    """Mark the catalog stale so the next reader reloads it."""
+    global _catalog
+    with _catalog_lock:
+        _catalog = None
+
+
+def get_player_data(player_id):
+    """
+    Get one player's data from the catalog.
+
+    Args:
+        player_id: ID of the player
+
+    Returns:
+        dict or None: Player data, or None if the player does not exist
+    """
+    catalog = get_player_catalog()
+    data = catalog.get(player_id)
+    if data is None and player_id is not None:
+        # Player added since the catalog was loaded by some path the ORM
+        # events did not see, e.g. a bulk insert
+        player = db.session.get(Player, player_id)
+        if player is not None:
+            invalidate_player_catalog()
+            data = serialize_player(player)
+    return data
+
+
+def _on_player_change(mapper, connection, target):
+    global _changed_since_commit
+    _changed_since_commit = True
+    invalidate_player_catalog()
+
+
+def _on_commit(session):
+    # A reader may have reloaded between the flush and the commit
+    global _changed_since_commit
+    if _changed_since_commit:
+        _changed_since_commit = False
+        invalidate_player_catalog()
+
+
+for _event_name in ('after_insert', 'after_update', 'after_delete'):
+    event.listen(Player, _event_name, _on_player_change)
+event.listen(Session, 'after_commit', _on_commit)
@@ -0,0 +1,190 @@
+"""Auction results service.
+
+Results for a room are assembled from one joined query over teams, their
+players and ratings. Once a room is completed the results can no longer
+change, so they are stored as a ``ResultsSnapshot`` and later requests
+read that single row.
+"""
+import hashlib
+import json
+from sqlalchemy import and_
+from sqlalchemy.exc import IntegrityError
+from app import db
+from app.models.room import Room
+from app.models.team import Team
+from app.models.team_player import TeamPlayer
+from app.models.player import Player
+from app.models.team_rating import TeamRating
+from app.models.results_snapshot import ResultsSnapshot
+
+
+RATING_FIELDS = (
+    'overall_rating', 'batting_rating', 'bowling_rating',
+    'balance_score', 'bench_depth', 'role_coverage'
+)
+
+
+def results_etag(results):
+    """
+    Compute a stable ETag for a results payload.
+
+    Args:
+        results: Results dictionary
+
+    Returns:
+        str: Hex digest of the canonical JSON encoding
+    """
+    encoded = json.dumps(results, sort_keys=True, separators=(',', ':')).encode('utf-8')
+    return hashlib.sha1(encoded).hexdigest()
+
+
+def build_room_results(room):
+    """
+    Build the results payload for a room with a single query.
+
+    Args:
+        room: Room object
+
+    Returns:
+        dict: ``room_code``, ``teams`` and ``winner``
+    """
+    rows = db.session.query(Team, TeamPlayer, Player, TeamRating).outerjoin(
+        TeamPlayer, TeamPlayer.team_id == Team.id
+    ).outerjoin(
+        Player, Player.id == TeamPlayer.player_id
+    ).outerjoin(
+        TeamRating, TeamRating.team_id == Team.id
+    ).filter(Team.room_id == room.id).order_by(Team.id, TeamPlayer.id).all()
+
+    teams = {}
+    for team, tp, player, team_rating in rows:
+        entry = teams.get(team.id)
+        if entry is None:
+            entry = teams[team.id] = {
+                'team': team,
+                'rating': team_rating,
+                'playing_xi': [],
+                'bench': [],
+                'impact_player': None,
+                'seen': set()
+            }
+
+        # Skip empty squads, and repeats if a team has several rating rows
+        if tp is None or player is None or tp.id in entry['seen']:
+            continue
+        entry['seen'].add(tp.id)
+
+        player_data = {
+            'id': player.id,
+            'name': player.name,
+            'role': player.role,
+            'country': player.country,
+            'overall_score': player.overall_score,
+            'price': tp.price
+        }
+
+        if tp.in_playing_xi:
+            entry['playing_xi'].append(player_data)
+        else:
+            entry['bench'].append(player_data)
+
+        if tp.is_impact_player:
+            entry['impact_player'] = player_data
+
+    teams_data = []
+    winner = None
+    best_rating = -1
+    for entry in teams.values():
+        team, team_rating = entry['team'], entry['rating']
+
+        rating_data = None
+        if team_rating:
+            rating_data = {field: getattr(team_rating, field) for field in RATING_FIELDS}
+            # Highest overall rating wins; the first team wins ties
+            if team_rating.overall_rating > best_rating:
+                best_rating = team_rating.overall_rating
+                winner = team
+
+        teams_data.append({
+            'team_id': team.id,
+            'team_name': team.team_name,
+            'logo_url': team.logo_url,
+            'username': team.username,
+            'purse_left': team.purse_left,
+            'squad': entry['playing_xi'] + entry['bench'],
+            'playing_xi': entry['playing_xi'],
+            'bench': entry['bench'],
+            'impact_player': entry['impact_player'],
+            'rating': rating_data
+        })
+
+    winner_data = None
+    if winner:
+        winner_data = {
+            'team_id': winner.id,
+            'team_name': winner.team_name,
+            'username': winner.username
+        }
+
+    return {
+        'room_code': room.code,
+        'teams': teams_data,
+        'winner': winner_data
+    }
+
+
+def _snapshot_results(room, results, etag):
+    """
+    Store a completed room's results as a ResultsSnapshot row.
+
+    Two first requests may both get here; the room's unique snapshot key
+    lets one insert land, and the other serves the stored snapshot.
+
+    Returns:
+        ResultsSnapshot: The room's snapshot
+    """
+    snapshot = ResultsSnapshot(room_id=room.id, room_code=room.code, etag=etag, results=results)
+    db.session.add(snapshot)
+    try:
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        snapshot = ResultsSnapshot.query.filter_by(
+            room_id=room.id, room_code=room.code
+        ).one()
+    return snapshot
+
+
+def get_room_results(room_code):
+    """
+    Get a room's results and their ETag.
+
+    Completed rooms are served from their ``ResultsSnapshot``, which is
+    created on the first request after completion.
+
+    Args:
+        room_code: Code of the room
+
+    Returns:
+        tuple: (results: dict or None, etag: str or None); both are None if
+            the room does not exist
+    """
+    row = db.session.query(Room, ResultsSnapshot).outerjoin(
+        ResultsSnapshot, and_(ResultsSnapshot.room_id == Room.id,
+                              ResultsSnapshot.room_code == Room.code)
+    ).filter(Room.code == room_code).first()
+    if row is None:
+        return None, None
+
+    room, snapshot = row
+    if snapshot is not None:
+        return snapshot.results, snapshot.etag
+
+    results = build_room_results(room)
+    etag = results_etag(results)
+
+    if room.status == 'completed':
+        snapshot = _snapshot_results(room, results, etag)
+        return snapshot.results, snapshot.etag
+
+    return results, etag
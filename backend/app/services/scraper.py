@@ -2,87 +2,110 @@
 print("Starting scraper module import...")
 import csv
 import os
+import re
 from typing import List, Dict, Optional
-import requests
 from bs4 import BeautifulSoup
+from bs4.dammit import EncodingDetector
+import numpy as np
 import pandas as pd
+from config import Config
+from app.services.columnar_catalog import load_catalog
+from app.services.fetcher import PageFetcher
+from app.services.scoring import (
+    calculate_batting_score, calculate_bowling_score, calculate_overall_score,
+    calculate_batting_scores, calculate_bowling_scores, calculate_overall_scores, rescore
+)
 print("Imports successful...")
 
 
-def calculate_batting_score(stats: Dict) -> float:
-    """
-    Calculate batting score from raw statistics.
-    
-    Args:
-        stats: Dictionary containing batting statistics (runs, average, strike_rate, etc.)
-    
-    Returns:
-        Batting score as a float
-    """
-    # Extract stats with defaults
-    runs = stats.get('runs', 0)
-    average = stats.get('average', 0)
-    strike_rate = stats.get('strike_rate', 0)
-    
-    # Weighted formula for batting score
-    # Normalize to 0-100 scale
-    batting_score = (runs / 100) * 0.4 + average * 0.3 + (strike_rate / 2) * 0.3
-    return min(batting_score, 100.0)
+# lxml builds trees several times faster than the standard library parser
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+# Stats columns parsed as numbers; other cells are kept as text
+NUMERIC_FIELDS = frozenset({
+    'base_price', 'runs', 'average', 'strike_rate',
+    'wickets', 'economy', 'bowling_average'
+})
+
+# Cells that stats pages fill in for a stat the player has none of
+MISSING_VALUES = frozenset({'', '-', '\u2013', '\u2014'})
+
 
+# A player row; rows hold flat cells, so the first closing tag ends the row
+PLAYER_ROW_PATTERN = re.compile(
+    rb'<tr\b[^>]*\bclass\s*=\s*["\'][^"\']*\bplayer-row\b[^>]*>.*?</tr\s*>',
+    re.IGNORECASE | re.DOTALL
+)
 
-def calculate_bowling_score(stats: Dict) -> float:
+
+def parse_player_page(content) -> List[Dict]:
     """
-    Calculate bowling score from raw statistics.
+    Extract player rows from a stats page.
+    
+    Each player is a ``<tr class="player-row">`` whose cells are named by
+    their class (``<td class="runs">``). The player rows are cut out of the
+    page with a regular expression and only they are parsed, so navigation,
+    scripts and the rest of a large page never reach the HTML parser.
+    
+    Numeric cells that are empty or a dash, as for a player with no stats
+    in a season, are parsed as NaN and scored like a missing column.
     
     Args:
-        stats: Dictionary containing bowling statistics (wickets, economy, average, etc.)
+        content: HTML of the page, as bytes or text
     
     Returns:
-        Bowling score as a float
+        List of raw player stats dictionaries
     """
-    # Extract stats with defaults
-    wickets = stats.get('wickets', 0)
-    economy = stats.get('economy', 10)  # Lower is better
-    bowling_avg = stats.get('bowling_average', 50)  # Lower is better
-    
-    # Weighted formula for bowling score
-    # Normalize to 0-100 scale
-    wickets_score = min(wickets * 2, 50)  # Cap at 50
-    economy_score = max(0, (10 - economy) * 5)  # Lower economy = higher score
-    avg_score = max(0, (50 - bowling_avg) / 2)  # Lower average = higher score
-    
-    bowling_score = wickets_score * 0.5 + economy_score * 0.3 + avg_score * 0.2
-    return min(bowling_score, 100.0)
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+        encoding = 'utf-8'
+    else:
+        # Pages that do not declare an encoding are read as UTF-8
+        encoding = EncodingDetector.find_declared_encoding(content, is_html=True) or 'utf-8'
+    
+    rows = b''.join(match.group(0) for match in PLAYER_ROW_PATTERN.finditer(content))
+    if not rows:
+        return []
+    
+    soup = BeautifulSoup(b'<table>' + rows + b'</table>', HTML_PARSER, from_encoding=encoding)
+    players_data = []
+    for row in soup.find_all('tr', class_='player-row'):
+        player_data = {}
+        for cell in row.find_all('td', class_=True):
+            field = cell['class'][0]
+            value = cell.get_text(strip=True)
+            if field in NUMERIC_FIELDS:
+                value = np.nan if value in MISSING_VALUES else float(value)
+            player_data[field] = value
+        if player_data.get('name'):
+            players_data.append(player_data)
+    return players_data
 
 
-def calculate_overall_score(batting_score: float, bowling_score: float, role: str) -> float:
+def scrape_player_pages(urls: List[str], fetcher: Optional[PageFetcher] = None) -> pd.DataFrame:
     """
-    Compute overall player score based on role and statistics.
+    Scrape player data from many stats pages at once.
+    
+    Pages are fetched concurrently through the page cache, with retries.
     
     Args:
-        batting_score: Player's batting score
-        bowling_score: Player's bowling score
-        role: Player's role (BAT, BOWL, AR, WK)
+        urls: URLs of the player or season pages
+        fetcher: PageFetcher to use (optional, uses the configured defaults)
     
     Returns:
-        Overall score as a float
+        DataFrame containing player data from every page, in page order
     """
-    if role == 'BAT':
-        # Batsmen: 80% batting, 20% bowling
-        return batting_score * 0.8 + bowling_score * 0.2
-    elif role == 'BOWL':
-        # Bowlers: 20% batting, 80% bowling
-        return batting_score * 0.2 + bowling_score * 0.8
-    elif role == 'AR':
-        # All-rounders: 50% batting, 50% bowling
-        return batting_score * 0.5 + bowling_score * 0.5
-    elif role == 'WK':
-        # Wicket-keepers: 70% batting, 30% bowling (keeping not factored in this simple model)
-        return batting_score * 0.7 + bowling_score * 0.3
-    else:
-        # Default: equal weight
-        return batting_score * 0.5 + bowling_score * 0.5
-
+    if fetcher is None:
+        fetcher = PageFetcher(cache_dir=Config.SCRAPER_CACHE_DIR)
+    
+    players_data = []
+    for content in fetcher.fetch_all(urls):
+        players_data.extend(parse_player_page(content))
+    return pd.DataFrame(players_data)
 
 
 def scrape_player_data(url: Optional[str] = None) -> pd.DataFrame:
@@ -98,28 +121,9 @@ def scrape_player_data(url: Optional[str] = None) -> pd.DataFrame:
     Raises:
         Exception: If scraping fails
     """
-    # This is a placeholder implementation
-    # In a real scenario, you would scrape from an actual IPL statistics website
-    # For now, we'll create sample data
-    
     if url:
         try:
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Parse the HTML and extract player data
-            # This would be specific to the website structure
-            # Placeholder for actual scraping logic
-            players_data = []
-            
-            # Example parsing (would need to be adapted to actual website)
-            # player_rows = soup.find_all('tr', class_='player-row')
-            # for row in player_rows:
-            #     player_data = extract_player_from_row(row)
-            #     players_data.append(player_data)
-            
-            return pd.DataFrame(players_data)
+            return scrape_player_pages([url])
         except Exception as e:
             print(f"Scraping failed: {e}")
             raise
@@ -180,53 +184,54 @@ def generate_sample_player_data() -> List[Dict]:
 
 
 
+def _stat_column(df: pd.DataFrame, column: str, default: float) -> np.ndarray:
+    """Get a stats column as floats, with the default for missing values or a missing column."""
+    if column in df.columns:
+        values = df[column].to_numpy(dtype=float)
+        return np.where(np.isnan(values), default, values)
+    return np.full(len(df), default, dtype=float)
+
+
 def process_player_data(df: pd.DataFrame) -> pd.DataFrame:
     """
     Process raw player data and calculate scores.
     
+    Scores are computed a column at a time rather than row by row, so large
+    historical stats files process in a fraction of a second.
+    
     Args:
         df: DataFrame with raw player data
     
     Returns:
         DataFrame with calculated batting, bowling, and overall scores
     """
-    processed_data = []
-    
-    for _, row in df.iterrows():
-        # Calculate batting score
-        batting_stats = {
-            'runs': row.get('runs', 0),
-            'average': row.get('average', 0),
-            'strike_rate': row.get('strike_rate', 0)
-        }
-        batting_score = calculate_batting_score(batting_stats)
-        
-        # Calculate bowling score
-        bowling_stats = {
-            'wickets': row.get('wickets', 0),
-            'economy': row.get('economy', 10),
-            'bowling_average': row.get('bowling_average', 50)
-        }
-        bowling_score = calculate_bowling_score(bowling_stats)
-        
-        # Calculate overall score
-        overall_score = calculate_overall_score(batting_score, bowling_score, row['role'])
-        
-        # Determine if overseas
-        is_overseas = row['country'] != 'India'
-        
-        processed_data.append({
-            'name': row['name'],
-            'role': row['role'],
-            'country': row['country'],
-            'base_price': row['base_price'],
-            'batting_score': round(batting_score, 2),
-            'bowling_score': round(bowling_score, 2),
-            'overall_score': round(overall_score, 2),
-            'is_overseas': is_overseas
-        })
-    
-    return pd.DataFrame(processed_data)
+    columns = ['name', 'role', 'country', 'base_price',
+               'batting_score', 'bowling_score', 'overall_score', 'is_overseas']
+    if df.empty:
+        return pd.DataFrame(columns=columns)
+    
+    batting_scores = calculate_batting_scores(
+        _stat_column(df, 'runs', 0),
+        _stat_column(df, 'average', 0),
+        _stat_column(df, 'strike_rate', 0)
+    )
+    bowling_scores = calculate_bowling_scores(
+        _stat_column(df, 'wickets', 0),
+        _stat_column(df, 'economy', 10),
+        _stat_column(df, 'bowling_average', 50)
+    )
+    overall_scores = calculate_overall_scores(batting_scores, bowling_scores, df['role'])
+    
+    return pd.DataFrame({
+        'name': df['name'].to_numpy(),
+        'role': df['role'].to_numpy(),
+        'country': df['country'].to_numpy(),
+        'base_price': df['base_price'].to_numpy(),
+        'batting_score': np.round(batting_scores, 2),
+        'bowling_score': np.round(bowling_scores, 2),
+        'overall_score': np.round(overall_scores, 2),
+        'is_overseas': (df['country'] != 'India').to_numpy()
+    }, columns=columns)
 
 
 def save_to_csv(df: pd.DataFrame, filepath: str = 'players_data.csv') -> None:
@@ -241,48 +246,111 @@ def save_to_csv(df: pd.DataFrame, filepath: str = 'players_data.csv') -> None:
     print(f"Player data saved to {filepath}")
 
 
+def upsert_players(df: pd.DataFrame) -> int:
+    """
+    Insert or update players in bulk, keyed by name.
+    
+    Existing names are read in one query; new players are inserted and
+    existing ones updated with one executemany each. Only the first row
+    for a name in ``df`` is used. The caller commits.
+    
+    Args:
+        df: DataFrame of processed player data
+    
+    Returns:
+        Number of players inserted or updated
+    """
+    # Import here to avoid circular imports
+    from sqlalchemy import insert, update
+    from app import db
+    from app.models.player import Player
+    
+    fields = ['name', 'role', 'country', 'base_price',
+              'batting_score', 'bowling_score', 'overall_score', 'is_overseas']
+    df = df.drop_duplicates(subset='name', keep='first')
+    records = df[fields].astype(object).to_dict('records')
+    for record in records:
+        record['is_overseas'] = bool(record['is_overseas'])
+    
+    existing_ids = dict(db.session.query(Player.name, Player.id).all())
+    new_players = [record for record in records if record['name'] not in existing_ids]
+    updated_players = [
+        {**record, 'id': existing_ids[record['name']]}
+        for record in records if record['name'] in existing_ids
+    ]
+    
+    if new_players:
+        db.session.execute(insert(Player), new_players)
+    if updated_players:
+        db.session.execute(update(Player), updated_players)
+    
+    return len(new_players) + len(updated_players)
+
+
+def rescore_players() -> int:
+    """
+    Recompute every stored player's overall score with the current weights.
+    
+    All players are read in one query and rescored in one vectorized pass;
+    only the players whose score changed are updated, with one executemany.
+    
+    Returns:
+        Number of players whose overall score changed
+    """
+    # Import here to avoid circular imports
+    from sqlalchemy import update
+    from app import db
+    from app.models.player import Player
+    from app.services.player_catalog import invalidate_player_catalog
+    
+    rows = db.session.query(
+        Player.id, Player.role, Player.batting_score,
+        Player.bowling_score, Player.overall_score
+    ).all()
+    players = pd.DataFrame(rows, columns=['id', 'role', 'batting_score',
+                                          'bowling_score', 'overall_score'])
+    if players.empty:
+        return 0
+    
+    changed = rescore(players)
+    if not changed.empty:
+        db.session.execute(update(Player), changed.astype(object).to_dict('records'))
+        db.session.commit()
+        invalidate_player_catalog()
+    
+    return len(changed)
+
+
 def import_players_from_csv(filepath: str = 'players_data.csv') -> int:
     """
     Import player data from CSV file to database.
     
+    New players are added and players already in the database (matched by
+    name) are updated with the file's data. A compiled ``.npz`` player
+    catalog is read in place of a CSV when ``filepath`` names one.
+    
     Args:
-        filepath: Path to the CSV file
+        filepath: Path to the CSV or compiled catalog file
     
     Returns:
-        Number of players imported
+        Number of players imported or updated
     """
     # Import here to avoid circular imports
     from app import db
-    from app.models.player import Player
+    from app.services.player_catalog import invalidate_player_catalog
     
     if not os.path.exists(filepath):
         raise FileNotFoundError(f"CSV file not found: {filepath}")
     
-    df = pd.read_csv(filepath)
-    count = 0
-    
-    for _, row in df.iterrows():
-        # Check if player already exists
-        existing_player = Player.query.filter_by(name=row['name']).first()
-        if existing_player:
-            print(f"Player {row['name']} already exists, skipping...")
-            continue
-        
-        player = Player(
-            name=row['name'],
-            role=row['role'],
-            country=row['country'],
-            base_price=row['base_price'],
-            batting_score=row['batting_score'],
-            bowling_score=row['bowling_score'],
-            overall_score=row['overall_score'],
-            is_overseas=row['is_overseas']
-        )
-        db.session.add(player)
-        count += 1
+    if str(filepath).endswith('.npz'):
+        df = load_catalog(filepath).to_frame()
+    else:
+        df = pd.read_csv(filepath)
+    count = upsert_players(df)
     
     db.session.commit()
-    print(f"Imported {count} players to database")
+    invalidate_player_catalog()
+    print(f"Imported or updated {count} players in database")
     return count
 
 
@@ -0,0 +1,374 @@
+"""Pluggable storage for live auction state.
+
+Auction state (current lot, bid, highest bidder and per-room settings) used
+to live in a module-level dict, so each gunicorn worker saw its own copy.
+``AuctionStateStore`` abstracts that storage with three backends:
+
+- ``InMemoryAuctionStateStore``: single-process, the default
+- ``SQLAuctionStateStore``: the ``auction_states`` table in the app database
+- ``RedisAuctionStateStore``: one hash per room on a Redis-protocol server
+
+Every backend supports an atomic compare-and-set keyed on the room's bid
+sequence number, which is what lets several processes accept bids safely.
+"""
+import json
+import threading
+from datetime import datetime
+
+
+# Fields that change on every bid or lot; everything else is a setting
+HOT_FIELDS = ('current_player_id', 'current_bid', 'highest_bidder', 'lot_deadline', 'bid_seq')
+
+
+def _with_defaults(state):
+    """Copy a state dict, filling in hot fields that were left out."""
+    state = dict(state)
+    for field in HOT_FIELDS:
+        state.setdefault(field, 0 if field == 'bid_seq' else None)
+    return state
+
+
+class AuctionStateStore:
+    """Interface for auction state backends."""
+
+    def get(self, room_code):
+        """
+        Get a copy of a room's auction state.
+
+        Returns:
+            dict or None: State dictionary, or None if the room has none
+        """
+        raise NotImplementedError
+
+    def set(self, room_code, state):
+        """Replace a room's auction state."""
+        raise NotImplementedError
+
+    def update(self, room_code, **fields):
+        """Merge fields into a room's state, creating it if needed."""
+        raise NotImplementedError
+
+    def compare_and_set_bid(self, room_code, expected_seq, new_bid, new_bidder):
+        """
+        Atomically store a bid if the room's bid_seq is still ``expected_seq``.
+
+        On success bid_seq becomes ``expected_seq + 1``.
+
+        Args:
+            room_code: Code of the room
+            expected_seq: bid_seq the caller based its bid on
+            new_bid: Bid amount to store
+            new_bidder: Username to store as highest bidder
+
+        Returns:
+            bool: True if the bid was stored
+        """
+        raise NotImplementedError
+
+    def compare_and_set(self, room_code, expected_seq, **fields):
+        """
+        Atomically merge fields if the room's bid_seq is still ``expected_seq``.
+
+        On success bid_seq becomes ``expected_seq + 1``, so a caller that
+        closes a lot this way wins against every bid based on the same read.
+
+        Args:
+            room_code: Code of the room
+            expected_seq: bid_seq the caller's decision was based on
+            **fields: Fields to store
+
+        Returns:
+            bool: True if the fields were stored
+        """
+        raise NotImplementedError
+
+    def delete(self, room_code):
+        """Remove a room's auction state."""
+        raise NotImplementedError
+
+    def __contains__(self, room_code):
+        return self.get(room_code) is not None
+
+
+class InMemoryAuctionStateStore(AuctionStateStore):
+    """Process-local store backed by a dict."""
+
+    def __init__(self):
+        self._states = {}
+        self._lock = threading.Lock()
+
+    def get(self, room_code):
+        with self._lock:
+            state = self._states.get(room_code)
+            return dict(state) if state is not None else None
+
+    def set(self, room_code, state):
+        with self._lock:
+            self._states[room_code] = _with_defaults(state)
+
+    def update(self, room_code, **fields):
+        with self._lock:
+            self._states.setdefault(room_code, _with_defaults({})).update(fields)
+
+    def compare_and_set_bid(self, room_code, expected_seq, new_bid, new_bidder):
+        return self.compare_and_set(room_code, expected_seq,
+                                    current_bid=new_bid, highest_bidder=new_bidder)
+
+    def compare_and_set(self, room_code, expected_seq, **fields):
+        with self._lock:
+            state = self._states.get(room_code)
+            if state is None or state.get('bid_seq') != expected_seq:
+                return False
+            state.update(fields, bid_seq=expected_seq + 1)
+            return True
+
+    def delete(self, room_code):
+        with self._lock:
+            self._states.pop(room_code, None)
+
+
+class SQLAuctionStateStore(AuctionStateStore):
+    """
+    Store backed by the ``auction_states`` table.
+
+    Each call runs in its own short transaction on a dedicated connection, so
+    it never commits unrelated work pending on the request's session.
+    """
+
+    def __init__(self, engine_getter):
+        """
+        Args:
+            engine_getter: Callable returning the SQLAlchemy engine to use
+        """
+        from app.models.auction_state import AuctionStateRecord
+        self._engine_getter = engine_getter
+        self._table = AuctionStateRecord.__table__
+
+    def _row_to_state(self, row):
+        state = dict(row.settings or {})
+        for field in HOT_FIELDS:
+            state[field] = getattr(row, field)
+        return state
+
+    def _split(self, fields):
+        hot = {k: v for k, v in fields.items() if k in HOT_FIELDS}
+        settings = {k: v for k, v in fields.items() if k not in HOT_FIELDS}
+        return hot, settings
+
+    def get(self, room_code):
+        table = self._table
+        with self._engine_getter().connect() as conn:
+            row = conn.execute(
+                table.select().where(table.c.room_code == room_code)
+            ).first()
+        return self._row_to_state(row) if row is not None else None
+
+    def set(self, room_code, state):
+        table = self._table
+        hot, settings = self._split(_with_defaults(state))
+        with self._engine_getter().begin() as conn:
+            conn.execute(table.delete().where(table.c.room_code == room_code))
+            conn.execute(table.insert().values(
+                room_code=room_code,
+                settings=settings,
+                updated_at=datetime.utcnow(),
+                **hot
+            ))
+
+    def update(self, room_code, **fields):
+        table = self._table
+        hot, settings = self._split(fields)
+        with self._engine_getter().begin() as conn:
+            row = conn.execute(
+                table.select().where(table.c.room_code == room_code)
+            ).first()
+            if row is None:
+                conn.execute(table.insert().values(
+                    room_code=room_code,
+                    settings=settings,
+                    updated_at=datetime.utcnow(),
+                    **hot
+                ))
+                return
+
+            values = dict(hot, updated_at=datetime.utcnow())
+            if settings:
+                values['settings'] = dict(row.settings or {}, **settings)
+            conn.execute(table.update().where(table.c.room_code == room_code).values(**values))
+
+    def compare_and_set_bid(self, room_code, expected_seq, new_bid, new_bidder):
+        return self.compare_and_set(room_code, expected_seq,
+                                    current_bid=new_bid, highest_bidder=new_bidder)
+
+    def compare_and_set(self, room_code, expected_seq, **fields):
+        table = self._table
+        hot, settings = self._split(fields)
+        hot.pop('bid_seq', None)
+        where = (table.c.room_code == room_code, table.c.bid_seq == expected_seq)
+        with self._engine_getter().begin() as conn:
+            values = dict(hot, bid_seq=expected_seq + 1, updated_at=datetime.utcnow())
+            if settings:
+                # The UPDATE re-checks bid_seq, so a merge based on a stale read is dropped
+                row = conn.execute(table.select().where(*where)).first()
+                if row is None:
+                    return False
+                values['settings'] = dict(row.settings or {}, **settings)
+            result = conn.execute(table.update().where(*where).values(**values))
+        return result.rowcount == 1
+
+    def delete(self, room_code):
+        table = self._table
+        with self._engine_getter().begin() as conn:
+            conn.execute(table.delete().where(table.c.room_code == room_code))
+
+
+class RedisAuctionStateStore(AuctionStateStore):
+    """
+    Store backed by a Redis-protocol server.
+
+    Each room is a hash at ``<prefix><room_code>`` whose values are
+    JSON-encoded. Every write runs as a Lua script, so it is atomic on the
+    server and no reader sees a half-written state.
+    """
+
+    # ARGV: field/value pairs of the new state
+    SET_SCRIPT = """
+redis.call('DEL', KEYS[1])
+redis.call('HSET', KEYS[1], unpack(ARGV))
+return 1
+"""
+
+    # ARGV: index of the last default, default field/value pairs (kept if
+    # the field already exists), then field/value pairs to set
+    UPDATE_SCRIPT = """
+local split = tonumber(ARGV[1])
+for i = 2, split, 2 do
+    redis.call('HSETNX', KEYS[1], ARGV[i], ARGV[i + 1])
+end
+redis.call('HSET', KEYS[1], unpack(ARGV, split + 1))
+return 1
+"""
+
+    # ARGV: expected bid_seq, new bid_seq, then field/value pairs to set
+    CAS_SCRIPT = """
+if redis.call('HGET', KEYS[1], 'bid_seq') == ARGV[1] then
+    redis.call('HSET', KEYS[1], 'bid_seq', ARGV[2], unpack(ARGV, 3))
+    return 1
+end
+return 0
+"""
+
+    def __init__(self, client, prefix='auction:state:'):
+        """
+        Args:
+            client: redis-py compatible client (``hgetall``, ``delete``,
+                ``eval``)
+            prefix: Key prefix for room hashes
+        """
+        self._client = client
+        self._prefix = prefix
+
+    def _key(self, room_code):
+        return f'{self._prefix}{room_code}'
+
+    @staticmethod
+    def _encode(value):
+        return json.dumps(value)
+
+    @staticmethod
+    def _decode(value):
+        if isinstance(value, bytes):
+            value = value.decode('utf-8')
+        return json.loads(value)
+
+    def get(self, room_code):
+        raw = self._client.hgetall(self._key(room_code))
+        if not raw:
+            return None
+        return {
+            (k.decode('utf-8') if isinstance(k, bytes) else k): self._decode(v)
+            for k, v in raw.items()
+        }
+
+    def _pairs(self, fields):
+        return [item for field, value in fields.items() for item in (field, self._encode(value))]
+
+    def set(self, room_code, state):
+        self._client.eval(self.SET_SCRIPT, 1, self._key(room_code),
+                          *self._pairs(_with_defaults(state)))
+
+    def update(self, room_code, **fields):
+        if not fields:
+            return
+        # Hot fields are filled in only if this creates the room's state
+        defaults = {k: v for k, v in _with_defaults({}).items() if k not in fields}
+        default_pairs = self._pairs(defaults)
+        self._client.eval(self.UPDATE_SCRIPT, 1, self._key(room_code),
+                          len(default_pairs) + 1, *default_pairs, *self._pairs(fields))
+
+    def compare_and_set_bid(self, room_code, expected_seq, new_bid, new_bidder):
+        return self.compare_and_set(room_code, expected_seq,
+                                    current_bid=new_bid, highest_bidder=new_bidder)
+
+    def compare_and_set(self, room_code, expected_seq, **fields):
+        fields.pop('bid_seq', None)
+        result = self._client.eval(
+            self.CAS_SCRIPT, 1, self._key(room_code),
+            self._encode(expected_seq), self._encode(expected_seq + 1), *self._pairs(fields)
+        )
+        return int(result) == 1
+
+    def delete(self, room_code):
+        self._client.delete(self._key(room_code))
+
+
+_state_store = InMemoryAuctionStateStore()
+
+
+def create_state_store(config):
+    """
+    Build a state store from application config.
+
+    Config keys:
+        AUCTION_STATE_BACKEND: 'memory' (default), 'sql' or 'redis'
+        REDIS_URL: Server URL for the redis backend
+
+    Args:
+        config: Flask config mapping
+
+    Returns:
+        AuctionStateStore: The configured store
+    """
+    backend = config.get('AUCTION_STATE_BACKEND', 'memory')
+
+    if backend == 'memory':
+        return InMemoryAuctionStateStore()
+
+    if backend == 'sql':
+        from app import db
+        return SQLAuctionStateStore(lambda: db.engine)
+
+    if backend == 'redis':
+        try:
+            import redis
+        except ImportError:
+            raise ImportError("The redis package is required for AUCTION_STATE_BACKEND='redis'")
+        return RedisAuctionStateStore(redis.Redis.from_url(config['REDIS_URL']))
+
+    raise ValueError(f"Unknown auction state backend: {backend}")
+
+
+def init_state_store(app):
+    """Configure the process-wide state store for an application."""
+    set_state_store(create_state_store(app.config))
+
+
+def set_state_store(store):
+    """Replace the process-wide state store."""
+    global _state_store
+    _state_store = store
+
+
+def get_state_store():
+    """Get the process-wide state store."""
+    return _state_store
@@ -0,0 +1,141 @@
+"""Server-side auction timer scheduler.
+
+Lot deadlines for every active room live in a single min-heap that one
+background task drains. Clients no longer decide when a lot closes, so each
+lot is settled exactly once no matter how many browsers are watching.
+
+The heap only wakes the process that presented a lot. The authoritative
+deadline is ``lot_deadline`` in the room's auction state, which bids on any
+process extend; settlement rechecks it and reschedules if it moved.
+
+Extending a deadline pushes a new heap entry instead of re-sorting; the old
+entry is recognised as stale and skipped when it reaches the top. Every
+operation is O(log n) in the number of scheduled rooms.
+"""
+import heapq
+import itertools
+import threading
+import time
+
+
+class AuctionTimerScheduler:
+    """Min-heap of per-room lot deadlines."""
+
+    def __init__(self, clock=time.monotonic):
+        self._clock = clock
+        self._heap = []
+        # room_code -> (deadline, generation) for the live lot
+        self._deadlines = {}
+        self._generations = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def schedule(self, room_code, duration):
+        """
+        Start the timer for a new lot, replacing any existing one.
+
+        Args:
+            room_code: Code of the room
+            duration: Seconds until the lot closes
+
+        Returns:
+            float: The new deadline
+        """
+        with self._lock:
+            deadline = self._clock() + duration
+            generation = next(self._generations)
+            self._deadlines[room_code] = (deadline, generation)
+            heapq.heappush(self._heap, (deadline, generation, room_code))
+            return deadline
+
+    def extend(self, room_code, min_remaining):
+        """
+        Push a lot's deadline out so at least ``min_remaining`` seconds are left.
+
+        Args:
+            room_code: Code of the room
+            min_remaining: Minimum seconds the lot should stay open
+
+        Returns:
+            float or None: Seconds remaining, or None if no lot is scheduled
+        """
+        with self._lock:
+            entry = self._deadlines.get(room_code)
+            if entry is None:
+                return None
+
+            deadline, generation = entry
+            now = self._clock()
+            if deadline - now < min_remaining:
+                deadline = now + min_remaining
+                self._deadlines[room_code] = (deadline, generation)
+                heapq.heappush(self._heap, (deadline, generation, room_code))
+
+            return deadline - now
+
+    def cancel(self, room_code):
+        """Stop the timer for a room; any queued heap entries become stale."""
+        with self._lock:
+            self._deadlines.pop(room_code, None)
+
+    def remaining(self, room_code):
+        """
+        Get seconds left on a room's current lot.
+
+        Returns:
+            float or None: Seconds remaining, or None if no lot is scheduled
+        """
+        with self._lock:
+            entry = self._deadlines.get(room_code)
+            if entry is None:
+                return None
+            return max(0.0, entry[0] - self._clock())
+
+    def pop_expired(self):
+        """
+        Remove and return every room whose lot deadline has passed.
+
+        Each scheduled lot is returned at most once.
+
+        Returns:
+            list: Room codes ordered by deadline
+        """
+        expired = []
+        with self._lock:
+            now = self._clock()
+            while self._heap and self._heap[0][0] <= now:
+                deadline, generation, room_code = heapq.heappop(self._heap)
+                if self._deadlines.get(room_code) == (deadline, generation):
+                    del self._deadlines[room_code]
+                    expired.append(room_code)
+        return expired
+
+    def expire_if_due(self, room_code):
+        """
+        Claim a single room's lot if its deadline has passed.
+
+        Returns:
+            bool: True if the caller now owns settlement of the lot
+        """
+        with self._lock:
+            entry = self._deadlines.get(room_code)
+            if entry is None or entry[0] > self._clock():
+                return False
+            del self._deadlines[room_code]
+            return True
+
+    def next_deadline(self):
+        """Get the earliest live deadline, or None if nothing is scheduled."""
+        with self._lock:
+            while self._heap:
+                deadline, generation, room_code = self._heap[0]
+                if self._deadlines.get(room_code) == (deadline, generation):
+                    return deadline
+                heapq.heappop(self._heap)
+            return None
+
+    def __len__(self):
+        with self._lock:
+            return len(self._deadlines)
+
+
+timer_scheduler = AuctionTimerScheduler()
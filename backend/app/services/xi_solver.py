@@ -0,0 +1,133 @@
+"""Exact playing XI solver.
+
+Replaces brute-force enumeration of every 11-player combination with a
+dynamic program over role buckets. Within a role, players are split into
+domestic and overseas lists sorted by score, so for any fixed number of
+picks from a bucket the best choice is always a prefix of that list. The DP
+then only has to decide how many domestic and overseas players to take from
+each role, tracking (players picked, overseas picked).
+"""
+
+XI_SIZE = 11
+MAX_OVERSEAS = 4
+
+# Allowed number of picks per role: (minimum, maximum)
+ROLE_LIMITS = {
+    'WK': (1, 1),
+    'BAT': (3, XI_SIZE),
+    'BOWL': (2, XI_SIZE),
+    'AR': (1, 3),
+}
+
+# Players whose role is not listed above are unconstrained
+OTHER_LIMITS = (0, XI_SIZE)
+
+
+def _prefix_sums(players, indices):
+    """Return cumulative overall scores of the players at sorted squad indices."""
+    sums = [0.0]
+    for index in indices:
+        sums.append(sums[-1] + players[index].overall_score)
+    return sums
+
+
+def _bucket_players(players):
+    """
+    Group players by role and overseas status, best first.
+
+    Ties are broken by squad order so results are deterministic.
+
+    Args:
+        players: List of Player-like objects
+
+    Returns:
+        list: (limits, domestic, overseas) tuples, one per role bucket,
+            where domestic and overseas are lists of squad indices
+    """
+    ranked = sorted(enumerate(players), key=lambda item: (-item[1].overall_score, item[0]))
+
+    grouped = {}
+    for index, player in ranked:
+        role = player.role if player.role in ROLE_LIMITS else None
+        domestic, overseas = grouped.setdefault(role, ([], []))
+        (overseas if player.is_overseas else domestic).append(index)
+
+    buckets = []
+    for role, limits in ROLE_LIMITS.items():
+        domestic, overseas = grouped.get(role, ([], []))
+        buckets.append((limits, domestic, overseas))
+
+    if None in grouped:
+        domestic, overseas = grouped[None]
+        buckets.append((OTHER_LIMITS, domestic, overseas))
+
+    return buckets
+
+
+def solve_playing_xi(players):
+    """
+    Select the highest-scoring valid playing XI from a squad.
+
+    Constraints (same as ``ai_service.is_valid_combination``):
+    - Exactly 11 players
+    - Exactly 1 wicket-keeper (WK)
+    - At least 3 batsmen (BAT)
+    - At least 2 bowlers (BOWL)
+    - Between 1 and 3 all-rounders (AR)
+    - At most 4 overseas players
+
+    Runs in O(roles * 11 * 4 * 11 * 4) regardless of squad size.
+
+    Args:
+        players: List of Player-like objects with ``role``,
+            ``is_overseas`` and ``overall_score`` attributes
+
+    Returns:
+        list: Selected players in squad order, or an empty list if no
+            valid XI exists
+    """
+    if len(players) < XI_SIZE:
+        return []
+
+    buckets = _bucket_players(players)
+
+    # best[(picked, overseas)] = (score, choices) where choices holds the
+    # (domestic, overseas) count taken from each bucket processed so far
+    best = {(0, 0): (0.0, ())}
+
+    for (min_count, max_count), domestic, overseas in buckets:
+        domestic_sums = _prefix_sums(players, domestic)
+        overseas_sums = _prefix_sums(players, overseas)
+        next_best = {}
+
+        for (picked, picked_overseas), (score, choices) in best.items():
+            max_overseas = min(len(overseas), MAX_OVERSEAS - picked_overseas)
+            for n_overseas in range(max_overseas + 1):
+                for n_domestic in range(len(domestic) + 1):
+                    count = n_domestic + n_overseas
+                    if count > max_count or picked + count > XI_SIZE:
+                        break
+                    if count < min_count:
+                        continue
+
+                    key = (picked + count, picked_overseas + n_overseas)
+                    total = score + domestic_sums[n_domestic] + overseas_sums[n_overseas]
+                    if key not in next_best or total > next_best[key][0]:
+                        next_best[key] = (total, choices + ((n_domestic, n_overseas),))
+
+        best = next_best
+        if not best:
+            return []
+
+    finalists = [value for (picked, _), value in best.items() if picked == XI_SIZE]
+    if not finalists:
+        return []
+
+    _, choices = max(finalists, key=lambda value: value[0])
+
+    selected = []
+    for (_, domestic, overseas), (n_domestic, n_overseas) in zip(buckets, choices):
+        selected.extend(domestic[:n_domestic])
+        selected.extend(overseas[:n_overseas])
+
+    return [players[index] for index in sorted(selected)]
@@ -0,0 +1,111 @@
+"""Engine configuration for SQLite and server databases.
+
+SQLite's defaults suit a single writer: the rollback journal blocks
+readers while a bid is written, and a second writer fails at once with
+"database is locked". File databases are therefore opened in WAL mode,
+where readers never block the writer, with a busy timeout so concurrent
+writers wait their turn instead of failing. Server databases get a pool
+that checks connections before use.
+
+The Streamlit app keeps an identical copy in ``models/db_config.py``;
+pool sizes and the busy timeout come from each app's ``Config``.
+"""
+from sqlalchemy import create_engine, event
+from sqlalchemy.pool import StaticPool
+from config import Config
+
+# Applied to every new SQLite connection, in order
+SQLITE_PRAGMAS = (
+    ('journal_mode', 'WAL'),
+    ('synchronous', 'NORMAL'),  # Durable at checkpoints; safe with WAL
+    ('busy_timeout', Config.DB_BUSY_TIMEOUT_MS),
+    ('mmap_size', 256 * 1024 * 1024),
+    ('cache_size', -64 * 1024),  # Negative means KiB: 64 MiB
+    ('temp_store', 'MEMORY'),
+)
+
+
+def is_sqlite(database_uri):
+    """Check whether a database URL points at SQLite."""
+    return database_uri.startswith('sqlite')
+
+
+def is_sqlite_memory(database_uri):
+    """Check whether a database URL points at an in-memory SQLite database."""
+    return is_sqlite(database_uri) and (
+        database_uri in ('sqlite://', 'sqlite:///') or ':memory:' in database_uri
+    )
+
+
+def engine_options(database_uri):
+    """
+    Get ``create_engine`` keyword arguments for a database URL.
+
+    Args:
+        database_uri: SQLAlchemy database URL
+
+    Returns:
+        dict: Engine options
+    """
+    if is_sqlite_memory(database_uri):
+        # Every thread must see the same database, so share one connection;
+        # pool and WAL settings do not apply
+        return {'connect_args': {'check_same_thread': False}, 'poolclass': StaticPool}
+
+    if is_sqlite(database_uri):
+        return {
+            'connect_args': {
+                'check_same_thread': False,
+                'timeout': Config.DB_BUSY_TIMEOUT_MS / 1000
+            },
+            'pool_size': Config.DB_POOL_SIZE,
+            'max_overflow': Config.DB_MAX_OVERFLOW
+        }
+
+    return {
+        'pool_size': Config.DB_POOL_SIZE,
+        'max_overflow': Config.DB_MAX_OVERFLOW,
+        'pool_pre_ping': True,
+        'pool_recycle': 1800
+    }
+
+
+def install_sqlite_pragmas(engine):
+    """
+    Apply ``SQLITE_PRAGMAS`` to every connection the engine opens.
+
+    Does nothing for other databases and for in-memory SQLite.
+
+    Args:
+        engine: Engine to configure
+    """
+    database_uri = engine.url.render_as_string(hide_password=False)
+    if not is_sqlite(database_uri) or is_sqlite_memory(database_uri):
+        return
+
+    @event.listens_for(engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in SQLITE_PRAGMAS:
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+
+def create_configured_engine(database_uri, **overrides):
+    """
+    Create an engine with the options and pragmas for its database.
+
+    Args:
+        database_uri: SQLAlchemy database URL
+        **overrides: Extra ``create_engine`` options
+
+    Returns:
+        Engine: Configured engine
+    """
+    options = engine_options(database_uri)
+    options.update(overrides)
+    engine = create_engine(database_uri, **options)
+    install_sqlite_pragmas(engine)
+    return engine
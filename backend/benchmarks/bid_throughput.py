@@ -0,0 +1,169 @@
+"""Bid acceptance throughput with concurrent bidders in one room.
+
+Each bidder runs on its own thread and bids as fast as it can, quoting the
+sequence number it last saw. Reports accepted and attempted bids per second
+and checks that accepted bids got consecutive, unique sequence numbers.
+
+Usage (from backend/):
+    python -m benchmarks.bid_throughput
+    python -m benchmarks.bid_throughput --bidders 1 10 100 --bids 50
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import threading
+import time
+from app import create_app, db
+from app.models import Room, Team, Player
+from app.services.auction_service import (
+    initialize_auction, present_next_player, place_bid, get_bid_seq
+)
+from app.services.state_store import get_state_store
+from config import Config
+
+
+def _make_config(database_uri):
+    """Build a config class pointing at the benchmark database."""
+    class BenchmarkConfig(Config):
+        TESTING = True
+        SQLALCHEMY_DATABASE_URI = database_uri
+        AUCTION_STATE_BACKEND = 'memory'
+
+    return BenchmarkConfig
+
+
+def _setup_room(room_code, bidders):
+    """Create a room with one lot open and a team per bidder."""
+    room = Room(code=room_code, host_username='bidder0', max_users=max(bidders, 2))
+    db.session.add(room)
+    db.session.commit()
+
+    for i in range(bidders):
+        db.session.add(Team(
+            room_id=room.id,
+            username=f'bidder{i}',
+            team_name=f'Team {i}',
+            initial_purse=1e9,
+            purse_left=1e9
+        ))
+    db.session.add(Player(
+        name=f'Benchmark Player {room_code}', role='BAT', country='India', base_price=2.0,
+        batting_score=80.0, bowling_score=10.0, overall_score=70.0, is_overseas=False
+    ))
+    db.session.commit()
+
+    initialize_auction(room_code)
+    present_next_player(room_code)
+
+
+def run_benchmark(app, bidders, bids_per_bidder, room_code=None):
+    """
+    Run one round of concurrent bidding in a fresh room.
+
+    Args:
+        app: Flask application whose database is already created
+        bidders: Number of concurrent bidder threads
+        bids_per_bidder: Bid attempts per bidder
+        room_code: Optional room code; defaults to one derived from ``bidders``
+
+    Returns:
+        dict: ``bidders``, ``attempts``, ``accepted``, ``elapsed``,
+            ``accepted_per_sec``, ``attempts_per_sec``, ``p50_ms``,
+            ``p99_ms``, ``seqs`` (accepted sequence numbers) and
+            ``start_seq``
+    """
+    room_code = room_code or f'B{bidders:05d}'
+
+    with app.app_context():
+        _setup_room(room_code, bidders)
+        start_seq = get_bid_seq(room_code)
+
+    barrier = threading.Barrier(bidders)
+    lock = threading.Lock()
+    seqs = []
+    latencies = []
+
+    def bidder(index):
+        username = f'bidder{index}'
+        local_seqs = []
+        local_latencies = []
+        with app.app_context():
+            barrier.wait()
+            for _ in range(bids_per_bidder):
+                started = time.perf_counter()
+                result = place_bid(room_code, username, get_bid_seq(room_code))
+                local_latencies.append(time.perf_counter() - started)
+                if result.success:
+                    local_seqs.append(result.seq)
+            db.session.remove()
+        with lock:
+            seqs.extend(local_seqs)
+            latencies.extend(local_latencies)
+
+    threads = [threading.Thread(target=bidder, args=(i,)) for i in range(bidders)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    attempts = bidders * bids_per_bidder
+    return {
+        'bidders': bidders,
+        'attempts': attempts,
+        'accepted': len(seqs),
+        'elapsed': elapsed,
+        'accepted_per_sec': len(seqs) / elapsed,
+        'attempts_per_sec': attempts / elapsed,
+        'p50_ms': statistics.median(latencies) * 1000,
+        'p99_ms': latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+        'seqs': sorted(seqs),
+        'start_seq': start_seq
+    }
+
+
+def check_result(app, result, room_code=None):
+    """
+    Verify that a benchmark round accepted bids consistently.
+
+    Raises:
+        AssertionError: If sequence numbers are duplicated or have gaps, or
+            the final bid does not match the number of accepted bids
+    """
+    room_code = room_code or f'B{result["bidders"]:05d}'
+    expected = list(range(result['start_seq'] + 1, result['start_seq'] + result['accepted'] + 1))
+    assert result['seqs'] == expected, 'accepted bids must get unique, consecutive seqs'
+
+    with app.app_context():
+        state = get_state_store().get(room_code)
+    assert state['bid_seq'] == result['start_seq'] + result['accepted']
+    assert state['current_bid'] == 2.0 + result['accepted'] * state['bid_increment']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--bidders', type=int, nargs='+', default=[1, 10, 100])
+    parser.add_argument('--bids', type=int, default=50, help='bid attempts per bidder')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_app(_make_config(f'sqlite:///{os.path.join(tmp, "bench.db")}'))
+
+        print(f'{"bidders":>8} {"attempts":>9} {"accepted":>9} {"acc/s":>10} '
+              f'{"att/s":>10} {"p50 ms":>8} {"p99 ms":>8}')
+        for bidders in args.bidders:
+            result = run_benchmark(app, bidders, args.bids)
+            check_result(app, result)
+            print(f'{result["bidders"]:>8} {result["attempts"]:>9} {result["accepted"]:>9} '
+                  f'{result["accepted_per_sec"]:>10.0f} {result["attempts_per_sec"]:>10.0f} '
+                  f'{result["p50_ms"]:>8.2f} {result["p99_ms"]:>8.2f}')
+
+        with app.app_context():
+            db.engine.dispose()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""Player catalog cold start for a large player universe.
+
+Times the steps a fresh worker takes before it can serve players, for
+``--players`` synthetic players: reading the seed players (a CSV through
+pandas against the compiled, memory-mapped ``.npz`` catalog), and loading
+the in-process player catalog from the database (ORM objects with every
+player's JSON and the gzipped list encoded up front, as the catalog used
+to, against one column query with encoding deferred to first use).
+
+Usage (from backend/):
+    python -m benchmarks.catalog_cold_start
+    python -m benchmarks.catalog_cold_start --players 10000 --repeat 5
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import time
+import pandas as pd
+from sqlalchemy import insert
+from app import create_app, db
+from app.models import Player
+from app.services import player_catalog
+from app.services.columnar_catalog import ColumnarCatalog, save_catalog, load_catalog
+from app.services.scraper import process_player_data
+from benchmarks.bid_throughput import _make_config
+from benchmarks.scraper_ingest import make_stats
+
+
+def legacy_catalog_load():
+    """Build the catalog from ORM objects, encoding everything up front."""
+    players = Player.query.order_by(Player.id).all()
+    player_json = {}
+    for player in players:
+        data = player_catalog.serialize_player(player)
+        player_json[player.id] = json.dumps(data, separators=(',', ':')).encode('utf-8')
+    list_json = b'{"players":[' + b','.join(player_json.values()) + b']}'
+    gzip.compress(list_json, mtime=0)
+    hashlib.sha1(list_json).hexdigest()
+
+
+def _best_ms(func, repeat):
+    best = None
+    for _ in range(repeat):
+        db.session.expunge_all()
+        started = time.perf_counter()
+        func()
+        elapsed = (time.perf_counter() - started) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--players', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5, help='runs per step; the best is shown')
+    args = parser.parse_args()
+
+    players = process_player_data(make_stats(args.players))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, 'players.csv')
+        catalog_path = os.path.join(tmp, 'players.npz')
+        players.to_csv(csv_path, index=False)
+        save_catalog(ColumnarCatalog.from_frame(players), catalog_path)
+
+        app = create_app(_make_config(f'sqlite:///{os.path.join(tmp, "bench.db")}'))
+        with app.app_context():
+            db.session.execute(insert(Player), load_catalog(catalog_path).records())
+            db.session.commit()
+
+            steps = (
+                ('seed players, CSV', lambda: pd.read_csv(csv_path).to_dict('records')),
+                ('seed players, compiled catalog', lambda: load_catalog(catalog_path).records()),
+                ('player catalog, ORM + eager encode', legacy_catalog_load),
+                ('player catalog, columns', player_catalog.load_player_catalog),
+            )
+            print(f'{args.players} players, best of {args.repeat}')
+            print(f'{"step":<36} {"ms":>10}')
+            for label, func in steps:
+                print(f'{label:<36} {_best_ms(func, args.repeat):>10.1f}')
+
+            cold_ms = _best_ms(lambda: (load_catalog(catalog_path).records(),
+                                        player_catalog.load_player_catalog()), args.repeat)
+            print(f'{"cold start, compiled + columns":<36} {cold_ms:>10.1f}')
+
+            db.engine.dispose()
+
+
+if __name__ == '__main__':
+    main()
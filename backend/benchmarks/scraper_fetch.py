@@ -0,0 +1,91 @@
+"""Scraper fetch and parse time against the local fixture server.
+
+Serves ``--pages`` season pages from the fixture server, each answered
+after ``--delay`` seconds to stand in for a remote site, and times:
+fetching them one at a time with no cache (as scrape_player_data used to),
+fetching them on the thread pool with a cold cache, and again with a warm
+cache, where every page is revalidated with a 304. Parsing a page's
+player rows only is timed against parsing the whole page with
+BeautifulSoup, as the scraper used to.
+
+Usage (from backend/):
+    python -m benchmarks.scraper_fetch
+    python -m benchmarks.scraper_fetch --pages 64 --delay 0.05 --workers 16
+"""
+import argparse
+import tempfile
+import time
+from bs4 import BeautifulSoup
+from app.services.fetcher import PageFetcher
+from app.services.scraper import HTML_PARSER, parse_player_page, scrape_player_pages
+from benchmarks.scraper_ingest import make_stats
+from tests.fixture_server import FixturePage, FixtureServer, render_player_page
+
+
+def legacy_parse(content):
+    """Parse the whole page, then find the player rows in it."""
+    soup = BeautifulSoup(content, 'html.parser')
+    return soup.find_all('tr', class_='player-row')
+
+
+def _timed_ms(func, *args, **kwargs):
+    started = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, (time.perf_counter() - started) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pages', type=int, default=64)
+    parser.add_argument('--players-per-page', type=int, default=20)
+    parser.add_argument('--padding', type=int, default=2000,
+                        help='unrelated table rows on each page')
+    parser.add_argument('--delay', type=float, default=0.05,
+                        help='seconds the server waits before answering')
+    parser.add_argument('--workers', type=int, default=16)
+    args = parser.parse_args()
+
+    stats = make_stats(args.pages * args.players_per_page).to_dict('records')
+    pages = {
+        f'/season/{page}': FixturePage(
+            render_player_page(stats[page * args.players_per_page:(page + 1) * args.players_per_page],
+                               padding=args.padding),
+            etag=f'"season-{page}"',
+            delay=args.delay
+        )
+        for page in range(args.pages)
+    }
+
+    with FixtureServer(pages) as server, tempfile.TemporaryDirectory() as cache_dir:
+        urls = [server.url(path) for path in pages]
+
+        sequential = PageFetcher(cache_dir=None, max_workers=1)
+        _, sequential_ms = _timed_ms(lambda: [sequential.fetch(url) for url in urls])
+
+        fetcher = PageFetcher(cache_dir=cache_dir, max_workers=args.workers)
+        df, cold_ms = _timed_ms(scrape_player_pages, urls, fetcher=fetcher)
+        _, warm_ms = _timed_ms(scrape_player_pages, urls, fetcher=fetcher)
+        _, warm_fetch_ms = _timed_ms(fetcher.fetch_all, urls)
+        assert len(df) == len(stats)
+
+        body = next(iter(pages.values())).body
+        _, legacy_parse_ms = _timed_ms(legacy_parse, body)
+        _, parse_ms = _timed_ms(parse_player_page, body)
+
+    print(f'{args.pages} pages, {args.players_per_page} players each, '
+          f'{len(body) / 1024:.0f} KiB per page, {args.delay * 1000:.0f} ms server delay')
+    print(f'{"step":<38} {"ms":>10}')
+    for label, ms in (
+        ('fetch, one at a time, no cache', sequential_ms),
+        (f'fetch + parse, {args.workers} workers, cold', cold_ms),
+        (f'fetch + parse, {args.workers} workers, warm', warm_ms),
+        (f'fetch only, {args.workers} workers, warm', warm_fetch_ms),
+        ('parse one page, whole page', legacy_parse_ms),
+        (f'parse one page, rows only ({HTML_PARSER})', parse_ms),
+    ):
+        print(f'{label:<38} {ms:>10.1f}')
+    print(f'304 responses on the warm passes: {sum(server.not_modified.values())}/{2 * args.pages}')
+
+
+if __name__ == '__main__':
+    main()
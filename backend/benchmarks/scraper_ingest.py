@@ -0,0 +1,128 @@
+"""Scraper ingest time for a large historical stats file.
+
+Times ``process_player_data`` (scoring) and ``import_players_from_csv``
+(bulk upsert by name) for a synthetic stats file, then re-imports the same
+file to time the update path. The row-by-row scoring and per-name
+existence-check import they replaced are timed alongside on the first
+``--legacy-rows`` rows, since the old import takes minutes at full size.
+
+Usage (from backend/):
+    python -m benchmarks.scraper_ingest
+    python -m benchmarks.scraper_ingest --rows 50000 --legacy-rows 2000
+"""
+import argparse
+import os
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from app import create_app, db
+from app.models import Player
+from app.services.scraper import (
+    calculate_batting_score, calculate_bowling_score, calculate_overall_score,
+    process_player_data, import_players_from_csv
+)
+from benchmarks.bid_throughput import _make_config
+
+
+ROLES = np.array(['BAT', 'BOWL', 'AR', 'WK'])
+COUNTRIES = np.array(['India', 'India', 'Australia', 'England', 'South Africa'])
+
+
+def make_stats(rows, seed=0):
+    """Build a synthetic raw stats frame with ``rows`` distinct players."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'name': [f'Historical Player {i}' for i in range(rows)],
+        'role': ROLES[rng.integers(0, len(ROLES), rows)],
+        'country': COUNTRIES[rng.integers(0, len(COUNTRIES), rows)],
+        'base_price': rng.choice([0.5, 1.0, 1.5, 2.0], rows),
+        'runs': rng.uniform(0, 8000, rows),
+        'average': rng.uniform(5, 55, rows),
+        'strike_rate': rng.uniform(60, 180, rows),
+        'wickets': rng.uniform(0, 200, rows),
+        'economy': rng.uniform(5, 12, rows),
+        'bowling_average': rng.uniform(15, 60, rows),
+    })
+
+
+def legacy_process(df):
+    """Score players one row at a time, as process_player_data used to."""
+    processed = []
+    for _, row in df.iterrows():
+        batting_score = calculate_batting_score(row)
+        bowling_score = calculate_bowling_score(row)
+        processed.append({
+            'name': row['name'], 'role': row['role'], 'country': row['country'],
+            'base_price': row['base_price'],
+            'batting_score': round(batting_score, 2),
+            'bowling_score': round(bowling_score, 2),
+            'overall_score': round(calculate_overall_score(batting_score, bowling_score, row['role']), 2),
+            'is_overseas': row['country'] != 'India'
+        })
+    return pd.DataFrame(processed)
+
+
+def legacy_import(df):
+    """Import players with a per-name existence check, as the importer used to."""
+    for _, row in df.iterrows():
+        if Player.query.filter_by(name=row['name']).first():
+            continue
+        db.session.add(Player(**{field: row[field] for field in (
+            'name', 'role', 'country', 'base_price',
+            'batting_score', 'bowling_score', 'overall_score', 'is_overseas'
+        )}))
+    db.session.commit()
+
+
+def _timed_ms(func, *args):
+    started = time.perf_counter()
+    result = func(*args)
+    return result, (time.perf_counter() - started) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=50000)
+    parser.add_argument('--legacy-rows', type=int, default=2000,
+                        help='rows to time the old row-by-row path on (0 to skip)')
+    args = parser.parse_args()
+
+    raw_df = make_stats(args.rows)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_app(_make_config(f'sqlite:///{os.path.join(tmp, "bench.db")}'))
+        csv_path = os.path.join(tmp, 'players.csv')
+
+        with app.app_context():
+            processed_df, process_ms = _timed_ms(process_player_data, raw_df)
+            processed_df.to_csv(csv_path, index=False)
+            _, insert_ms = _timed_ms(import_players_from_csv, csv_path)
+            _, update_ms = _timed_ms(import_players_from_csv, csv_path)
+
+            print(f'{args.rows} rows')
+            print(f'{"step":<28} {"ms":>10} {"rows/s":>12}')
+            for label, ms, rows in (
+                ('score (columnar)', process_ms, args.rows),
+                ('import, all new (bulk)', insert_ms, args.rows),
+                ('import, all existing (bulk)', update_ms, args.rows),
+            ):
+                print(f'{label:<28} {ms:>10.1f} {rows / ms * 1000:>12.0f}')
+
+            if args.legacy_rows:
+                sample = raw_df.head(args.legacy_rows)
+                legacy_df, legacy_process_ms = _timed_ms(legacy_process, sample)
+                Player.query.delete()
+                db.session.commit()
+                _, legacy_import_ms = _timed_ms(legacy_import, legacy_df)
+                rows = len(sample)
+                print(f'{"score (row by row)":<28} {legacy_process_ms:>10.1f} '
+                      f'{rows / legacy_process_ms * 1000:>12.0f}')
+                print(f'{"import (per-name check)":<28} {legacy_import_ms:>10.1f} '
+                      f'{rows / legacy_import_ms * 1000:>12.0f}')
+
+            db.engine.dispose()
+
+
+if __name__ == '__main__':
+    main()
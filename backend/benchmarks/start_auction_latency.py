@@ -0,0 +1,116 @@
+"""Start-auction latency against player catalog size.
+
+Times ``initialize_auction`` plus presenting the first lot, i.e. how long
+the host waits between pressing start and seeing a player, for catalogs of
+increasing size. The per-player existence check loop that initialization
+used to run is timed alongside for comparison.
+
+Usage (from backend/):
+    python -m benchmarks.start_auction_latency
+    python -m benchmarks.start_auction_latency --sizes 500 10000 --no-legacy
+"""
+import argparse
+import os
+import tempfile
+import time
+from app import create_app, db
+from app.models import Room, Player, AuctionPlayer
+from app.services.auction_service import initialize_auction, present_next_player
+from benchmarks.bid_throughput import _make_config
+
+
+ROLES = ('BAT', 'BOWL', 'AR', 'WK')
+
+
+def _seed_catalog(size):
+    """Replace the player catalog with ``size`` synthetic players."""
+    AuctionPlayer.query.delete()
+    Room.query.delete()
+    Player.query.delete()
+    db.session.bulk_insert_mappings(Player, [{
+        'name': f'Player {i}',
+        'role': ROLES[i % len(ROLES)],
+        'country': 'India' if i % 3 else 'Australia',
+        'base_price': 0.5 + (i % 20) * 0.5,
+        'batting_score': float(i % 100),
+        'bowling_score': float((i * 7) % 100),
+        'overall_score': float((i * 13) % 100),
+        'is_overseas': i % 3 == 0
+    } for i in range(size)])
+    db.session.commit()
+
+
+def _create_room(room_code):
+    room = Room(code=room_code, host_username='host')
+    db.session.add(room)
+    db.session.commit()
+    return room
+
+
+def _legacy_initialize(room):
+    """The old initialization loop: one existence check per player."""
+    for player in Player.query.all():
+        existing = AuctionPlayer.query.filter_by(room_id=room.id, player_id=player.id).first()
+        if not existing:
+            db.session.add(AuctionPlayer(room_id=room.id, player_id=player.id, is_sold=False))
+    db.session.commit()
+
+
+def time_start_auction(app, size, legacy=True):
+    """
+    Time starting an auction against a catalog of ``size`` players.
+
+    Args:
+        app: Flask application whose database is already created
+        size: Number of players in the catalog
+        legacy: Also time the old per-player initialization loop
+
+    Returns:
+        dict: ``size``, ``start_ms`` (initialize plus first lot) and
+            ``legacy_ms`` (None if not measured)
+    """
+    with app.app_context():
+        _seed_catalog(size)
+
+        room = _create_room(f'S{size:06d}')
+        started = time.perf_counter()
+        success, message = initialize_auction(room.code)
+        player = present_next_player(room.code)
+        start_ms = (time.perf_counter() - started) * 1000
+        assert success, message
+        assert player is not None
+        assert AuctionPlayer.query.filter_by(room_id=room.id).count() == size
+
+        legacy_ms = None
+        if legacy:
+            legacy_room = _create_room(f'L{size:06d}')
+            started = time.perf_counter()
+            _legacy_initialize(legacy_room)
+            legacy_ms = (time.perf_counter() - started) * 1000
+
+        db.session.remove()
+
+    return {'size': size, 'start_ms': start_ms, 'legacy_ms': legacy_ms}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 500, 1000, 5000, 10000])
+    parser.add_argument('--no-legacy', action='store_true', help='skip the old per-player loop')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_app(_make_config(f'sqlite:///{os.path.join(tmp, "bench.db")}'))
+
+        print(f'{"players":>8} {"start ms":>10} {"legacy ms":>10}')
+        for size in args.sizes:
+            result = time_start_auction(app, size, legacy=not args.no_legacy)
+            legacy = f'{result["legacy_ms"]:>10.1f}' if result['legacy_ms'] is not None else f'{"-":>10}'
+            print(f'{result["size"]:>8} {result["start_ms"]:>10.1f} {legacy}')
+
+        with app.app_context():
+            db.engine.dispose()
+
+
+if __name__ == '__main__':
+    main()
@@ -9,3 +9,6 @@ python init_db.py
 
 # Seed with player data
 python seed_data.py
+
+# Bring stored scores in line with the current scoring weights
+python rescore_players.py
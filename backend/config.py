@@ -11,5 +11,20 @@ class Config:
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or \
         f'sqlite:///{basedir / "auction.db"}'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 10))  # Per worker; eventlet serves many sockets each
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', 20))
+    DB_BUSY_TIMEOUT_MS = int(os.environ.get('DB_BUSY_TIMEOUT_MS', 5000))  # SQLite lock wait
     UPLOAD_FOLDER = basedir / 'uploads'
+    PLAYERS_CATALOG = os.environ.get('PLAYERS_CATALOG') or basedir / 'data' / 'players.npz'  # Compiled seed players
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
+    AI_WORKERS = int(os.environ.get('AI_WORKERS', 2))  # Processes for team analysis
+    AI_MAX_PENDING_JOBS = int(os.environ.get('AI_MAX_PENDING_JOBS', 50))
+    AI_JOB_TTL = int(os.environ.get('AI_JOB_TTL', 3600))  # Seconds finished jobs stay queryable
+    AI_MAX_FINISHED_JOBS = int(os.environ.get('AI_MAX_FINISHED_JOBS', 1000))
+    AUCTION_STATE_BACKEND = os.environ.get('AUCTION_STATE_BACKEND', 'memory')  # memory, sql, redis
+    REDIS_URL = os.environ.get('REDIS_URL', 'redis://localhost:6379/0')
+    AUCTION_LOT_ORDER = os.environ.get('AUCTION_LOT_ORDER', 'marquee')  # marquee, role_sets, shuffled
+    SCRAPER_CACHE_DIR = os.environ.get('SCRAPER_CACHE_DIR') or basedir / '.scraper_cache'
+    SCRAPER_WORKERS = int(os.environ.get('SCRAPER_WORKERS', 8))  # Pages fetched at once
+    SCRAPER_RETRIES = int(os.environ.get('SCRAPER_RETRIES', 3))
+    SCRAPER_BACKOFF = float(os.environ.get('SCRAPER_BACKOFF', 0.5))  # Seconds before the first retry
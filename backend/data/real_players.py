@@ -371,14 +371,3 @@ REAL_IPL_PLAYERS = [
     {"name": "Vidarbha Samad", "role": "AR", "country": "India", "base_price": 0.3, "batting_score": 62, "bowling_score": 68, "is_overseas": False},
     {"name": "Markande Mayank", "role": "BOWL", "country": "India", "base_price": 0.3, "batting_score": 10, "bowling_score": 70, "is_overseas": False},
 ]
-
-def calculate_overall_score(batting_score, bowling_score, role):
-    """Calculate overall score based on role."""
-    if role == 'BAT':
-        return batting_score * 0.8 + bowling_score * 0.2
-    elif role == 'BOWL':
-        return bowling_score * 0.8 + batting_score * 0.2
-    elif role == 'AR':
-        return (batting_score + bowling_score) / 2
-    else:  # WK
-        return batting_score * 0.9 + bowling_score * 0.1
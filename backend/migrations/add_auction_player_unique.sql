@@ -0,0 +1,12 @@
+-- Migration: Unique auction player per room
+-- Description: initialize_auction bulk-inserts auction_players with
+-- INSERT ... SELECT and relies on one row per (room_id, player_id).
+
+-- Drop duplicate rows left by the old per-player existence checks
+DELETE FROM auction_players
+WHERE id NOT IN (
+    SELECT MIN(id) FROM auction_players GROUP BY room_id, player_id
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_auction_players_room_player
+    ON auction_players(room_id, player_id);
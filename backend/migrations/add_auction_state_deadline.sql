@@ -0,0 +1,6 @@
+-- Migration: Shared lot deadline
+-- Description: the current lot's closing time moves from each process's
+-- timer into the auction state, so a bid accepted by any worker extends
+-- the deadline every worker sees. Unix time, NULL when no lot is open.
+
+ALTER TABLE auction_states ADD COLUMN lot_deadline FLOAT;
@@ -0,0 +1,76 @@
+-- Migration: Indexes and uniqueness on the auction hot tables
+-- Description: lots, squads and teams are looked up by these column pairs
+-- on every bid, settlement and analysis; without indexes each lookup scans
+-- every room's history. The unique indexes stop a player being added to a
+-- squad twice and a user owning two teams in one room.
+
+-- Fold each user's duplicate teams in a room into their first team: move
+-- their squads, ratings and sold lots over to the first team
+UPDATE team_players
+SET team_id = (
+    SELECT MIN(keep.id) FROM teams keep JOIN teams dup
+        ON keep.room_id = dup.room_id AND keep.username = dup.username
+    WHERE dup.id = team_players.team_id
+)
+WHERE team_id IN (
+    SELECT id FROM teams WHERE id NOT IN (SELECT MIN(id) FROM teams GROUP BY room_id, username)
+);
+
+UPDATE team_ratings
+SET team_id = (
+    SELECT MIN(keep.id) FROM teams keep JOIN teams dup
+        ON keep.room_id = dup.room_id AND keep.username = dup.username
+    WHERE dup.id = team_ratings.team_id
+)
+WHERE team_id IN (
+    SELECT id FROM teams WHERE id NOT IN (SELECT MIN(id) FROM teams GROUP BY room_id, username)
+);
+
+UPDATE auction_players
+SET sold_to_team_id = (
+    SELECT MIN(keep.id) FROM teams keep JOIN teams dup
+        ON keep.room_id = dup.room_id AND keep.username = dup.username
+    WHERE dup.id = auction_players.sold_to_team_id
+)
+WHERE sold_to_team_id IN (
+    SELECT id FROM teams WHERE id NOT IN (SELECT MIN(id) FROM teams GROUP BY room_id, username)
+);
+
+-- Drop duplicate squad rows, keeping the first purchase
+DELETE FROM team_players
+WHERE id NOT IN (
+    SELECT MIN(id) FROM team_players GROUP BY team_id, player_id
+);
+
+-- A merged team keeps its first rating
+DELETE FROM team_ratings
+WHERE id NOT IN (
+    SELECT MIN(id) FROM team_ratings GROUP BY team_id
+);
+
+-- Recompute the merged teams' purses from their merged squads
+UPDATE teams
+SET purse_left = initial_purse - COALESCE(
+    (SELECT SUM(price) FROM team_players WHERE team_players.team_id = teams.id), 0
+)
+WHERE id IN (
+    SELECT MIN(id) FROM teams GROUP BY room_id, username HAVING COUNT(*) > 1
+);
+
+-- The duplicates now own nothing
+DELETE FROM teams
+WHERE id NOT IN (
+    SELECT MIN(id) FROM teams GROUP BY room_id, username
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_teams_room_username
+    ON teams(room_id, username);
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_team_players_team_player
+    ON team_players(team_id, player_id);
+
+CREATE INDEX IF NOT EXISTS ix_team_players_team_xi
+    ON team_players(team_id, in_playing_xi);
+
+CREATE INDEX IF NOT EXISTS ix_auction_players_room_sold
+    ON auction_players(room_id, is_sold);
@@ -0,0 +1,19 @@
+"""Rescore every stored player with the current scoring weights.
+
+Run after changing the formulas or role weights in app/services/scoring.py.
+"""
+from app import create_app
+from app.services.scraper import rescore_players
+
+
+def main():
+    """Recompute stored overall scores."""
+    app = create_app()
+    
+    with app.app_context():
+        count = rescore_players()
+        print(f"Rescored {count} players")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,11 +1,65 @@
 """Seed script for development data."""
 import csv
+import os
 import random
+import sys
+import numpy as np
+import pandas as pd
+from sqlalchemy import insert
 from app import create_app, db
 from app.models.player import Player
 from app.models.room import Room
 from app.models.user import User
 from app.models.team import Team
+from app.services.player_catalog import invalidate_player_catalog
+from app.services.columnar_catalog import (
+    ColumnarCatalog, load_or_compile, save_catalog, sources_digest
+)
+from app.services import scoring
+from app.services.scoring import calculate_overall_scores
+from config import Config
+
+# Real player data lives beside this script, in data/real_players.py
+sys.path.insert(0, os.path.dirname(__file__))
+SEED_SOURCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'real_players.py')
+# Overall scores are computed while compiling, so new weights recompile too
+SEED_DEPENDENCIES = (scoring.__file__,)
+
+
+def build_seed_players():
+    """
+    Read the real IPL players into a DataFrame, scored like scraped players.
+    
+    Returns:
+        DataFrame of player data
+    """
+    from data.real_players import REAL_IPL_PLAYERS
+    
+    players = pd.DataFrame(REAL_IPL_PLAYERS)
+    players['overall_score'] = np.round(calculate_overall_scores(
+        players['batting_score'], players['bowling_score'], players['role']
+    ), 2)
+    return players
+
+
+def load_seed_catalog():
+    """
+    Load the compiled seed player catalog, recompiling it if
+    data/real_players.py or the scoring module has changed since it was
+    compiled.
+    
+    Returns:
+        ColumnarCatalog of the seed players
+    """
+    return load_or_compile(Config.PLAYERS_CATALOG, SEED_SOURCE, build_seed_players,
+                           dependencies=SEED_DEPENDENCIES)
+
+
+def compile_seed_catalog():
+    """Compile data/real_players.py into the seed player catalog."""
+    catalog = ColumnarCatalog.from_frame(build_seed_players(), source_digest=sources_digest(SEED_SOURCE, SEED_DEPENDENCIES))
+    save_catalog(catalog, Config.PLAYERS_CATALOG)
+    print(f"Compiled {len(catalog)} players to {Config.PLAYERS_CATALOG}")
 
 
 def seed_players():
@@ -18,34 +72,13 @@ def seed_players():
         print(f"Players already seeded ({existing_count} players found). Skipping...")
         return
     
-    # Import real player data
-    import sys
-    import os
-    sys.path.insert(0, os.path.dirname(__file__))
-    from data.real_players import REAL_IPL_PLAYERS, calculate_overall_score
-    
-    # Add all real IPL players
-    print(f"Adding {len(REAL_IPL_PLAYERS)} real IPL players with authentic base prices...")
-    for player_data in REAL_IPL_PLAYERS:
-        overall_score = calculate_overall_score(
-            player_data['batting_score'],
-            player_data['bowling_score'],
-            player_data['role']
-        )
-        
-        player = Player(
-            name=player_data['name'],
-            role=player_data['role'],
-            country=player_data['country'],
-            base_price=player_data['base_price'],
-            batting_score=player_data['batting_score'],
-            bowling_score=player_data['bowling_score'],
-            overall_score=round(overall_score, 2),
-            is_overseas=player_data['is_overseas']
-        )
-        db.session.add(player)
+    # Add all real IPL players from the compiled catalog
+    catalog = load_seed_catalog()
+    print(f"Adding {len(catalog)} real IPL players with authentic base prices...")
+    db.session.execute(insert(Player), catalog.records())
     
     db.session.commit()
+    invalidate_player_catalog()
     final_count = Player.query.count()
     print(f"Successfully added all {final_count} real IPL players!")
     print(f"All players have authentic IPL auction base prices (0.3 Cr - 2.0 Cr)")
@@ -177,11 +210,11 @@ def main():
 
 
 if __name__ == '__main__':
-    import sys
-    
     if len(sys.argv) > 1 and sys.argv[1] == '--clear':
         app = create_app()
         with app.app_context():
             clear_all_data()
+    elif len(sys.argv) > 1 and sys.argv[1] == '--compile':
+        compile_seed_catalog()
     else:
         main()
@@ -0,0 +1,155 @@
+"""Local HTTP server of fixture pages for offline scraper tests and benchmarks.
+
+Pages are plugged in by path. Each page can carry an ETag and
+Last-Modified (and answers conditional requests with 304), fail with a
+status a set number of times before succeeding, or be served after a
+delay to stand in for a slow site. The server counts the requests and 304
+responses each path received.
+"""
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+
+@dataclass
+class FixturePage:
+    """A page served by the fixture server."""
+    body: bytes
+    content_type: str = 'text/html; charset=utf-8'
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    fail_times: int = 0  # Answer with fail_status this many times first
+    fail_status: int = 503
+    delay: float = 0.0  # Seconds to wait before answering
+
+
+class FixtureServer:
+    """
+    Serve fixture pages on a free local port.
+
+    Usage:
+        with FixtureServer({'/season/2024': FixturePage(body)}) as server:
+            scrape_player_pages([server.url('/season/2024')])
+    """
+
+    def __init__(self, pages: Optional[Dict[str, FixturePage]] = None):
+        self.pages = dict(pages or {})
+        self.requests = Counter()
+        self.not_modified = Counter()
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer(('127.0.0.1', 0), self._make_handler())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    def add_page(self, path, page: FixturePage) -> None:
+        """Serve ``page`` at ``path``."""
+        self.pages[path] = page
+
+    def url(self, path) -> str:
+        """Get the URL of a path on this server."""
+        host, port = self._httpd.server_address[:2]
+        return f'http://{host}:{port}{path}'
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _respond(self, handler) -> None:
+        path = handler.path
+        with self._lock:
+            self.requests[path] += 1
+            page = self.pages.get(path)
+            failing = page is not None and page.fail_times > 0
+            if failing:
+                page.fail_times -= 1
+
+        if page is None:
+            handler.send_error(404)
+            return
+        if page.delay:
+            time.sleep(page.delay)
+        if failing:
+            handler.send_error(page.fail_status)
+            return
+
+        if_none_match = handler.headers.get('If-None-Match')
+        if_modified_since = handler.headers.get('If-Modified-Since')
+        if ((page.etag and if_none_match == page.etag)
+                or (page.last_modified and not if_none_match
+                    and if_modified_since == page.last_modified)):
+            with self._lock:
+                self.not_modified[path] += 1
+            handler.send_response(304)
+            handler.end_headers()
+            return
+
+        handler.send_response(200)
+        handler.send_header('Content-Type', page.content_type)
+        handler.send_header('Content-Length', str(len(page.body)))
+        if page.etag:
+            handler.send_header('ETag', page.etag)
+        if page.last_modified:
+            handler.send_header('Last-Modified', page.last_modified)
+        handler.end_headers()
+        handler.wfile.write(page.body)
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                server._respond(self)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def render_player_page(players: List[Dict], padding: int = 0) -> bytes:
+    """
+    Render players as a stats page in the layout the scraper parses.
+
+    Args:
+        players: Raw player stats dictionaries
+        padding: Number of unrelated table rows to add around the players,
+            as real stats pages carry navigation and ads
+
+    Returns:
+        HTML of the page
+    """
+    filler = ''.join(
+        f'<tr class="nav"><td><a href="/page/{i}">Page {i}</a></td></tr>'
+        for i in range(padding)
+    )
+    rows = ''.join(
+        '<tr class="player-row">'
+        + ''.join(f'<td class="{field}">{escape(str(value))}</td>' for field, value in player.items())
+        + '</tr>'
+        for player in players
+    )
+    return (
+        '<!DOCTYPE html><html><head><meta charset="utf-8"><title>Player stats</title></head><body>'
+        f'<table class="navigation">{filler}</table>'
+        f'<table class="player-stats">{rows}</table>'
+        f'<table class="footer">{filler}</table>'
+        '</body></html>'
+    ).encode('utf-8')
@@ -972,3 +972,86 @@ def test_winner_determination(app, db_session, room_code_suffix, num_teams):
             db_session.delete(team)
         db_session.delete(room)
         db_session.commit()
+
+
+# Feature: ipl-mock-auction-arena, Property 30: Playing XI optimization (solver)
+# Validates: Requirements 11.7
+@settings(max_examples=200, deadline=None)
+@given(players=st.lists(player_strategy(), min_size=11, max_size=16))
+def test_xi_solver_matches_brute_force(players):
+    """
+    The XI solver should find the same optimum as exhaustive enumeration
+    for any squad, including squads with no valid XI.
+    """
+    from itertools import combinations
+    from app.services.xi_solver import solve_playing_xi
+    
+    best_score = None
+    for combo in combinations(players, 11):
+        if is_valid_combination(combo):
+            score = sum(p.overall_score for p in combo)
+            if best_score is None or score > best_score:
+                best_score = score
+    
+    selected = solve_playing_xi(players)
+    
+    if best_score is None:
+        assert selected == []
+    else:
+        assert is_valid_combination(selected)
+        assert abs(sum(p.overall_score for p in selected) - best_score) < 0.01
+
+
+def test_xi_solver_large_squad():
+    """The XI solver should handle a 40-player squad without enumerating XIs."""
+    import random
+    import time
+    from app.services.xi_solver import solve_playing_xi
+    
+    rng = random.Random(7)
+    players = [
+        Player(
+            name=f"P{i}",
+            role=rng.choice(['BAT', 'BOWL', 'AR', 'WK']),
+            country='India',
+            base_price=1.0,
+            batting_score=0.0,
+            bowling_score=0.0,
+            overall_score=rng.uniform(0, 100),
+            is_overseas=rng.random() < 0.4
+        )
+        for i in range(40)
+    ]
+    
+    start = time.perf_counter()
+    selected = solve_playing_xi(players)
+    elapsed = time.perf_counter() - start
+    
+    assert is_valid_combination(selected)
+    assert selected == solve_playing_xi(list(players))
+    # Enumerating the 2.3 billion possible XIs would take hours
+    assert elapsed < 2.0
+
+
+def test_xi_solver_selects_by_position():
+    """
+    The XI solver should pick squad positions, so a squad holding the same
+    player object twice still gets exactly 11 players.
+    """
+    from app.services.xi_solver import solve_playing_xi
+    
+    def make(name, role, score):
+        return Player(name=name, role=role, country='India', base_price=1.0,
+                      batting_score=0.0, bowling_score=0.0, overall_score=score,
+                      is_overseas=False)
+    
+    # At most 3 all-rounders fit, so only one of the two copies is picked
+    copied = make('Copied', 'AR', 70.0)
+    squad = [make('Keeper', 'WK', 50.0)] + [make(f'Bat{i}', 'BAT', 60.0) for i in range(4)] + \
+        [make(f'Bowl{i}', 'BOWL', 55.0) for i in range(3)] + \
+        [make(f'AR{i}', 'AR', 80.0) for i in range(2)] + [copied, copied]
+    
+    selected = solve_playing_xi(squad)
+    
+    assert len(selected) == 11
+    assert selected.count(copied) == 1
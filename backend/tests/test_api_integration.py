@@ -280,6 +280,40 @@ class TestPlayerRetrieval:
         assert len(data['players']) == 2
         assert data['players'][0]['name'] == 'Test Player 1'
         assert data['players'][1]['name'] == 'Test Player 2'
+    
+    def test_get_players_etag_and_gzip(self, client, app):
+        """Test conditional and compressed player catalog responses."""
+        import gzip
+        
+        with app.app_context():
+            db.session.add(Player(name='Cached Player', role='AR', country='India',
+                                  base_price=1.5, batting_score=60.0, bowling_score=60.0,
+                                  overall_score=60.0, is_overseas=False))
+            db.session.commit()
+        
+        response = client.get('/api/players')
+        etag = response.headers['ETag']
+        assert response.status_code == 200
+        assert json.loads(response.data)['players'][0]['name'] == 'Cached Player'
+        
+        response = client.get('/api/players', headers={'If-None-Match': etag})
+        assert response.status_code == 304
+        assert response.data == b''
+        
+        response = client.get('/api/players', headers={'Accept-Encoding': 'gzip'})
+        assert response.status_code == 200
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert json.loads(gzip.decompress(response.data))['players'][0]['name'] == 'Cached Player'
+        
+        # Changing a player invalidates the catalog and its ETag
+        with app.app_context():
+            Player.query.filter_by(name='Cached Player').first().base_price = 2.0
+            db.session.commit()
+        
+        response = client.get('/api/players', headers={'If-None-Match': etag})
+        assert response.status_code == 200
+        assert response.headers['ETag'] != etag
+        assert json.loads(response.data)['players'][0]['base_price'] == 2.0
 
 
 class TestAuctionState:
@@ -300,6 +334,63 @@ class TestAuctionState:
         assert data['current_player'] is None
         assert data['auction_complete'] is False
 
+    def test_get_auction_state_etag_and_no_queries(self, client, app):
+        """Test that unchanged state polls get 304 without touching the database."""
+        from sqlalchemy import event
+        from app.services.auction_service import initialize_auction, present_next_player, place_bid
+
+        create_response = client.post('/api/rooms/create',
+                                     json={'host_username': 'host'})
+        room_code = json.loads(create_response.data)['room_code']
+
+        with app.app_context():
+            room = Room.query.filter_by(code=room_code).first()
+            for t in range(2):
+                db.session.add(Team(room_id=room.id, username=f'user{t}', team_name=f'Team {t}',
+                                    initial_purse=100.0, purse_left=100.0))
+            db.session.add(Player(name='State Player', role='BAT', country='India',
+                                  base_price=2.0, batting_score=50.0, bowling_score=10.0,
+                                  overall_score=40.0, is_overseas=False))
+            db.session.commit()
+            initialize_auction(room_code)
+            present_next_player(room_code)
+
+        response = client.get(f'/api/auction/{room_code}/state')
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data['current_player']['name'] == 'State Player'
+        assert data['auction_complete'] is False
+        assert [team['squad_size'] for team in data['teams']] == [0, 0]
+        etag = response.headers['ETag']
+
+        with app.app_context():
+            statements = []
+            def count_statement(conn, cursor, statement, parameters, context, executemany):
+                statements.append(statement)
+            event.listen(db.engine, 'before_cursor_execute', count_statement)
+
+        try:
+            response = client.get(f'/api/auction/{room_code}/state',
+                                  headers={'If-None-Match': etag})
+        finally:
+            with app.app_context():
+                event.remove(db.engine, 'before_cursor_execute', count_statement)
+
+        assert response.status_code == 304
+        assert statements == []
+
+        # A bid moves the state on, so the old ETag no longer matches
+        with app.app_context():
+            assert place_bid(room_code, 'user1').success
+
+        response = client.get(f'/api/auction/{room_code}/state',
+                              headers={'If-None-Match': etag})
+        assert response.status_code == 200
+        assert response.headers['ETag'] != etag
+        data = json.loads(response.data)
+        assert data['highest_bidder'] == 'user1'
+        assert data['current_bid'] == 7.0
+
 
 class TestResults:
     """Test results retrieval."""
@@ -398,7 +489,339 @@ class TestResults:
         assert len(data['teams'][0]['squad']) == 1
         assert len(data['teams'][0]['playing_xi']) == 1
         assert data['teams'][0]['rating']['overall_rating'] == 85.0
+    
+    def test_get_results_query_count_and_snapshot(self, client, app):
+        """Test that results use a fixed number of queries and completed rooms are snapshotted."""
+        from sqlalchemy import event
+        from app.models.results_snapshot import ResultsSnapshot
+        
+        create_response = client.post('/api/rooms/create',
+                                     json={'host_username': 'host'})
+        room_code = json.loads(create_response.data)['room_code']
+        
+        with app.app_context():
+            room = Room.query.filter_by(code=room_code).first()
+            for t in range(10):
+                team = Team(room_id=room.id, username=f'user{t}', team_name=f'Team {t}',
+                            initial_purse=100.0, purse_left=50.0)
+                db.session.add(team)
+                db.session.flush()
+                db.session.add(TeamRating(team_id=team.id, overall_rating=50.0 + t,
+                                          batting_rating=50.0, bowling_rating=50.0,
+                                          balance_score=50.0, bench_depth=50.0,
+                                          role_coverage=50.0))
+                for p in range(25):
+                    player = Player(name=f'Player {t}-{p}', role='BAT', country='India',
+                                    base_price=1.0, batting_score=50.0, bowling_score=10.0,
+                                    overall_score=40.0, is_overseas=False)
+                    db.session.add(player)
+                    db.session.flush()
+                    db.session.add(TeamPlayer(team_id=team.id, player_id=player.id, price=2.0,
+                                              in_playing_xi=p < 11, is_impact_player=p == 11))
+            db.session.commit()
+            
+            statements = []
+            def count_statement(conn, cursor, statement, parameters, context, executemany):
+                statements.append(statement)
+            event.listen(db.engine, 'before_cursor_execute', count_statement)
+        
+        try:
+            response = client.get(f'/api/results/{room_code}')
+        finally:
+            with app.app_context():
+                event.remove(db.engine, 'before_cursor_execute', count_statement)
+        
+        assert response.status_code == 200
+        assert len(statements) <= 3
+        data = json.loads(response.data)
+        assert len(data['teams']) == 10
+        assert all(len(team['squad']) == 25 for team in data['teams'])
+        assert all(len(team['playing_xi']) == 11 for team in data['teams'])
+        assert data['teams'][0]['impact_player']['name'] == 'Player 0-11'
+        assert data['winner']['team_name'] == 'Team 9'
+        etag = response.headers['ETag']
+        
+        response = client.get(f'/api/results/{room_code}', headers={'If-None-Match': etag})
+        assert response.status_code == 304
+        
+        # A completed room is snapshotted on the next request
+        with app.app_context():
+            Room.query.filter_by(code=room_code).update({'status': 'completed'})
+            db.session.commit()
+        
+        response = client.get(f'/api/results/{room_code}')
+        assert response.status_code == 200
+        assert response.headers['ETag'] == etag
+        with app.app_context():
+            assert ResultsSnapshot.query.filter_by(room_code=room_code).count() == 1
+        
+        response = client.get(f'/api/results/{room_code}')
+        assert json.loads(response.data) == data
+        assert response.headers['ETag'] == etag
+    
+    def test_results_snapshot_is_keyed_by_room(self, client, app):
+        """Test that a reused room code gets its own results, and a racing snapshot is not stored twice."""
+        from app.models.results_snapshot import ResultsSnapshot
+        from app.services.results_service import _snapshot_results
+        
+        with app.app_context():
+            old_room = Room(code='REUSE1', host_username='old', status='completed')
+            db.session.add(old_room)
+            db.session.commit()
+            db.session.add(Team(room_id=old_room.id, username='old', team_name='Old XI',
+                                initial_purse=100.0, purse_left=100.0))
+            db.session.commit()
+        
+        response = client.get('/api/results/REUSE1')
+        assert [team['team_name'] for team in json.loads(response.data)['teams']] == ['Old XI']
+        
+        # The old room gives up its code and a new room takes it
+        with app.app_context():
+            Room.query.filter_by(code='REUSE1').update({'code': 'GONE01'})
+            new_room = Room(code='REUSE1', host_username='new', status='completed')
+            db.session.add(new_room)
+            db.session.commit()
+            db.session.add(Team(room_id=new_room.id, username='new', team_name='New XI',
+                                initial_purse=100.0, purse_left=100.0))
+            db.session.commit()
+        
+        response = client.get('/api/results/REUSE1')
+        assert [team['team_name'] for team in json.loads(response.data)['teams']] == ['New XI']
+        
+        # A request that lost the race to snapshot the room serves the stored one
+        with app.app_context():
+            new_room = Room.query.filter_by(code='REUSE1').one()
+            snapshot = _snapshot_results(new_room, {'teams': []}, 'stale')
+            assert snapshot.etag == response.headers['ETag'].strip('"')
+            assert ResultsSnapshot.query.filter_by(room_id=new_room.id).count() == 1
+
+
+class TestAnalysisJobs:
+    """Test background team analysis jobs."""
+    
+    def test_room_analysis_completes(self, client, app):
+        """Test that queued analysis persists results and reports job status."""
+        from app.services.analysis_queue import submit_room_analysis, wait_for_jobs, shutdown_executor
+        
+        create_response = client.post('/api/rooms/create',
+                                     json={'host_username': 'host'})
+        room_code = json.loads(create_response.data)['room_code']
+        
+        roles = ['WK'] * 2 + ['BAT'] * 5 + ['BOWL'] * 4 + ['AR'] * 3
+        
+        with app.app_context():
+            room = Room.query.filter_by(code=room_code).first()
+            room.status = 'active'
+            
+            team = Team(
+                room_id=room.id,
+                username='host',
+                team_name='Test Team',
+                initial_purse=100.0,
+                purse_left=100.0
+            )
+            db.session.add(team)
+            db.session.commit()
+            team_id = team.id
+            
+            for i, role in enumerate(roles):
+                player = Player(
+                    name=f'Player {i}',
+                    role=role,
+                    country='India',
+                    base_price=1.0,
+                    batting_score=40.0 + i,
+                    bowling_score=60.0 - i,
+                    overall_score=30.0 + i * 2,
+                    is_overseas=False
+                )
+                db.session.add(player)
+                db.session.commit()
+                db.session.add(TeamPlayer(team_id=team_id, player_id=player.id, price=1.0))
+            db.session.commit()
+            
+            try:
+                success, message, job_ids = submit_room_analysis(room_code)
+                assert success is True
+                assert len(job_ids) == 1
+                assert wait_for_jobs(job_ids, timeout=30)
+            finally:
+                shutdown_executor()
+        
+        response = client.get(f'/api/analysis/jobs/{job_ids[0]}')
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data['status'] == 'completed'
+        assert data['team_id'] == team_id
+        
+        response = client.get(f'/api/analysis/{room_code}')
+        assert json.loads(response.data)['complete'] is True
+        
+        with app.app_context():
+            assert Room.query.filter_by(code=room_code).first().status == 'completed'
+            assert TeamPlayer.query.filter_by(team_id=team_id, in_playing_xi=True).count() == 11
+            assert TeamPlayer.query.filter_by(team_id=team_id, is_impact_player=True).count() == 1
+            assert TeamRating.query.filter_by(team_id=team_id).count() == 1
+    
+    def test_failed_analysis_leaves_room_open_for_retry(self, client, app, monkeypatch):
+        """
+        Test that a room completes only when every job of its latest
+        submission succeeds, and that a failed one can be retried.
+        """
+        import threading
+        from datetime import datetime
+        from app.services import analysis_queue
+        
+        create_response = client.post('/api/rooms/create',
+                                     json={'host_username': 'host'})
+        room_code = json.loads(create_response.data)['room_code']
+        roles = ['WK'] * 2 + ['BAT'] * 5 + ['BOWL'] * 4 + ['AR'] * 3
+        
+        with app.app_context():
+            room = Room.query.filter_by(code=room_code).first()
+            room.status = 'active'
+            team_ids = []
+            for t, username in enumerate(('host', 'guest')):
+                team = Team(room_id=room.id, username=username, team_name=f'Team {t}',
+                            initial_purse=100.0, purse_left=100.0)
+                db.session.add(team)
+                db.session.commit()
+                team_ids.append(team.id)
+                for i, role in enumerate(roles):
+                    player = Player(name=f'Player {t}-{i}', role=role, country='India',
+                                    base_price=1.0, batting_score=40.0 + i,
+                                    bowling_score=60.0 - i, overall_score=30.0 + i * 2,
+                                    is_overseas=False)
+                    db.session.add(player)
+                    db.session.commit()
+                    db.session.add(TeamPlayer(team_id=team.id, player_id=player.id, price=1.0))
+            db.session.commit()
+        
+        # A stale job of an earlier submission never finishes
+        monkeypatch.setitem(analysis_queue._jobs, 'stale', {
+            'job_id': 'stale', 'batch_id': 'old', 'room_code': room_code,
+            'team_id': team_ids[0], 'status': 'queued', 'error': None,
+            'submitted_at': datetime.utcnow(), 'finished_at': None,
+            'future': None, 'done': threading.Event()
+        })
+        
+        apply_team_analysis = analysis_queue.apply_team_analysis
+        
+        def failing_for_guest(team_id, result):
+            if team_id == team_ids[1]:
+                raise RuntimeError('rating store unavailable')
+            apply_team_analysis(team_id, result)
+        
+        monkeypatch.setattr(analysis_queue, 'apply_team_analysis', failing_for_guest)
+        # The in-memory test database is one shared connection, so persist
+        # the jobs one at a time on the executor's callback thread
+        monkeypatch.setattr(analysis_queue.socketio, 'start_background_task',
+                            lambda task, *args: task(*args))
+        
+        try:
+            with app.app_context():
+                success, message, job_ids = analysis_queue.submit_room_analysis(room_code)
+                assert success is True
+                assert analysis_queue.wait_for_jobs(job_ids, timeout=30)
+            
+            statuses = {job['team_id']: job['status'] for job in
+                        (analysis_queue.get_job_status(job_id) for job_id in job_ids)}
+            assert statuses == {team_ids[0]: 'completed', team_ids[1]: 'failed'}
+            with app.app_context():
+                assert Room.query.filter_by(code=room_code).first().status == 'active'
+            
+            monkeypatch.setattr(analysis_queue, 'apply_team_analysis', apply_team_analysis)
+            response = client.post(f'/api/analysis/{room_code}/retry')
+            assert response.status_code == 202
+            job_ids = json.loads(response.data)['analysis_jobs']
+            assert analysis_queue.wait_for_jobs(job_ids, timeout=30)
+        finally:
+            analysis_queue.shutdown_executor()
+        
+        with app.app_context():
+            db.session.expire_all()
+            assert Room.query.filter_by(code=room_code).first().status == 'completed'
+            assert TeamRating.query.filter(TeamRating.team_id.in_(team_ids)).count() == 2
+    
+    def test_unqueued_jobs_fail_and_the_broken_pool_is_replaced(self, client, app, monkeypatch):
+        """
+        Test that jobs a broken pool refused are failed rather than left
+        queued, and that the next submission gets a new pool.
+        """
+        from concurrent.futures.process import BrokenProcessPool
+        from app.services import analysis_queue
+        
+        class BrokenPool:
+            shut_down = False
+            
+            def submit(self, fn, *args):
+                raise BrokenProcessPool('A child process terminated abruptly')
+            
+            def shutdown(self, wait=True):
+                self.shut_down = True
+        
+        create_response = client.post('/api/rooms/create',
+                                     json={'host_username': 'host'})
+        room_code = json.loads(create_response.data)['room_code']
+        
+        with app.app_context():
+            room = Room.query.filter_by(code=room_code).first()
+            for username in ('host', 'guest'):
+                db.session.add(Team(room_id=room.id, username=username, team_name=username,
+                                    initial_purse=100.0, purse_left=100.0))
+            db.session.commit()
+            
+            broken = BrokenPool()
+            monkeypatch.setattr(analysis_queue, '_executor', broken)
+            monkeypatch.setitem(app.config, 'AI_MAX_PENDING_JOBS', 2)
+            try:
+                success, message, job_ids = analysis_queue.submit_room_analysis(room_code)
+                assert success is False
+                assert 'could not be queued' in message
+                assert analysis_queue.wait_for_jobs(job_ids, timeout=1)
+                assert [analysis_queue.get_job_status(job_id)['status'] for job_id in job_ids] == \
+                    ['failed', 'failed']
+                assert broken.shut_down and analysis_queue._executor is None
+                
+                # The failed jobs no longer count against the pending limit
+                success, message, job_ids = analysis_queue.submit_room_analysis(room_code)
+                assert success is True
+                assert analysis_queue.wait_for_jobs(job_ids, timeout=30)
+            finally:
+                analysis_queue.shutdown_executor()
+    
+    def test_unknown_job(self, client):
+        """Test status lookup for an unknown job."""
+        response = client.get('/api/analysis/jobs/missing')
+        
+        assert response.status_code == 404
+        data = json.loads(response.data)
+        assert data['code'] == 'JOB_NOT_FOUND'
 
+    
+    def test_finished_jobs_are_evicted(self, monkeypatch):
+        """Test that finished jobs expire after their TTL and beyond the cap."""
+        from collections import OrderedDict
+        from datetime import datetime, timedelta
+        from app.services import analysis_queue
+        
+        now = datetime.utcnow()
+        jobs = {job_id: {'job_id': job_id} for job_id in ('old', 'a', 'b', 'c', 'running')}
+        finished = OrderedDict([
+            ('old', now - timedelta(seconds=120)),
+            ('a', now - timedelta(seconds=3)),
+            ('b', now - timedelta(seconds=2)),
+            ('c', now - timedelta(seconds=1)),
+        ])
+        monkeypatch.setattr(analysis_queue, '_jobs', jobs)
+        monkeypatch.setattr(analysis_queue, '_finished_jobs', finished)
+        
+        config = {'AI_JOB_TTL': 60, 'AI_MAX_FINISHED_JOBS': 2}
+        with analysis_queue._jobs_lock:
+            analysis_queue._evict_finished_jobs(config, now)
+        
+        assert sorted(jobs) == ['b', 'c', 'running']
+        assert list(finished) == ['b', 'c']
 
 class TestCORS:
     """Test CORS configuration."""
@@ -6,8 +6,16 @@ from app.services.scraper import (
     calculate_bowling_score,
     calculate_overall_score,
     process_player_data,
-    scrape_player_data
+    scrape_player_data,
+    import_players_from_csv,
+    rescore_players,
+    parse_player_page,
+    scrape_player_pages,
+    generate_sample_player_data
 )
+import time
+from pathlib import Path
+import numpy as np
 import pandas as pd
 
 
@@ -201,3 +209,324 @@ def test_process_player_data_completeness(app):
             
             # Verify is_overseas is boolean
             assert isinstance(row['is_overseas'], (bool, int))
+
+
+# Feature: ipl-mock-auction-arena, Property: Columnar scoring matches per-player scoring
+# Validates: Requirements 6.2
+@settings(max_examples=100, suppress_health_check=[HealthCheck.function_scoped_fixture])
+@given(
+    rows=st.lists(
+        st.tuples(
+            st.sampled_from(['BAT', 'BOWL', 'AR', 'WK', 'COACH']),
+            st.floats(min_value=0.0, max_value=10000.0),
+            st.floats(min_value=0.0, max_value=100.0),
+            st.floats(min_value=0.0, max_value=300.0),
+            st.floats(min_value=0.0, max_value=500.0),
+            st.floats(min_value=0.0, max_value=15.0),
+            st.floats(min_value=0.0, max_value=100.0)
+        ),
+        min_size=1,
+        max_size=30
+    )
+)
+def test_columnar_scoring_matches_row_scoring(app, rows):
+    """
+    Scoring a whole frame at once should give every player the same scores
+    as scoring them one at a time.
+    """
+    raw_df = pd.DataFrame([
+        {'name': f'Player {i}', 'role': role, 'country': 'India', 'base_price': 1.0,
+         'runs': runs, 'average': average, 'strike_rate': strike_rate,
+         'wickets': wickets, 'economy': economy, 'bowling_average': bowling_avg}
+        for i, (role, runs, average, strike_rate, wickets, economy, bowling_avg) in enumerate(rows)
+    ])
+    
+    processed_df = process_player_data(raw_df)
+    
+    for (_, raw), (_, processed) in zip(raw_df.iterrows(), processed_df.iterrows()):
+        batting_score = calculate_batting_score(raw)
+        bowling_score = calculate_bowling_score(raw)
+        overall_score = calculate_overall_score(batting_score, bowling_score, raw['role'])
+        
+        assert abs(processed['batting_score'] - batting_score) <= 0.005 + 1e-9
+        assert abs(processed['bowling_score'] - bowling_score) <= 0.005 + 1e-9
+        assert abs(processed['overall_score'] - overall_score) <= 0.005 + 1e-9
+
+
+def test_import_players_upserts_by_name(app, tmp_path):
+    """
+    Importing a CSV should add new players and update existing ones by
+    name, without duplicating any player.
+    """
+    from app.models.player import Player
+    
+    with app.app_context():
+        processed_df = process_player_data(scrape_player_data())
+        csv_path = tmp_path / 'players.csv'
+        processed_df.to_csv(csv_path, index=False)
+        
+        assert import_players_from_csv(str(csv_path)) == len(processed_df)
+        
+        # Re-import with one player rescored and one new player
+        processed_df.loc[0, 'overall_score'] = 99.0
+        new_player = processed_df.iloc[[1]].assign(name='New Player')
+        pd.concat([processed_df, new_player]).to_csv(csv_path, index=False)
+        
+        assert import_players_from_csv(str(csv_path)) == len(processed_df) + 1
+        assert Player.query.count() == len(processed_df) + 1
+        assert Player.query.filter_by(name=processed_df.loc[0, 'name']).one().overall_score == 99.0
+        assert Player.query.filter_by(name='New Player').one().is_overseas == bool(new_player['is_overseas'].iloc[0])
+
+
+def test_rescore_players_applies_new_weights(app, tmp_path, monkeypatch):
+    """
+    Rescoring should recompute stored overall scores with the current
+    weights, touching only the players whose score changed.
+    """
+    from app.models.player import Player
+    from app.services import scoring
+    
+    with app.app_context():
+        processed_df = process_player_data(scrape_player_data())
+        csv_path = tmp_path / 'players.csv'
+        processed_df.to_csv(csv_path, index=False)
+        import_players_from_csv(str(csv_path))
+        
+        assert rescore_players() == 0
+        
+        monkeypatch.setitem(scoring.OVERALL_WEIGHTS, 'WK', (0.9, 0.1))
+        keepers = Player.query.filter_by(role='WK').all()
+        assert rescore_players() == len(keepers)
+        
+        for player in Player.query.all():
+            expected = calculate_overall_score(player.batting_score, player.bowling_score, player.role)
+            assert abs(player.overall_score - expected) <= 0.005 + 1e-9
+        assert rescore_players() == 0
+
+
+# Feature: ipl-mock-auction-arena, Property: Stats pages parse back to the scraped players
+# Validates: Requirements 6.2
+@settings(max_examples=100, suppress_health_check=[HealthCheck.function_scoped_fixture])
+@given(
+    players=st.lists(
+        st.fixed_dictionaries({
+            'name': st.text(alphabet=st.characters(whitelist_categories=('L', 'N', 'Zs', 'P')), min_size=1, max_size=30).map(str.strip).filter(bool),
+            'role': st.sampled_from(['BAT', 'BOWL', 'AR', 'WK']),
+            'country': st.sampled_from(['India', 'Australia', 'England']),
+            'base_price': st.sampled_from([0.5, 1.0, 2.0]),
+            'runs': st.floats(min_value=0.0, max_value=10000.0),
+            'average': st.floats(min_value=0.0, max_value=100.0),
+            'strike_rate': st.floats(min_value=0.0, max_value=300.0),
+            'wickets': st.floats(min_value=0.0, max_value=500.0),
+            'economy': st.floats(min_value=0.0, max_value=15.0),
+            'bowling_average': st.floats(min_value=0.0, max_value=100.0)
+        }),
+        max_size=20
+    )
+)
+def test_player_page_round_trip(app, players):
+    """
+    Parsing a rendered stats page should give back exactly the players on
+    it, ignoring the rest of the page.
+    """
+    from tests.fixture_server import render_player_page
+    
+    assert parse_player_page(render_player_page(players, padding=3)) == players
+
+
+def test_parse_player_page_reads_missing_stats_as_nan(app):
+    """
+    Empty or dashed stat cells should parse as NaN and be scored with the
+    defaults of a missing column.
+    """
+    from tests.fixture_server import render_player_page
+    
+    players = parse_player_page(render_player_page([
+        {'name': 'Debutant', 'role': 'BOWL', 'country': 'India', 'base_price': '0.3',
+         'runs': '', 'average': '-', 'strike_rate': '\u2013',
+         'wickets': '4', 'economy': '', 'bowling_average': '-'},
+    ]))
+    assert [player['name'] for player in players] == ['Debutant']
+    assert all(np.isnan(players[0][field]) for field in
+               ('runs', 'average', 'strike_rate', 'economy', 'bowling_average'))
+    
+    processed = process_player_data(pd.DataFrame(players)).iloc[0]
+    expected = process_player_data(pd.DataFrame([{
+        'name': 'Debutant', 'role': 'BOWL', 'country': 'India', 'base_price': 0.3, 'wickets': 4.0
+    }])).iloc[0]
+    assert processed.equals(expected)
+
+
+def test_page_cache_keeps_body_and_validators_together(app, tmp_path):
+    """A cached page should be one file holding its body and validators."""
+    from app.services.fetcher import PageCache
+    
+    cache = PageCache(tmp_path)
+    url = 'http://example.test/season/2024'
+    assert cache.lookup(url) is None
+    
+    body = b'<html>\n{"etag": "not metadata"}\n</html>'
+    cache.put(url, body, {'ETag': '"v1"'})
+    cache.put(url, body + b'<!-- v2 -->', {'ETag': '"v2"', 'Last-Modified': 'Mon, 01 Apr 2024 00:00:00 GMT'})
+    
+    assert cache.lookup(url) == (body + b'<!-- v2 -->', {
+        'If-None-Match': '"v2"', 'If-Modified-Since': 'Mon, 01 Apr 2024 00:00:00 GMT'
+    })
+    assert [path.suffix for path in tmp_path.iterdir()] == ['.page']
+
+
+def test_scrape_player_pages_fetches_concurrently_with_cache(app, tmp_path):
+    """
+    Scraping many pages should return every page's players in order, retry
+    transient failures, and revalidate cached pages instead of re-downloading.
+    """
+    from app.services.fetcher import PageFetcher
+    from tests.fixture_server import FixtureServer, FixturePage, render_player_page
+    
+    pages = {
+        f'/season/{season}': FixturePage(
+            render_player_page(generate_sample_player_data()[season % 5:season % 5 + 3]),
+            etag=f'"season-{season}"',
+            last_modified='Mon, 01 Apr 2024 00:00:00 GMT',
+            delay=0.05
+        )
+        for season in range(2008, 2024)
+    }
+    pages['/season/2008'].fail_times = 2
+    
+    with FixtureServer(pages) as server:
+        urls = [server.url(path) for path in pages]
+        fetcher = PageFetcher(cache_dir=tmp_path, max_workers=8, retries=3, backoff=0.01)
+        
+        started = time.perf_counter()
+        df = scrape_player_pages(urls, fetcher=fetcher)
+        elapsed = time.perf_counter() - started
+        
+        expected = [player for page in pages.values() for player in parse_player_page(page.body)]
+        assert df.to_dict('records') == expected
+        assert elapsed < 0.05 * len(pages) / 2, "Pages should be fetched concurrently"
+        assert server.requests['/season/2008'] == 3
+        
+        # Unchanged pages are revalidated and served from the cache
+        assert scrape_player_pages(urls, fetcher=fetcher).equals(df)
+        assert all(server.not_modified[path] == 1 for path in pages)
+
+
+def test_scrape_player_pages_raises_after_retries(app, tmp_path):
+    """Pages that keep failing should raise once the retries are spent."""
+    import requests
+    from app.services.fetcher import PageFetcher
+    from tests.fixture_server import FixtureServer, FixturePage
+    
+    with FixtureServer({'/down': FixturePage(b'', fail_times=10)}) as server:
+        fetcher = PageFetcher(cache_dir=tmp_path, retries=2, backoff=0.01)
+        with pytest.raises(requests.HTTPError):
+            scrape_player_pages([server.url('/down')], fetcher=fetcher)
+        assert server.requests['/down'] == 3
+
+
+# Feature: ipl-mock-auction-arena, Property: Compiled player catalogs load back unchanged
+# Validates: Requirements 6.2
+@settings(max_examples=50, suppress_health_check=[HealthCheck.function_scoped_fixture])
+@given(
+    players=st.lists(
+        st.fixed_dictionaries({
+            'name': st.text(min_size=1, max_size=20),
+            'role': st.sampled_from(['BAT', 'BOWL', 'AR', 'WK']),
+            'country': st.sampled_from(['India', 'Australia', 'Sri Lanka', 'Côte d\'Ivoire']),
+            'base_price': st.floats(min_value=0.0, max_value=20.0),
+            'batting_score': st.floats(min_value=0.0, max_value=100.0),
+            'bowling_score': st.floats(min_value=0.0, max_value=100.0),
+            'overall_score': st.floats(min_value=0.0, max_value=100.0),
+            'is_overseas': st.booleans()
+        }),
+        max_size=30
+    )
+)
+def test_compiled_catalog_round_trip(app, tmp_path_factory, players):
+    """
+    Saving a catalog and mapping it back should give the same players, with
+    every column a read-only view of the file.
+    """
+    from app.services.columnar_catalog import ColumnarCatalog, save_catalog, load_catalog
+    
+    path = tmp_path_factory.mktemp('catalog') / 'players.npz'
+    df = pd.DataFrame(players, columns=['name', 'role', 'country', 'base_price', 'batting_score',
+                                        'bowling_score', 'overall_score', 'is_overseas'])
+    save_catalog(ColumnarCatalog.from_frame(df, source_digest='abc'), path)
+    
+    catalog = load_catalog(path)
+    assert catalog.source_digest == 'abc'
+    assert catalog.records() == players
+    assert all(not values.flags.writeable for values in catalog.columns.values())
+
+
+def test_compiled_catalog_recompiles_and_imports(app, tmp_path):
+    """
+    A compiled catalog should be rebuilt when its source changes, and
+    importing it should upsert its players like a CSV.
+    """
+    from app.models.player import Player
+    from app.services.columnar_catalog import load_or_compile
+    
+    source = tmp_path / 'players.csv'
+    catalog_path = tmp_path / 'players.npz'
+    processed_df = process_player_data(scrape_player_data())
+    processed_df.to_csv(source, index=False)
+    builds = []
+    
+    def build():
+        builds.append(1)
+        return pd.read_csv(source)
+    
+    assert len(load_or_compile(catalog_path, source, build)) == len(processed_df)
+    assert len(load_or_compile(catalog_path, source, build)) == len(processed_df)
+    assert len(builds) == 1
+    
+    processed_df.head(3).to_csv(source, index=False)
+    assert len(load_or_compile(catalog_path, source, build)) == 3
+    assert len(builds) == 2
+    
+    # A change to a file the build depends on, such as the scoring weights,
+    # recompiles it too
+    weights = tmp_path / 'scoring.py'
+    weights.write_text("OVERALL_WEIGHTS = {'BAT': (0.8, 0.2)}\n")
+    assert len(load_or_compile(catalog_path, source, build, dependencies=[weights])) == 3
+    assert len(load_or_compile(catalog_path, source, build, dependencies=[weights])) == 3
+    assert len(builds) == 3
+    weights.write_text("OVERALL_WEIGHTS = {'BAT': (0.9, 0.1)}\n")
+    assert len(load_or_compile(catalog_path, source, build, dependencies=[weights])) == 3
+    assert len(builds) == 4
+    
+    with app.app_context():
+        assert import_players_from_csv(str(catalog_path)) == 3
+        assert sorted(name for (name,) in Player.query.with_entities(Player.name)) == \
+            sorted(processed_df.head(3)['name'])
+
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+# Modules the Streamlit app keeps an identical copy of: (backend, streamlit_app)
+SHARED_MODULES = [
+    ('app/services/scoring.py', 'services/scoring.py'),
+    ('app/services/columnar_catalog.py', 'services/columnar_catalog.py'),
+    ('app/services/xi_solver.py', 'services/xi_solver.py'),
+    ('app/utils/db_config.py', 'models/db_config.py'),
+]
+
+
+@pytest.mark.skipif(not (REPO_ROOT / 'streamlit_app').is_dir(), reason="Streamlit app not checked out")
+@pytest.mark.parametrize('backend_path,streamlit_path', SHARED_MODULES)
+def test_shared_module_copies_match(backend_path, streamlit_path):
+    """
+    The backend and Streamlit copies of a shared module should be identical,
+    apart from the docstring line naming where the other copy lives.
+    """
+    def source(path):
+        lines = path.read_text(encoding='utf-8').splitlines()
+        return [line for line in lines if 'keeps an identical copy in' not in line]
+    
+    backend_copy = source(REPO_ROOT / 'backend' / backend_path)
+    streamlit_copy = source(REPO_ROOT / 'streamlit_app' / streamlit_path)
+    assert backend_copy == streamlit_copy, \
+        f"{backend_path} and streamlit_app/{streamlit_path} have drifted apart"
@@ -0,0 +1,193 @@
+"""Property-based tests for auction state store backends."""
+import threading
+import pytest
+from hypothesis import given, strategies as st, settings, HealthCheck
+from app import db
+from app.services.state_store import (
+    InMemoryAuctionStateStore, SQLAuctionStateStore, RedisAuctionStateStore
+)
+
+
+class FakeRedis:
+    """
+    Minimal in-process stand-in for a Redis server.
+    
+    Supports the commands used by RedisAuctionStateStore and evaluates its
+    scripts natively. Values are stored as bytes, like a real server
+    returns them.
+    """
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _bytes(value):
+        return value if isinstance(value, bytes) else str(value).encode('utf-8')
+    
+    def hgetall(self, key):
+        with self._lock:
+            return dict(self._data.get(key, {}))
+    
+    def delete(self, key):
+        with self._lock:
+            return int(self._data.pop(key, None) is not None)
+    
+    def eval(self, script, numkeys, *args):
+        key = args[0]
+        argv = [self._bytes(a) for a in args[numkeys:]]
+        with self._lock:
+            if script == RedisAuctionStateStore.SET_SCRIPT:
+                self._data[key] = dict(zip(argv[::2], argv[1::2]))
+                return 1
+            
+            if script == RedisAuctionStateStore.UPDATE_SCRIPT:
+                split = int(argv[0])
+                fields = self._data.setdefault(key, {})
+                for field, value in zip(argv[1:split:2], argv[2:split:2]):
+                    fields.setdefault(field, value)
+                fields.update(zip(argv[split::2], argv[split + 1::2]))
+                return 1
+            
+            assert script == RedisAuctionStateStore.CAS_SCRIPT
+            expected_seq, new_seq, *pairs = argv
+            fields = self._data.get(key)
+            if fields is None or fields.get(b'bid_seq') != expected_seq:
+                return 0
+            fields[b'bid_seq'] = new_seq
+            fields.update(zip(pairs[::2], pairs[1::2]))
+            return 1
+
+
+@pytest.fixture(params=['memory', 'sql', 'redis'])
+def store(request, app):
+    """Each state store backend."""
+    if request.param == 'memory':
+        return InMemoryAuctionStateStore()
+    if request.param == 'sql':
+        return SQLAuctionStateStore(lambda: db.engine)
+    return RedisAuctionStateStore(FakeRedis())
+
+
+def test_state_round_trip(store):
+    """Set, update, get and delete should behave the same on every backend."""
+    assert store.get('ROOM1') is None
+    assert 'ROOM1' not in store
+    
+    store.set('ROOM1', {
+        'current_player_id': None,
+        'current_bid': None,
+        'highest_bidder': None,
+        'bid_increment': 5.0,
+        'timer_duration': 30
+    })
+    store.update('ROOM1', current_player_id=7, current_bid=2.0)
+    
+    state = store.get('ROOM1')
+    assert state['current_player_id'] == 7
+    assert state['current_bid'] == 2.0
+    assert state['highest_bidder'] is None
+    assert state['bid_increment'] == 5.0
+    assert state['timer_duration'] == 30
+    
+    # Returned state is a copy
+    state['current_bid'] = 99.0
+    assert store.get('ROOM1')['current_bid'] == 2.0
+    
+    store.delete('ROOM1')
+    assert store.get('ROOM1') is None
+    
+    # Updating a room with no state creates it with the hot fields filled in
+    store.update('ROOM2', bid_increment=5.0)
+    assert store.get('ROOM2') == {
+        'current_player_id': None, 'current_bid': None, 'highest_bidder': None,
+        'lot_deadline': None, 'bid_seq': 0, 'bid_increment': 5.0
+    }
+    store.update('ROOM2', bid_seq=3)
+    assert store.get('ROOM2')['bid_seq'] == 3
+
+
+# Feature: ipl-mock-auction-arena, Property: Atomic bid compare-and-set
+# Validates: Requirements 8.1
+@settings(max_examples=30, suppress_health_check=[HealthCheck.function_scoped_fixture], deadline=None)
+@given(
+    base_price=st.floats(min_value=0.5, max_value=200.0),
+    bidders=st.lists(st.sampled_from(['alice', 'bob', 'carol']), min_size=1, max_size=20)
+)
+def test_compare_and_set_bid(store, base_price, bidders):
+    """
+    A bid is stored only if the room's bid_seq still matches what the bidder
+    read, so two bidders racing from the same read can never both win.
+    """
+    store.set('ROOM1', {
+        'current_player_id': 1,
+        'current_bid': base_price,
+        'highest_bidder': None,
+        'bid_increment': 5.0
+    })
+    assert store.get('ROOM1')['bid_seq'] == 0
+    
+    seq, expected_bid, expected_bidder = 0, base_price, None
+    for bidder in bidders:
+        new_bid = expected_bid + 5.0
+        assert store.compare_and_set_bid('ROOM1', seq, new_bid, bidder) is True
+        # A second bid based on the same stale read must fail
+        assert store.compare_and_set_bid('ROOM1', seq, new_bid, 'mallory') is False
+        seq, expected_bid, expected_bidder = seq + 1, new_bid, bidder
+    
+    state = store.get('ROOM1')
+    assert state['current_bid'] == expected_bid
+    assert state['highest_bidder'] == expected_bidder
+    assert state['bid_seq'] == len(bidders)
+    
+    store.delete('ROOM1')
+    assert store.compare_and_set_bid('ROOM1', seq, expected_bid + 5.0, 'alice') is False
+
+
+def test_compare_and_set(store):
+    """Fields are merged only while bid_seq matches, and bid_seq advances."""
+    store.set('ROOM1', {'current_player_id': 1, 'current_bid': 2.0, 'bid_increment': 5.0})
+    assert store.compare_and_set_bid('ROOM1', 0, 7.0, 'alice') is True
+    
+    # A settlement based on the state before alice's bid loses
+    assert store.compare_and_set('ROOM1', 0, current_player_id=None, lots_sold=1) is False
+    assert store.compare_and_set('ROOM1', 1, current_player_id=None, lots_sold=1) is True
+    
+    state = store.get('ROOM1')
+    assert state['current_player_id'] is None
+    assert state['current_bid'] == 7.0
+    assert state['lots_sold'] == 1
+    assert state['bid_increment'] == 5.0
+    assert state['bid_seq'] == 2
+    assert store.compare_and_set_bid('ROOM1', 1, 12.0, 'bob') is False
+
+
+def test_auction_uses_configured_store(app, store):
+    """The auction engine should read and write through the active store."""
+    from app.models import Room, Team, Player
+    from app.services.state_store import get_state_store, set_state_store
+    from app.services.auction_service import initialize_auction, present_next_player, place_bid
+    
+    previous = get_state_store()
+    set_state_store(store)
+    try:
+        room = Room(code='STORE1', host_username='host')
+        db.session.add(room)
+        db.session.commit()
+        db.session.add(Team(room_id=room.id, username='host', team_name='Host XI',
+                            initial_purse=100.0, purse_left=100.0))
+        db.session.add(Player(name='P1', role='BAT', country='India', base_price=2.0,
+                              batting_score=50.0, bowling_score=10.0, overall_score=40.0,
+                              is_overseas=False))
+        db.session.commit()
+        
+        initialize_auction('STORE1')
+        player = present_next_player('STORE1')
+        result = place_bid('STORE1', 'host')
+        
+        assert result.success is True
+        state = store.get('STORE1')
+        assert state['current_player_id'] == player.id
+        assert state['current_bid'] == 7.0
+        assert state['highest_bidder'] == 'host'
+    finally:
+        set_state_store(previous)
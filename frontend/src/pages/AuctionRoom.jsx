@@ -22,6 +22,8 @@ function AuctionRoom() {
   
   const timerRef = useRef(null)
   const timerStartRef = useRef(null)
+  const timerDurationRef = useRef(30)
+  const bidSeqRef = useRef(null)
 
   // Load username and initial state on mount
   useEffect(() => {
@@ -60,7 +62,9 @@ function AuctionRoom() {
       setCurrentPlayer(data.player)
       setCurrentBid(data.current_bid)
       setHighestBidder(null)
-      setTimeRemaining(data.timer_duration || 30)
+      bidSeqRef.current = data.seq ?? null
+      timerDurationRef.current = data.timer_duration || 30
+      setTimeRemaining(timerDurationRef.current)
       timerStartRef.current = Date.now()
       setBidError('')
       
@@ -77,8 +81,15 @@ function AuctionRoom() {
       console.log('Bid placed:', data)
       setCurrentBid(data.current_highest)
       setHighestBidder(data.highest_bidder)
+      bidSeqRef.current = data.seq ?? null
       setBidError('')
       
+      // The server may extend the lot clock after a bid
+      if (data.timer_remaining != null) {
+        timerDurationRef.current = data.timer_remaining
+        timerStartRef.current = Date.now()
+      }
+      
       // Add to bid history
       setBidHistory(prev => [{
         type: 'bid',
@@ -150,7 +161,9 @@ function AuctionRoom() {
         setCurrentPlayer(data.current_player)
         setCurrentBid(data.current_bid)
         setHighestBidder(data.highest_bidder)
-        setTimeRemaining(data.timer_remaining || 30)
+        bidSeqRef.current = data.seq ?? null
+        timerDurationRef.current = data.timer_remaining ?? 30
+        setTimeRemaining(timerDurationRef.current)
         timerStartRef.current = Date.now()
       }
       if (data.auction_complete) {
@@ -162,6 +175,9 @@ function AuctionRoom() {
     const handleBidError = (data) => {
       console.log('Bid error:', data)
       setBidError(data.message)
+      if (data.seq != null) {
+        bidSeqRef.current = data.seq
+      }
       setTimeout(() => setBidError(''), 3000)
     }
 
@@ -191,15 +207,12 @@ function AuctionRoom() {
 
     timerRef.current = setInterval(() => {
       const elapsed = Math.floor((Date.now() - timerStartRef.current) / 1000)
-      const remaining = Math.max(0, 30 - elapsed)
+      const remaining = Math.max(0, timerDurationRef.current - elapsed)
       setTimeRemaining(remaining)
 
+      // The server closes the lot when its own deadline passes
       if (remaining === 0) {
         clearInterval(timerRef.current)
-        // Emit timer expired event
-        socketService.emit('timer_expired', {
-          room_code: roomCode
-        })
       }
     }, 100)
 
@@ -236,7 +249,8 @@ function AuctionRoom() {
     // Emit place bid event
     socketService.emit('place_bid', {
       room_code: roomCode,
-      username: username
+      username: username,
+      seq: bidSeqRef.current
     })
   }
 
@@ -4,6 +4,8 @@ Main entry point for the application.
 """
 import streamlit as st
 from config import Config
+from utils.timing import timed, summary
+from models import UnitOfWork
 
 # Page configuration
 st.set_page_config(
@@ -15,15 +17,15 @@ st.set_page_config(
 
 
 def init_database():
-    """Initialize database connection and create tables if needed."""
-    from models import init_db
-    from services.data_service import seed_database_if_empty
+    """
+    Initialize database connection and create tables if needed.
     
-    # Create tables
-    init_db()
+    Runs once per process; later reruns return immediately.
+    """
+    from utils.db_utils import ensure_database
     
-    # Seed database with players if empty
-    seed_database_if_empty()
+    with timed('init_database'):
+        ensure_database()
 
 
 def init_session_state():
@@ -109,32 +111,53 @@ def render_navigation():
                 st.rerun()
         else:
             st.info("Please create or join a room to start")
+        
+        if Config.DEBUG:
+            render_timings()
+
+
+def render_timings():
+    """Show per-rerun overhead recorded in this process."""
+    with st.expander("⏱️ Rerun timings"):
+        for label, stats in sorted(summary().items()):
+            st.caption(
+                f"{label}: last {stats['last_ms']:.1f} ms, "
+                f"mean {stats['mean_ms']:.1f} ms, p95 {stats['p95_ms']:.1f} ms "
+                f"({stats['count']} runs)"
+            )
 
 
 def main():
     """Main application loop."""
-    # Initialize database
-    init_database()
-    
-    # Initialize session state
-    init_session_state()
-    
-    # Render navigation
-    render_navigation()
-    
-    # Route to appropriate page
+    with timed('rerun'):
+        # Initialize database (once per process)
+        init_database()
+        
+        # Initialize session state
+        init_session_state()
+        
+        # Render navigation
+        render_navigation()
+        
+        # One session for everything this rerun reads and writes
+        with timed(f'page:{st.session_state.page}'), UnitOfWork() as uow:
+            render_page(uow)
+
+
+def render_page(uow):
+    """Route to the current page, sharing the rerun's unit of work."""
     if st.session_state.page == 'home':
         from pages import home
         home.render()
     elif st.session_state.page == 'lobby':
         from pages import lobby
-        lobby.render()
+        lobby.render(uow)
     elif st.session_state.page == 'auction':
         from pages import auction
         auction.render()
     elif st.session_state.page == 'results':
         from pages import results
-        results.render()
+        results.render(uow)
     else:
         st.error("Invalid page")
 
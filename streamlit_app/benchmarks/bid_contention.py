@@ -0,0 +1,152 @@
+"""Bid throughput and lock errors with concurrent bidders on SQLite.
+
+Every bidder runs on its own thread, as every browser session does, and
+bids on the same lot as fast as it can. Each bid is a compare-and-set on
+the room's auction state row, so bidders also compete for SQLite's write
+lock. Runs the same workload against engines with SQLite's defaults
+(rollback journal, with and without a busy timeout) and against the
+configured engine (WAL, busy timeout, pragmas, pool), and reports
+accepted, superseded and "database is locked" bids and bids per second.
+
+Usage (from streamlit_app/):
+    python -m benchmarks.bid_contention
+    python -m benchmarks.bid_contention --bidders 10 --bids 50
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+
+
+def _bind(engine):
+    """Point the app's sessions at ``engine``."""
+    from models import base
+    base.Session.remove()
+    base.session_factory.configure(bind=engine)
+
+
+def _setup_room(engine, room_code, bidders):
+    """Create a room with one lot open and a team per bidder."""
+    from models import migrate, get_session, Room, Team, Player
+    from services import auction_service
+
+    migrate(engine)
+    _bind(engine)
+
+    session = get_session()
+    try:
+        room = Room(code=room_code, host_username='bidder0', status='active',
+                    max_users=max(bidders, 2))
+        session.add(room)
+        session.flush()
+        for i in range(bidders):
+            session.add(Team(room_id=room.id, username=f'bidder{i}', team_name=f'Team {i}',
+                             initial_purse=1e9, purse_left=1e9))
+        session.add(Player(name=f'Contention Player {room_code}', role='BAT', country='India',
+                           base_price=2.0, batting_score=80.0, bowling_score=10.0,
+                           overall_score=70.0, is_overseas=False))
+        session.commit()
+    finally:
+        session.close()
+
+    auction_service.initialize_auction(room_code)
+    auction_service.present_next_player(room_code)
+
+
+def run_contention(engine, bidders, bids_per_bidder, room_code='BENCH1'):
+    """
+    Run ``bidders`` threads that each place ``bids_per_bidder`` bids.
+
+    Args:
+        engine: Engine of an empty database to run against
+        bidders: Number of concurrent bidders
+        bids_per_bidder: Bids each bidder attempts
+        room_code: Code of the room to create
+
+    Returns:
+        dict: attempts, accepted, superseded, lock_errors, elapsed_s and
+            accepted_per_s
+    """
+    from models import base
+    from services import auction_service
+
+    _setup_room(engine, room_code, bidders)
+
+    counts = {'accepted': 0, 'superseded': 0, 'lock_errors': 0}
+    counts_lock = threading.Lock()
+    start = threading.Barrier(bidders)
+
+    def bidder(index):
+        username = f'bidder{index}'
+        start.wait()
+        try:
+            for _ in range(bids_per_bidder):
+                try:
+                    result = auction_service.place_bid(room_code, username)
+                    outcome = 'accepted' if result.success else 'superseded'
+                except OperationalError as e:
+                    if 'locked' not in str(e).lower():
+                        raise
+                    outcome = 'lock_errors'
+                with counts_lock:
+                    counts[outcome] += 1
+        finally:
+            base.Session.remove()
+
+    threads = [threading.Thread(target=bidder, args=(i,)) for i in range(bidders)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    return {
+        'attempts': bidders * bids_per_bidder,
+        **counts,
+        'elapsed_s': elapsed,
+        'accepted_per_s': counts['accepted'] / elapsed if elapsed else 0.0
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--bidders', type=int, default=10)
+    parser.add_argument('--bids', type=int, default=50, help='bids per bidder')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Must be set before the app's config is imported
+        os.environ['DATABASE_URL'] = f'sqlite:///{os.path.join(tmp, "unused.db")}'
+        from models.db_config import create_configured_engine
+
+        engines = {
+            # Fails at once on a held lock, like SQLite without a busy handler
+            'no busy timeout': lambda url: create_engine(
+                url, connect_args={'check_same_thread': False, 'timeout': 0}
+            ),
+            # The app's engine before this profile: rollback journal, 5 s wait
+            'sqlite defaults': lambda url: create_engine(
+                url, connect_args={'check_same_thread': False}
+            ),
+            'configured (WAL)': create_configured_engine,
+        }
+
+        print(f'{args.bidders} bidders x {args.bids} bids')
+        print(f'{"engine":<18} {"accepted":>9} {"superseded":>11} {"locked":>7} {"bids/s":>9}')
+        for label, make_engine in engines.items():
+            url = f'sqlite:///{os.path.join(tmp, label.replace(" ", "_") + ".db")}'
+            engine = make_engine(url)
+            try:
+                result = run_contention(engine, args.bidders, args.bids)
+            finally:
+                engine.dispose()
+            print(f'{label:<18} {result["accepted"]:>9} {result["superseded"]:>11} '
+                  f'{result["lock_errors"]:>7} {result["accepted_per_s"]:>9.1f}')
+
+
+if __name__ == '__main__':
+    main()
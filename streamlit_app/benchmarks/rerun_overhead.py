@@ -0,0 +1,64 @@
+"""Fixed database setup cost paid by every script rerun.
+
+Every rerun used to call ``init_db()`` and ``seed_database_if_empty()``:
+``create_all`` checks, the schema version file and a player count. Now the
+setup runs once per process through ``ensure_database()``. This times both
+against a temporary database seeded from the players CSV.
+
+Usage (from streamlit_app/):
+    python -m benchmarks.rerun_overhead
+    python -m benchmarks.rerun_overhead --reruns 500
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+
+def _time_calls(func, reruns):
+    """Call ``func`` ``reruns`` times and return per-call durations in ms."""
+    durations = []
+    for _ in range(reruns):
+        started = time.perf_counter()
+        func()
+        durations.append((time.perf_counter() - started) * 1000)
+    return durations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--reruns', type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Must be set before the app's config is imported
+        os.environ['DATABASE_URL'] = f'sqlite:///{os.path.join(tmp, "bench.db")}'
+
+        from models import init_db
+        from services.data_service import seed_database_if_empty
+        from utils.db_utils import ensure_database
+
+        started = time.perf_counter()
+        ensure_database()
+        first_ms = (time.perf_counter() - started) * 1000
+
+        def legacy_rerun():
+            init_db()
+            seed_database_if_empty()
+
+        results = {
+            'per rerun (before)': _time_calls(legacy_rerun, args.reruns),
+            'once per process (after)': _time_calls(ensure_database, args.reruns),
+        }
+
+        print(f'first setup: {first_ms:.1f} ms')
+        print(f'{"setup":<26} {"mean ms":>9} {"p95 ms":>9}')
+        for label, durations in results.items():
+            durations.sort()
+            p95 = durations[min(len(durations) - 1, int(len(durations) * 0.95))]
+            print(f'{label:<26} {statistics.mean(durations):>9.3f} {p95:>9.3f}')
+
+
+if __name__ == '__main__':
+    main()
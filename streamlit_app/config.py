@@ -26,6 +26,11 @@ def get_db_path():
 DB_PATH = get_db_path()
 DATABASE_URL = os.getenv('DATABASE_URL', f'sqlite:///{DB_PATH}')
 
+# Connection pool per process; every browser session reruns on its own thread
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 10))
+DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', 20))
+DB_BUSY_TIMEOUT_MS = int(os.getenv('DB_BUSY_TIMEOUT_MS', 5000))  # SQLite lock wait
+
 # Application settings
 SECRET_KEY = os.getenv('SECRET_KEY', 'dev-secret-key-change-in-production')
 DEBUG = os.getenv('DEBUG', 'False').lower() == 'true'
@@ -44,6 +49,7 @@ MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB
 
 # Data files
 PLAYERS_CSV = BASE_DIR / 'data' / 'players.csv'
+PLAYERS_CATALOG = BASE_DIR / 'data' / 'players.npz'  # Compiled from PLAYERS_CSV on demand
 
 # Polling settings
 POLL_INTERVAL = 2  # seconds
@@ -55,6 +61,9 @@ class Config:
     # Database
     SQLALCHEMY_DATABASE_URI = DATABASE_URL
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    DB_POOL_SIZE = DB_POOL_SIZE
+    DB_MAX_OVERFLOW = DB_MAX_OVERFLOW
+    DB_BUSY_TIMEOUT_MS = DB_BUSY_TIMEOUT_MS
     
     # Application
     SECRET_KEY = SECRET_KEY
@@ -72,6 +81,7 @@ class Config:
     ALLOWED_EXTENSIONS = ALLOWED_EXTENSIONS
     MAX_FILE_SIZE = MAX_FILE_SIZE
     PLAYERS_CSV = PLAYERS_CSV
+    PLAYERS_CATALOG = PLAYERS_CATALOG
     
     # Polling
     POLL_INTERVAL = POLL_INTERVAL
@@ -1,12 +1,16 @@
 """Models package for Streamlit application."""
-from models.base import Base, engine, Session, init_db, get_session
+from models.base import Base, engine, Session, init_db, get_session, new_session
 from models.room import Room
 from models.team import Team
 from models.player import Player
 from models.auction_player import AuctionPlayer
 from models.team_player import TeamPlayer
 from models.team_rating import TeamRating
+from models.auction_state import AuctionStateRecord
+from models.unit_of_work import UnitOfWork, unit_of_work
+from models.views import RoomView, UserView, TeamView, TeamPlayerView, PlayerView, LotView, RatingView, TeamResultsView
 from models.simple_user import User
+from models.migrations import migrate
 
 __all__ = [
     'Base',
@@ -14,11 +18,24 @@ __all__ = [
     'Session',
     'init_db',
     'get_session',
+    'new_session',
     'Room',
     'Team',
     'Player',
     'AuctionPlayer',
     'TeamPlayer',
     'TeamRating',
-    'User'
+    'AuctionStateRecord',
+    'UnitOfWork',
+    'unit_of_work',
+    'RoomView',
+    'UserView',
+    'TeamView',
+    'TeamPlayerView',
+    'PlayerView',
+    'LotView',
+    'RatingView',
+    'TeamResultsView',
+    'User',
+    'migrate'
 ]
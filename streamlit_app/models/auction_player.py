@@ -1,6 +1,6 @@
 """AuctionPlayer model."""
 from datetime import datetime
-from sqlalchemy import Column, Integer, Float, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, Float, Boolean, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from models.base import Base
 
@@ -8,6 +8,10 @@ from models.base import Base
 class AuctionPlayer(Base):
     """AuctionPlayer model for room-specific player state."""
     __tablename__ = 'auction_players'
+    __table_args__ = (
+        Index('uq_auction_players_room_player', 'room_id', 'player_id', unique=True),
+        Index('ix_auction_players_room_sold', 'room_id', 'is_sold'),
+    )
 
     id = Column(Integer, primary_key=True)
     room_id = Column(Integer, ForeignKey('rooms.id'), nullable=False)
@@ -0,0 +1,20 @@
+"""AuctionStateRecord model."""
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, Float, DateTime
+from models.base import Base
+
+
+class AuctionStateRecord(Base):
+    """Live auction state for a room, shared by every app process."""
+    __tablename__ = 'auction_states'
+
+    room_code = Column(String(20), primary_key=True)
+    current_player_id = Column(Integer, nullable=True)
+    current_bid = Column(Float, nullable=True)
+    highest_bidder = Column(String(100), nullable=True)
+    bid_increment = Column(Float, nullable=False)
+    timer_duration = Column(Integer, nullable=False)
+    timer_start = Column(DateTime, nullable=True)
+    lot_seq = Column(Integer, nullable=False, default=0)  # Bumped on every new lot
+    version = Column(Integer, nullable=False, default=0)  # Bumped on every change
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
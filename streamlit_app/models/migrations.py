@@ -0,0 +1,179 @@
+"""Versioned schema migrations.
+
+The database is upgraded in place instead of being deleted and reseeded
+when the schema changes, so rooms in progress survive a deploy. Each
+migration moves the schema from the previous version to its own and is
+recorded in ``schema_migrations``. Migrations check what already exists
+before changing it, so applying one to a database that already has the
+change is harmless.
+"""
+from datetime import datetime
+from sqlalchemy import Table, Column, Integer, String, DateTime, inspect, text
+from sqlalchemy.exc import DBAPIError
+from models.base import Base, DB_SCHEMA_VERSION
+
+# Schema of databases created before migrations were recorded
+BASELINE_VERSION = 4
+
+schema_migrations = Table(
+    'schema_migrations',
+    Base.metadata,
+    Column('version', Integer, primary_key=True),
+    Column('name', String(100), nullable=False),
+    Column('applied_at', DateTime, default=datetime.utcnow)
+)
+
+
+def _add_column(conn, table, column, ddl):
+    """Add a column to a table unless it already has it."""
+    columns = {col['name'] for col in inspect(conn).get_columns(table)}
+    if column not in columns:
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+
+
+def _create_auction_states(conn):
+    """Keep live auction state in the database, with a lot sequence number."""
+    from models.auction_state import AuctionStateRecord
+    AuctionStateRecord.__table__.create(conn, checkfirst=True)
+    _add_column(conn, 'auction_states', 'lot_seq', 'INTEGER NOT NULL DEFAULT 0')
+
+
+# Columns pointing at a team, moved to the surviving team when duplicates merge
+TEAM_REFERENCES = (
+    ('team_players', 'team_id'),
+    ('team_ratings', 'team_id'),
+    ('auction_players', 'sold_to_team_id'),
+)
+
+# First team of each user in a room
+FIRST_TEAMS = "SELECT MIN(id) FROM teams GROUP BY room_id, username"
+
+
+def _merge_duplicate_teams(conn):
+    """Fold each user's duplicate teams in a room into their first team."""
+    for table, column in TEAM_REFERENCES:
+        conn.execute(text(
+            f"UPDATE {table} SET {column} = ("
+            "SELECT MIN(keep.id) FROM teams keep JOIN teams dup "
+            "ON keep.room_id = dup.room_id AND keep.username = dup.username "
+            f"WHERE dup.id = {table}.{column}) "
+            f"WHERE {column} IN (SELECT id FROM teams WHERE id NOT IN ({FIRST_TEAMS}))"
+        ))
+
+    # Keep the first purchase of each player and the first rating of each team
+    conn.execute(text(
+        "DELETE FROM team_players WHERE id NOT IN "
+        "(SELECT MIN(id) FROM team_players GROUP BY team_id, player_id)"
+    ))
+    conn.execute(text(
+        "DELETE FROM team_ratings WHERE id NOT IN "
+        "(SELECT MIN(id) FROM team_ratings GROUP BY team_id)"
+    ))
+
+    # Recompute merged teams' purses from their merged squads
+    conn.execute(text(
+        "UPDATE teams SET purse_left = initial_purse - COALESCE("
+        "(SELECT SUM(price) FROM team_players WHERE team_players.team_id = teams.id), 0) "
+        "WHERE id IN (SELECT MIN(id) FROM teams GROUP BY room_id, username HAVING COUNT(*) > 1)"
+    ))
+    conn.execute(text(f"DELETE FROM teams WHERE id NOT IN ({FIRST_TEAMS})"))
+
+
+def _create_hot_path_indexes(conn):
+    """Index lot, squad and team lookups and stop double-sells."""
+    from models.auction_player import AuctionPlayer
+    from models.team_player import TeamPlayer
+    from models.team import Team
+
+    # Unique indexes cannot be built over duplicates; keep the first row
+    conn.execute(text(
+        "DELETE FROM auction_players WHERE id NOT IN "
+        "(SELECT MIN(id) FROM auction_players GROUP BY room_id, player_id)"
+    ))
+    _merge_duplicate_teams(conn)
+
+    for model in (AuctionPlayer, TeamPlayer, Team):
+        for index in model.__table__.indexes:
+            index.create(conn, checkfirst=True)
+
+
+# (version, name, upgrade function), in the order they are applied
+MIGRATIONS = [
+    (5, 'auction_states', _create_auction_states),
+    (6, 'hot path indexes', _create_hot_path_indexes),
+]
+
+
+def get_schema_version(conn):
+    """
+    Get the latest recorded schema version.
+
+    Args:
+        conn: Database connection
+
+    Returns:
+        int or None: Latest applied version, or None if none is recorded
+    """
+    try:
+        return conn.execute(text("SELECT MAX(version) FROM schema_migrations")).scalar()
+    except DBAPIError:
+        return None
+
+
+def _record(conn, version, name):
+    """Record a version as applied."""
+    conn.execute(schema_migrations.insert().values(
+        version=version,
+        name=name,
+        applied_at=datetime.utcnow()
+    ))
+
+
+def migrate(engine):
+    """
+    Bring the database schema up to ``DB_SCHEMA_VERSION`` in place.
+
+    When the schema is current this is a single query. A new database gets
+    the current schema directly; an existing one gets the migrations it is
+    missing, each in its own transaction.
+
+    Args:
+        engine: Engine of the database to migrate
+
+    Returns:
+        list: Versions applied by this call
+    """
+    with engine.connect() as conn:
+        current = get_schema_version(conn)
+
+    if current is not None and current >= DB_SCHEMA_VERSION:
+        return []
+
+    if current is None:
+        with engine.begin() as conn:
+            model_tables = set(Base.metadata.tables) - {schema_migrations.name}
+            if not model_tables & set(inspect(conn).get_table_names()):
+                # New database: create the current schema and mark it current
+                Base.metadata.create_all(conn)
+                _record(conn, DB_SCHEMA_VERSION, 'initial schema')
+                return [DB_SCHEMA_VERSION]
+
+            # Database from before migrations were recorded
+            schema_migrations.create(conn, checkfirst=True)
+            _record(conn, BASELINE_VERSION, 'baseline')
+            current = BASELINE_VERSION
+
+    applied = []
+    for version, name, upgrade in MIGRATIONS:
+        if version <= current:
+            continue
+        with engine.begin() as conn:
+            upgrade(conn)
+            _record(conn, version, name)
+        print(f"Applied schema migration {version}: {name}")
+        applied.append(version)
+
+    # Tables added to the models without a migration of their own
+    Base.metadata.create_all(engine)
+
+    return applied
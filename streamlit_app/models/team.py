@@ -1,6 +1,6 @@
 """Team model."""
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from models.base import Base
 
@@ -8,6 +8,9 @@ from models.base import Base
 class Team(Base):
     """Team model for user teams in auction."""
     __tablename__ = 'teams'
+    __table_args__ = (
+        Index('uq_teams_room_username', 'room_id', 'username', unique=True),
+    )
 
     id = Column(Integer, primary_key=True)
     room_id = Column(Integer, ForeignKey('rooms.id'), nullable=False)
@@ -1,6 +1,6 @@
 """TeamPlayer model."""
 from datetime import datetime
-from sqlalchemy import Column, Integer, Float, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, Float, Boolean, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from models.base import Base
 
@@ -8,6 +8,10 @@ from models.base import Base
 class TeamPlayer(Base):
     """TeamPlayer model for players in a team."""
     __tablename__ = 'team_players'
+    __table_args__ = (
+        Index('uq_team_players_team_player', 'team_id', 'player_id', unique=True),
+        Index('ix_team_players_team_xi', 'team_id', 'in_playing_xi'),
+    )
 
     id = Column(Integer, primary_key=True)
     team_id = Column(Integer, ForeignKey('teams.id'), nullable=False)
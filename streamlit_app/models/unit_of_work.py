@@ -0,0 +1,113 @@
+"""Request-scoped unit of work.
+
+Streamlit re-executes the page script on every interaction and refresh. A
+``UnitOfWork`` is opened once per rerun (or fragment run) and passed to the
+services, so they share one session and its identity map instead of each
+opening, querying and closing a session of their own. Objects stay attached
+until the rerun ends, so lazy relationships such as ``room.users`` load
+normally.
+"""
+from contextlib import contextmanager
+from models import base
+from models.room import Room
+from models.team import Team
+from models.player import Player
+
+
+class UnitOfWork:
+    """One session plus a per-rerun cache of rooms and teams."""
+    
+    def __init__(self, session=None):
+        """
+        Args:
+            session: Session to use; defaults to a new one of its own
+        """
+        self.session = session if session is not None else base.new_session()
+        self._rooms = {}
+        self._teams = {}
+    
+    def get_room(self, room_code):
+        """
+        Get a room by code, querying it at most once per unit of work.
+        
+        Returns:
+            Room or None: Room object if found
+        """
+        room = self._rooms.get(room_code)
+        if room is None:
+            room = self.session.query(Room).filter_by(code=room_code).first()
+            if room is not None:
+                self._rooms[room_code] = room
+        return room
+    
+    def get_team(self, room_id, username):
+        """
+        Get a user's team in a room, querying it at most once per unit of work.
+        
+        Returns:
+            Team or None: Team object if found
+        """
+        key = (room_id, username)
+        team = self._teams.get(key)
+        if team is None:
+            team = self.session.query(Team).filter_by(room_id=room_id, username=username).first()
+            if team is not None:
+                self._teams[key] = team
+        return team
+    
+    def get_player(self, player_id):
+        """
+        Get a player by ID from the session's identity map or the database.
+        
+        Returns:
+            Player or None: Player object if found
+        """
+        return self.session.get(Player, player_id)
+    
+    def commit(self):
+        """Commit the session; cached objects reload on next access."""
+        self.session.commit()
+    
+    def rollback(self):
+        """Roll back the session."""
+        self.session.rollback()
+    
+    def close(self):
+        """Close the session and forget cached objects."""
+        self._rooms.clear()
+        self._teams.clear()
+        self.session.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.rollback()
+        self.close()
+        return False
+
+
+@contextmanager
+def unit_of_work(uow=None):
+    """
+    Use the caller's unit of work, or open one just for this call.
+    
+    Services take an optional ``uow``; called without one (e.g. from
+    tests) they get a private unit of work that is closed afterwards.
+    
+    Args:
+        uow: Caller's UnitOfWork, or None
+    
+    Yields:
+        UnitOfWork: The unit of work to use
+    """
+    if uow is not None:
+        yield uow
+        return
+    
+    own = UnitOfWork(base.get_session())
+    try:
+        yield own
+    finally:
+        own.close()
@@ -0,0 +1,173 @@
+"""Read-only views of rooms, participants, teams, squads, players, lots and results.
+
+Services hand these to the pages instead of ORM objects. They are frozen
+and slotted, so they are cheap to build, compare by value, survive the
+session closing and can be pickled into ``st.cache_data`` or session state.
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional, Tuple
+
+
+class _View:
+    """Base for views: hydration from query rows and pickling support."""
+    __slots__ = ()
+
+    @classmethod
+    def columns(cls, model):
+        """
+        Get the model columns matching this view's fields, in field order.
+
+        Args:
+            model: Mapped class the view is read from
+
+        Returns:
+            list: Columns to pass to ``session.query``
+        """
+        return [getattr(model, name) for name in cls.__slots__]
+
+    @classmethod
+    def from_row(cls, row):
+        """
+        Build a view from an ORM object or any row with matching attributes.
+
+        Args:
+            row: Object to copy the view's fields from
+
+        Returns:
+            View or None: The view, or None if row is None
+        """
+        if row is None:
+            return None
+        return cls(*[getattr(row, name) for name in cls.__slots__])
+
+    @classmethod
+    def from_rows(cls, rows):
+        """
+        Build views from rows of a ``session.query(*View.columns(Model))`` query.
+
+        Args:
+            rows: Rows whose values are in field order
+
+        Returns:
+            list: One view per row
+        """
+        return [cls(*row) for row in rows]
+
+    def __getstate__(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state):
+        for name, value in zip(self.__slots__, state):
+            object.__setattr__(self, name, value)
+
+
+@dataclass(frozen=True)
+class RoomView(_View):
+    """Room as shown to the pages."""
+    __slots__ = ('id', 'code', 'status', 'host_username', 'min_users', 'max_users')
+
+    id: int
+    code: str
+    status: str
+    host_username: str
+    min_users: int
+    max_users: int
+
+
+@dataclass(frozen=True)
+class UserView(_View):
+    """Room participant as shown to the pages."""
+    __slots__ = ('id', 'username', 'room_id')
+
+    id: int
+    username: str
+    room_id: Optional[int]
+
+
+@dataclass(frozen=True)
+class TeamView(_View):
+    """Team as shown to the pages."""
+    __slots__ = ('id', 'room_id', 'username', 'team_name', 'logo_url',
+                 'initial_purse', 'purse_left')
+
+    id: int
+    room_id: int
+    username: str
+    team_name: str
+    logo_url: Optional[str]
+    initial_purse: float
+    purse_left: float
+
+
+@dataclass(frozen=True)
+class TeamPlayerView(_View):
+    """A player's place in a team's squad."""
+    __slots__ = ('id', 'team_id', 'player_id', 'price', 'in_playing_xi', 'is_impact_player')
+
+    id: int
+    team_id: int
+    player_id: int
+    price: float
+    in_playing_xi: bool
+    is_impact_player: bool
+
+
+@dataclass(frozen=True)
+class PlayerView(_View):
+    """Player as shown to the pages."""
+    __slots__ = ('id', 'name', 'role', 'country', 'base_price', 'batting_score',
+                 'bowling_score', 'overall_score', 'is_overseas')
+
+    id: int
+    name: str
+    role: str
+    country: str
+    base_price: float
+    batting_score: float
+    bowling_score: float
+    overall_score: float
+    is_overseas: bool
+
+
+@dataclass(frozen=True)
+class LotView(_View):
+    """What the auction page shows for a room's current lot and the viewer's team."""
+    __slots__ = ('room_code', 'version', 'auction_complete', 'timer_start', 'lot_seq',
+                 'player', 'current_bid', 'highest_bidder', 'purse', 'squad_size')
+
+    room_code: str
+    version: int
+    auction_complete: bool
+    timer_start: Optional[datetime]
+    lot_seq: Optional[int]
+    player: Optional[PlayerView]
+    current_bid: Optional[float]
+    highest_bidder: Optional[str]
+    purse: Optional[float]
+    squad_size: Optional[int]
+
+
+@dataclass(frozen=True)
+class RatingView(_View):
+    """A team's computed rating."""
+    __slots__ = ('team_id', 'overall_rating', 'batting_rating', 'bowling_rating',
+                 'balance_score', 'bench_depth', 'role_coverage')
+
+    team_id: int
+    overall_rating: float
+    batting_rating: float
+    bowling_rating: float
+    balance_score: float
+    bench_depth: float
+    role_coverage: float
+
+
+@dataclass(frozen=True)
+class TeamResultsView(_View):
+    """What the results page shows for one team: rating and squad."""
+    __slots__ = ('team', 'rating', 'squad')
+
+    team: TeamView
+    rating: Optional[RatingView]
+    squad: Tuple[Tuple[TeamPlayerView, PlayerView], ...]  # in purchase order
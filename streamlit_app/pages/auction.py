@@ -1,12 +1,16 @@
 """Auction page for live bidding."""
 import streamlit as st
-import time
-from datetime import datetime
-from services import auction_service, team_service, room_service, ai_service
+from services import auction_service, team_service, ai_service
 from utils.timer import get_remaining_time, is_timer_expired, format_time
+from utils.timing import timed
+from models import UnitOfWork, LotView
 from config import Config
 
 
+# Seconds between fragment refreshes during the auction
+REFRESH_INTERVAL = 1
+
+
 def render():
     """Render the auction page."""
     if not st.session_state.room_code:
@@ -15,143 +19,206 @@ def render():
         st.rerun()
         return
     
-    # Get current auction state
-    auction_state = auction_service.get_current_auction_state(st.session_state.room_code)
+    st.title(f"⚡ Live Auction - Room: {st.session_state.room_code}")
     
-    # Check if auction is complete
-    if auction_state.auction_complete:
-        # Run AI analysis for all teams
-        room = room_service.get_room(st.session_state.room_code)
-        if room:
-            teams = team_service.get_all_teams(st.session_state.room_code)
-            for team in teams:
-                ai_service.select_playing_xi(team.id)
-                ai_service.select_impact_player(team.id)
-                ai_service.calculate_team_rating(team.id)
-            
-            # Update room status
-            room.status = 'completed'
+    # The timer and the lot refresh on their own; the rest of the page is
+    # only drawn when the user navigates
+    render_live()
+
+
+@st.cache_data(ttl=REFRESH_INTERVAL, show_spinner=False)
+def get_state_version(room_code):
+    """
+    Get a room's state version, read at most once per refresh per process.
+    
+    Every viewer of a room polls the version on every refresh, so the read
+    is shared across sessions. Viewers that change the state clear the
+    room's entry, so they see their own change on the next refresh.
+    """
+    return auction_service.get_state_version(room_code)
+
+
+def state_changed(room_code):
+    """Drop the room's cached state version after changing the state."""
+    get_state_version.clear(room_code)
+
+
+def get_lot_view(room_code, username, uow):
+    """
+    Get what the page shows, re-reading the auction only when it changed.
+    
+    The view is cached in the session together with the room's state
+    version, so refreshes while nothing happens cost no database work.
+    
+    Args:
+        room_code: Code of the room
+        username: Username of the viewer
+        uow: Unit of work of the current fragment run
+    
+    Returns:
+        LotView: Auction state, current player and the viewer's team summary
+    """
+    version = get_state_version(room_code)
+    view = st.session_state.get('lot_view')
+    if view and view.room_code == room_code and view.version == version:
+        return view
+    
+    with timed('auction:refresh'):
+        auction_state = auction_service.get_current_auction_state(room_code, uow)
+        my_team = team_service.get_team(room_code, username, uow)
+        view = LotView(
+            room_code=room_code,
+            version=version,
+            auction_complete=auction_state.auction_complete,
+            timer_start=auction_service.get_timer_start(room_code, uow),
+            lot_seq=auction_state.lot_seq,
+            player=auction_state.current_player,
+            current_bid=auction_state.current_bid,
+            highest_bidder=auction_state.highest_bidder,
+            purse=my_team.purse_left if my_team else None,
+            squad_size=len(team_service.get_team_squad(my_team.id, uow)) if my_team else None
+        )
+    
+    st.session_state.lot_view = view
+    return view
+
+
+@st.fragment(run_every=REFRESH_INTERVAL)
+def render_live():
+    """Render the lot timer, the viewer's purse, the current player and the bid panel."""
+    # Fragment runs are reruns of their own, so each opens its own unit of
+    # work; its session only connects when the cached view is out of date
+    with UnitOfWork() as uow:
+        room_code = st.session_state.room_code
+        view = get_lot_view(room_code, st.session_state.username, uow)
+        _render_timer(room_code, view, uow)
+        _render_lot(room_code, view, uow)
+
+
+def _render_timer(room_code, view, uow):
+    """Draw the timer and settle the lot when it runs out."""
+    # A new lot always bumps the state version, so the cached start is current
+    timer_start = view.timer_start
+    if not timer_start:
+        return
+    
+    remaining = get_remaining_time(timer_start, Config.TIMER_DURATION)
+    
+    # Display timer
+    timer_col1, timer_col2 = st.columns([3, 1])
+    with timer_col1:
+        st.subheader(f"⏱️ Time Remaining: {format_time(remaining)}")
+    with timer_col2:
+        if remaining <= 10:
+            st.error("⚠️ HURRY!")
+    
+    # Check if timer expired
+    if is_timer_expired(timer_start, Config.TIMER_DURATION):
+        # Every viewer tries; only one settles the lot, the rest see the
+        # result on their next refresh
+        result = auction_service.handle_timer_expiry(room_code, view.lot_seq, uow)
+        if not result:
+            return
         
+        state_changed(room_code)
+        if result['sold_to']:
+            st.toast(f"✅ {result['player'].name} sold to {result['sold_to']} for ₹{result['sold_price']:.1f}L!")
+        else:
+            st.toast(f"No bids for {result['player'].name}")
+        
+        # Present next player; the page picks it up on its next refresh. The
+        # viewer who settled the last lot runs the AI analysis for all teams
+        # and marks the room completed, so it runs once per auction
+        if (auction_service.present_next_player(room_code, uow) is None
+                and auction_service.is_auction_complete(room_code, uow)):
+            ai_service.finalize_room(room_code, uow)
+
+
+def _render_lot(room_code, view, uow):
+    """Draw the viewer's purse, the current player and the bid panel."""
+    # Check if auction is complete
+    if view.auction_complete:
         st.session_state.page = 'results'
         st.rerun()
         return
     
-    st.title(f"⚡ Live Auction - Room: {st.session_state.room_code}")
-    
-    # Get my team info
-    my_team = team_service.get_team(st.session_state.room_code, st.session_state.username)
-    if my_team:
-        st.session_state.my_purse = my_team.purse_left
+    if view.purse is not None:
+        st.session_state.my_purse = view.purse
     
     # Display purse
     col1, col2, col3 = st.columns([2, 2, 1])
     with col1:
         st.metric("💰 My Purse", f"₹{st.session_state.my_purse:.1f}L")
     with col2:
-        if my_team:
-            squad_size = len(team_service.get_team_squad(my_team.id))
-            st.metric("👥 Squad Size", squad_size)
+        if view.squad_size is not None:
+            st.metric("👥 Squad Size", view.squad_size)
     
     st.divider()
     
-    # Current player display
-    if auction_state.current_player:
-        player = auction_state.current_player
-        
-        # Timer
-        timer_start = auction_service.get_timer_start(st.session_state.room_code)
-        if timer_start:
-            remaining = get_remaining_time(timer_start, Config.TIMER_DURATION)
-            
-            # Display timer
-            timer_col1, timer_col2 = st.columns([3, 1])
-            with timer_col1:
-                st.subheader(f"⏱️ Time Remaining: {format_time(remaining)}")
-            with timer_col2:
-                if remaining <= 10:
-                    st.error("⚠️ HURRY!")
-            
-            # Check if timer expired
-            if is_timer_expired(timer_start, Config.TIMER_DURATION):
-                # Handle timer expiry
-                result = auction_service.handle_timer_expiry(st.session_state.room_code)
-                
-                if result:
-                    if result['sold_to']:
-                        st.success(f"✅ {result['player'].name} sold to {result['sold_to']} for ₹{result['sold_price']:.1f}L!")
-                    else:
-                        st.info(f"No bids for {result['player'].name}")
-                    
-                    time.sleep(2)
-                
-                # Present next player
-                next_player = auction_service.present_next_player(st.session_state.room_code)
-                if not next_player:
-                    # Auction complete
-                    st.rerun()
-                else:
-                    st.rerun()
-        
-        # Player card
-        st.subheader(f"🏏 {player.name}")
-        
-        player_col1, player_col2, player_col3 = st.columns(3)
-        with player_col1:
-            st.metric("Role", player.role)
-            st.metric("Country", player.country)
-        with player_col2:
-            st.metric("Base Price", f"₹{player.base_price:.1f}L")
-            st.metric("Overseas", "Yes" if player.is_overseas else "No")
-        with player_col3:
-            st.metric("Batting", f"{player.batting_score:.1f}")
-            st.metric("Bowling", f"{player.bowling_score:.1f}")
-        
-        st.metric("Overall Score", f"{player.overall_score:.1f}", delta=None)
-        
-        st.divider()
-        
-        # Current bid info
-        st.subheader("💵 Current Bid")
-        bid_col1, bid_col2 = st.columns(2)
-        with bid_col1:
-            st.metric("Amount", f"₹{auction_state.current_bid:.1f}L")
-        with bid_col2:
-            if auction_state.highest_bidder:
-                st.metric("Highest Bidder", auction_state.highest_bidder)
-            else:
-                st.info("No bids yet")
-        
-        # Bid button
-        next_bid = auction_state.current_bid + Config.BID_INCREMENT
+    player = view.player
+    if not player:
+        st.info("⏳ Waiting for next player...")
         
-        if st.session_state.my_purse >= next_bid:
-            if st.button(f"Place Bid (₹{next_bid:.1f}L)", type="primary", use_container_width=True):
-                result = auction_service.place_bid(
-                    st.session_state.room_code,
-                    st.session_state.username
-                )
-                
-                if result.success:
-                    st.success(f"✅ Bid placed: ₹{result.new_bid:.1f}L")
-                    st.rerun()
-                else:
-                    st.error(f"❌ {result.message}")
+        # Try to present next player; it shows up on the next refresh
+        auction_service.present_next_player(room_code, uow)
+        state_changed(room_code)
+        return
+    
+    # Player card
+    st.subheader(f"🏏 {player.name}")
+    
+    player_col1, player_col2, player_col3 = st.columns(3)
+    with player_col1:
+        st.metric("Role", player.role)
+        st.metric("Country", player.country)
+    with player_col2:
+        st.metric("Base Price", f"₹{player.base_price:.1f}L")
+        st.metric("Overseas", "Yes" if player.is_overseas else "No")
+    with player_col3:
+        st.metric("Batting", f"{player.batting_score:.1f}")
+        st.metric("Bowling", f"{player.bowling_score:.1f}")
+    
+    st.metric("Overall Score", f"{player.overall_score:.1f}", delta=None)
+    
+    st.divider()
+    
+    # Current bid info
+    st.subheader("💵 Current Bid")
+    bid_col1, bid_col2 = st.columns(2)
+    with bid_col1:
+        st.metric("Amount", f"₹{view.current_bid:.1f}L")
+    with bid_col2:
+        if view.highest_bidder:
+            st.metric("Highest Bidder", view.highest_bidder)
         else:
-            st.error(f"❌ Insufficient purse (need ₹{next_bid:.1f}L)")
+            st.info("No bids yet")
     
-    else:
-        st.info("⏳ Waiting for next player...")
+    # Bid button
+    next_bid = view.current_bid + Config.BID_INCREMENT
+    
+    if st.session_state.my_purse >= next_bid:
+        # Bid in the click callback so this refresh already shows it
+        st.button(
+            f"Place Bid (₹{next_bid:.1f}L)",
+            type="primary",
+            use_container_width=True,
+            on_click=place_bid,
+            args=(room_code, st.session_state.username)
+        )
         
-        # Try to present next player
-        next_player = auction_service.present_next_player(st.session_state.room_code)
-        if next_player:
-            st.rerun()
-    
-    # Auto-refresh for real-time updates
-    if 'last_auction_poll' not in st.session_state:
-        st.session_state.last_auction_poll = time.time()
-    
-    current_time = time.time()
-    if current_time - st.session_state.last_auction_poll > 1:  # Poll every second during auction
-        st.session_state.last_auction_poll = current_time
-        st.rerun()
+        bid_error = st.session_state.pop('bid_error', None)
+        if bid_error:
+            st.error(f"❌ {bid_error}")
+    else:
+        st.error(f"❌ Insufficient purse (need ₹{next_bid:.1f}L)")
+
+
+def place_bid(room_code, username):
+    """Place the viewer's bid when the bid button is clicked."""
+    result = auction_service.place_bid(room_code, username)
+    
+    if result.success:
+        state_changed(room_code)
+        st.toast(f"✅ Bid placed: ₹{result.new_bid:.1f}L")
+    else:
+        st.session_state.bid_error = result.message
@@ -6,7 +6,7 @@ from utils.validation import validate_team_name, validate_purse
 from config import Config
 
 
-def render():
+def render(uow):
     """Render the lobby page."""
     if not st.session_state.room_code:
         st.error("No room selected. Returning to home...")
@@ -17,14 +17,14 @@ def render():
     st.title(f"🏠 Lobby - Room: {st.session_state.room_code}")
     
     # Get room info
-    room = room_service.get_room(st.session_state.room_code)
+    room = room_service.get_room(st.session_state.room_code, uow)
     if not room:
         st.error("Room not found!")
         return
     
     # Display participants
     st.subheader("👥 Participants")
-    participants = room_service.get_room_participants(st.session_state.room_code)
+    participants = room_service.get_room_participants(st.session_state.room_code, uow)
     
     cols = st.columns(min(len(participants), 5))
     for idx, user in enumerate(participants):
@@ -87,7 +87,8 @@ def render():
                     st.session_state.username,
                     team_name,
                     purse,
-                    logo_url
+                    logo_url,
+                    uow=uow
                 )
                 
                 if success:
@@ -109,7 +110,7 @@ def render():
         st.subheader("🚀 Start Auction")
         
         # Check if all participants have configured teams
-        all_teams = team_service.get_all_teams(st.session_state.room_code)
+        all_teams = team_service.get_all_teams(st.session_state.room_code, uow)
         configured_count = len(all_teams)
         
         st.info(f"{configured_count}/{len(participants)} teams configured")
@@ -123,15 +124,16 @@ def render():
                 # Start auction
                 success, message = room_service.start_auction(
                     st.session_state.room_code,
-                    st.session_state.username
+                    st.session_state.username,
+                    uow
                 )
                 
                 if success:
                     # Initialize auction
-                    auction_service.initialize_auction(st.session_state.room_code)
+                    auction_service.initialize_auction(st.session_state.room_code, uow)
                     
                     # Present first player
-                    first_player = auction_service.present_next_player(st.session_state.room_code)
+                    first_player = auction_service.present_next_player(st.session_state.room_code, uow)
                     
                     if first_player:
                         st.session_state.page = 'auction'
@@ -1,11 +1,10 @@
 """Results page for auction outcomes."""
 import streamlit as st
 import pandas as pd
-from services import team_service, ai_service, room_service
-from models import get_session, Team, TeamRating, TeamPlayer, Player
+from services import ai_service, results_service
 
 
-def render():
+def render(uow):
     """Render the results page."""
     if not st.session_state.room_code:
         st.error("No room selected. Returning to home...")
@@ -15,134 +14,114 @@ def render():
     
     st.title(f"🏆 Auction Results - Room: {st.session_state.room_code}")
     
+    # Every team's rating and squad, read in one query
+    team_results = results_service.get_team_results(st.session_state.room_code, uow)
+    
     # Get winner
-    winner = ai_service.determine_winner(st.session_state.room_code)
+    winner = ai_service.determine_winner(st.session_state.room_code, uow)
     
     if winner:
-        session = get_session()
-        try:
-            winner_rating = session.query(TeamRating).filter_by(team_id=winner.id).first()
-            
-            st.success(f"🎉 **Winner: {winner.team_name}** (Rating: {winner_rating.overall_rating:.2f})")
-            st.balloons()
-        finally:
-            session.close()
+        winner_rating = next(result.rating for result in team_results if result.team.id == winner.id)
+        
+        st.success(f"🎉 **Winner: {winner.team_name}** (Rating: {winner_rating.overall_rating:.2f})")
+        st.balloons()
     
     st.divider()
     
-    # Get all teams
-    teams = team_service.get_all_teams(st.session_state.room_code)
-    
-    if not teams:
+    if not team_results:
         st.warning("No teams found")
         return
     
     # Team ratings comparison
     st.subheader("📊 Team Ratings Comparison")
     
-    session = get_session()
-    try:
-        ratings_data = []
-        for team in teams:
-            rating = session.query(TeamRating).filter_by(team_id=team.id).first()
-            if rating:
-                ratings_data.append({
-                    'Team': team.team_name,
-                    'Overall Rating': rating.overall_rating,
-                    'Batting': rating.batting_rating,
-                    'Bowling': rating.bowling_rating,
-                    'Balance': rating.balance_score
-                })
+    ratings_data = []
+    for result in team_results:
+        rating = result.rating
+        if rating:
+            ratings_data.append({
+                'Team': result.team.team_name,
+                'Overall Rating': rating.overall_rating,
+                'Batting': rating.batting_rating,
+                'Bowling': rating.bowling_rating,
+                'Balance': rating.balance_score
+            })
+    
+    if ratings_data:
+        df = pd.DataFrame(ratings_data)
+        df = df.sort_values('Overall Rating', ascending=False)
         
-        if ratings_data:
-            df = pd.DataFrame(ratings_data)
-            df = df.sort_values('Overall Rating', ascending=False)
-            
-            # Bar chart
-            st.bar_chart(df.set_index('Team')['Overall Rating'])
-            
-            # Detailed table
-            st.dataframe(df, use_container_width=True, hide_index=True)
-    finally:
-        session.close()
+        # Bar chart
+        st.bar_chart(df.set_index('Team')['Overall Rating'])
+        
+        # Detailed table
+        st.dataframe(df, use_container_width=True, hide_index=True)
     
     st.divider()
     
     # Team details
     st.subheader("👥 Team Squads")
     
-    for team in teams:
+    for result in team_results:
+        team = result.team
         with st.expander(f"**{team.team_name}** ({team.username})"):
-            session = get_session()
-            try:
-                # Get rating
-                rating = session.query(TeamRating).filter_by(team_id=team.id).first()
+            rating = result.rating
+            
+            if rating:
+                col1, col2, col3, col4 = st.columns(4)
+                with col1:
+                    st.metric("Overall Rating", f"{rating.overall_rating:.2f}")
+                with col2:
+                    st.metric("Batting", f"{rating.batting_rating:.2f}")
+                with col3:
+                    st.metric("Bowling", f"{rating.bowling_rating:.2f}")
+                with col4:
+                    st.metric("Balance", f"{rating.balance_score:.2f}")
+            
+            if result.squad:
+                # Playing XI
+                st.markdown("**🌟 Playing XI:**")
+                playing_xi = [(tp, player) for tp, player in result.squad if tp.in_playing_xi]
                 
-                if rating:
-                    col1, col2, col3, col4 = st.columns(4)
-                    with col1:
-                        st.metric("Overall Rating", f"{rating.overall_rating:.2f}")
-                    with col2:
-                        st.metric("Batting", f"{rating.batting_rating:.2f}")
-                    with col3:
-                        st.metric("Bowling", f"{rating.bowling_rating:.2f}")
-                    with col4:
-                        st.metric("Balance", f"{rating.balance_score:.2f}")
+                if playing_xi:
+                    xi_data = []
+                    for tp, player in playing_xi:
+                        xi_data.append({
+                            'Player': player.name,
+                            'Role': player.role,
+                            'Price': f"₹{tp.price:.1f}L",
+                            'Overall': player.overall_score
+                        })
+                    
+                    st.dataframe(pd.DataFrame(xi_data), use_container_width=True, hide_index=True)
+                else:
+                    st.info("Playing XI not selected")
                 
-                # Get squad
-                team_players = session.query(TeamPlayer).filter_by(team_id=team.id).all()
+                # Impact Player
+                impact = [(tp, player) for tp, player in result.squad if tp.is_impact_player]
+                if impact:
+                    st.markdown("**⚡ Impact Player:**")
+                    impact_tp, impact_player = impact[0]
+                    st.success(f"{impact_player.name} ({impact_player.role}) - ₹{impact_tp.price:.1f}L")
                 
-                if team_players:
-                    # Playing XI
-                    st.markdown("**🌟 Playing XI:**")
-                    playing_xi = [tp for tp in team_players if tp.in_playing_xi]
-                    
-                    if playing_xi:
-                        xi_data = []
-                        for tp in playing_xi:
-                            player = session.query(Player).get(tp.player_id)
-                            if player:
-                                xi_data.append({
-                                    'Player': player.name,
-                                    'Role': player.role,
-                                    'Price': f"₹{tp.price:.1f}L",
-                                    'Overall': player.overall_score
-                                })
-                        
-                        st.dataframe(pd.DataFrame(xi_data), use_container_width=True, hide_index=True)
-                    else:
-                        st.info("Playing XI not selected")
+                # Bench
+                bench = [(tp, player) for tp, player in result.squad if not tp.in_playing_xi]
+                if bench:
+                    st.markdown("**🪑 Bench:**")
+                    bench_data = []
+                    for tp, player in bench:
+                        bench_data.append({
+                            'Player': player.name,
+                            'Role': player.role,
+                            'Price': f"₹{tp.price:.1f}L"
+                        })
                     
-                    # Impact Player
-                    impact = [tp for tp in team_players if tp.is_impact_player]
-                    if impact:
-                        st.markdown("**⚡ Impact Player:**")
-                        impact_player = session.query(Player).get(impact[0].player_id)
-                        if impact_player:
-                            st.success(f"{impact_player.name} ({impact_player.role}) - ₹{impact[0].price:.1f}L")
-                    
-                    # Bench
-                    bench = [tp for tp in team_players if not tp.in_playing_xi]
-                    if bench:
-                        st.markdown("**🪑 Bench:**")
-                        bench_data = []
-                        for tp in bench:
-                            player = session.query(Player).get(tp.player_id)
-                            if player:
-                                bench_data.append({
-                                    'Player': player.name,
-                                    'Role': player.role,
-                                    'Price': f"₹{tp.price:.1f}L"
-                                })
-                        
-                        st.dataframe(pd.DataFrame(bench_data), use_container_width=True, hide_index=True)
-                    
-                    # Purse info
-                    st.metric("💰 Purse Remaining", f"₹{team.purse_left:.1f}L")
-                else:
-                    st.info("No players in squad")
-            finally:
-                session.close()
+                    st.dataframe(pd.DataFrame(bench_data), use_container_width=True, hide_index=True)
+                
+                # Purse info
+                st.metric("💰 Purse Remaining", f"₹{team.purse_left:.1f}L")
+            else:
+                st.info("No players in squad")
     
     st.divider()
     
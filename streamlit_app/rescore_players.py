@@ -0,0 +1,17 @@
+"""Rescore every stored player with the current scoring weights.
+
+Run after changing the formulas or role weights in services/scoring.py.
+"""
+from models import init_db
+from services.data_service import rescore_players
+
+
+def main():
+    """Recompute stored overall scores."""
+    init_db()
+    count = rescore_players()
+    print(f"Rescored {count} players")
+
+
+if __name__ == '__main__':
+    main()
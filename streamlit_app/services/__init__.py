@@ -1,4 +1,4 @@
 """Services package for Streamlit application."""
-from services import room_service, team_service, auction_service, ai_service, data_service
+from services import room_service, team_service, auction_service, ai_service, columnar_catalog, data_service, results_service, scoring, xi_solver
 
-__all__ = ['room_service', 'team_service', 'auction_service', 'ai_service', 'data_service']
+__all__ = ['room_service', 'team_service', 'auction_service', 'ai_service', 'columnar_catalog', 'data_service', 'results_service', 'scoring', 'xi_solver']
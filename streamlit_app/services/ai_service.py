@@ -1,6 +1,10 @@
 """AI analysis service for team selection and rating."""
-from itertools import combinations
-from models import get_session, Team, TeamPlayer, Player, TeamRating, Room
+from sqlalchemy import exists
+from models import (
+    get_session, unit_of_work, Team, TeamPlayer, Player, TeamRating, Room, AuctionPlayer,
+    TeamView, PlayerView
+)
+from services.xi_solver import solve_playing_xi
 
 
 def select_playing_xi(team_id):
@@ -14,28 +18,17 @@ def select_playing_xi(team_id):
         
         players = [session.query(Player).get(tp.player_id) for tp in team_players]
         
-        best_combination = None
-        best_score = -1
-        
-        for combo in combinations(players, 11):
-            if is_valid_combination(combo):
-                score = sum(p.overall_score for p in combo)
-                if score > best_score:
-                    best_score = score
-                    best_combination = combo
+        best_combination = solve_playing_xi(players)
         
         if best_combination:
+            playing_xi = [PlayerView.from_row(player) for player in best_combination]
+            selected_ids = {player.id for player in playing_xi}
             for tp in team_players:
-                tp.in_playing_xi = False
-            
-            for player in best_combination:
-                tp = session.query(TeamPlayer).filter_by(team_id=team_id, player_id=player.id).first()
-                if tp:
-                    tp.in_playing_xi = True
+                tp.in_playing_xi = tp.player_id in selected_ids
             
             session.commit()
             
-            return list(best_combination)
+            return playing_xi
         
         return []
     except Exception as e:
@@ -94,6 +87,7 @@ def select_impact_player(team_id):
                 best_tp = tp
         
         if best_player:
+            best_player = PlayerView.from_row(best_player)
             for tp in session.query(TeamPlayer).filter_by(team_id=team_id).all():
                 tp.is_impact_player = False
             
@@ -130,38 +124,13 @@ def calculate_team_rating(team_id):
         ).all()
         bench = [session.query(Player).get(tp.player_id) for tp in bench_tps]
         
-        batting_players = [p for p in playing_xi if p.role in ['BAT', 'AR', 'WK']]
-        batting_rating = sum(p.batting_score for p in batting_players) / len(batting_players) if batting_players else 0
-        
-        bowling_players = [p for p in playing_xi if p.role in ['BOWL', 'AR']]
-        bowling_rating = sum(p.bowling_score for p in bowling_players) / len(bowling_players) if bowling_players else 0
-        
-        if batting_rating > 0 and bowling_rating > 0:
-            balance_score = (min(batting_rating, bowling_rating) / max(batting_rating, bowling_rating)) * 100
-        else:
-            balance_score = 0
-        
-        bench_depth = sum(p.overall_score for p in bench) / len(bench) if bench else 0
-        
-        roles_covered = len(set(p.role for p in playing_xi))
-        role_coverage = (roles_covered / 4) * 100
-        
-        avg_score_xi = sum(p.overall_score for p in playing_xi) / len(playing_xi)
-        
-        overall_rating = (0.6 * avg_score_xi) + (0.3 * balance_score) + (0.1 * bench_depth)
-        normalized_rating = min(100, max(0, overall_rating))
-        
         team_rating = session.query(TeamRating).filter_by(team_id=team_id).first()
         if not team_rating:
             team_rating = TeamRating(team_id=team_id)
             session.add(team_rating)
         
-        team_rating.overall_rating = normalized_rating
-        team_rating.batting_rating = batting_rating
-        team_rating.bowling_rating = bowling_rating
-        team_rating.balance_score = balance_score
-        team_rating.bench_depth = bench_depth
-        team_rating.role_coverage = role_coverage
+        for field, value in compute_rating_components(playing_xi, bench).items():
+            setattr(team_rating, field, value)
         
         session.commit()
         
@@ -173,28 +142,174 @@ def calculate_team_rating(team_id):
         session.close()
 
 
-def determine_winner(room_code):
+def compute_rating_components(playing_xi, bench):
+    """
+    Compute team rating components from a playing XI and bench.
+    
+    Args:
+        playing_xi: List of Player objects in the playing XI
+        bench: List of Player objects on the bench
+        
+    Returns:
+        dict: Values for each TeamRating column
+    """
+    batting_players = [p for p in playing_xi if p.role in ['BAT', 'AR', 'WK']]
+    batting_rating = sum(p.batting_score for p in batting_players) / len(batting_players) if batting_players else 0
+    
+    bowling_players = [p for p in playing_xi if p.role in ['BOWL', 'AR']]
+    bowling_rating = sum(p.bowling_score for p in bowling_players) / len(bowling_players) if bowling_players else 0
+    
+    if batting_rating > 0 and bowling_rating > 0:
+        balance_score = (min(batting_rating, bowling_rating) / max(batting_rating, bowling_rating)) * 100
+    else:
+        balance_score = 0
+    
+    bench_depth = sum(p.overall_score for p in bench) / len(bench) if bench else 0
+    
+    roles_covered = len(set(p.role for p in playing_xi))
+    role_coverage = (roles_covered / 4) * 100
+    
+    avg_score_xi = sum(p.overall_score for p in playing_xi) / len(playing_xi)
+    
+    overall_rating = (0.6 * avg_score_xi) + (0.3 * balance_score) + (0.1 * bench_depth)
+    normalized_rating = min(100, max(0, overall_rating))
+    
+    return {
+        'overall_rating': normalized_rating,
+        'batting_rating': batting_rating,
+        'bowling_rating': bowling_rating,
+        'balance_score': balance_score,
+        'bench_depth': bench_depth,
+        'role_coverage': role_coverage
+    }
+
+
+def finalize_room(room_code, uow=None):
+    """
+    Run AI analysis for every team in a room and mark the room completed.
+    
+    All squads are loaded with a single joined query, the playing XI,
+    impact player and rating are computed in memory for each team, and the
+    results are persisted in one transaction.
+    
+    The room is claimed first with a conditional status update that only
+    matches an active room with no unsold lots left. A room still in the
+    lobby or mid-auction is refused, and of racing callers only the one
+    whose update lands does the analysis, so ratings are never written for
+    partial squads or inserted twice.
+    
+    Args:
+        room_code: Code of the room
+        uow: Optional UnitOfWork shared with the rest of the rerun
+        
+    Returns:
+        tuple: (success: bool, message: str)
+    """
+    with unit_of_work(uow) as uow:
+        session = uow.session
+        try:
+            room = uow.get_room(room_code)
+            if not room:
+                return False, "Room not found"
+            
+            if room.status == 'completed':
+                return True, "Room already finalized"
+            
+            # Claim the room; a racing viewer's update matches no row, and
+            # neither does one for an auction with lots left to sell
+            unsold_lots = exists().where(
+                AuctionPlayer.room_id == Room.id,
+                AuctionPlayer.is_sold == False  # noqa: E712
+            )
+            claimed = session.query(Room).filter(
+                Room.id == room.id,
+                Room.status == 'active',
+                ~unsold_lots
+            ).update({'status': 'completed'}, synchronize_session=False)
+            if claimed != 1:
+                session.rollback()
+                if room.status == 'completed':
+                    return True, "Room already finalized"
+                return False, "Auction is not complete"
+            
+            rows = session.query(Team, TeamPlayer, Player, TeamRating).outerjoin(
+                TeamPlayer, TeamPlayer.team_id == Team.id
+            ).outerjoin(
+                Player, Player.id == TeamPlayer.player_id
+            ).outerjoin(
+                TeamRating, TeamRating.team_id == Team.id
+            ).filter(Team.room_id == room.id).all()
+            
+            squads = {}
+            ratings = {}
+            for team, tp, player, team_rating in rows:
+                squad = squads.setdefault(team.id, [])
+                if tp is not None and player is not None:
+                    squad.append((tp, player))
+                if team_rating is not None:
+                    ratings[team.id] = team_rating
+            
+            for team_id, squad in squads.items():
+                # Playing XI
+                if len(squad) >= 11:
+                    best_combination = solve_playing_xi([player for _, player in squad])
+                    if best_combination:
+                        selected_ids = {player.id for player in best_combination}
+                        for tp, _ in squad:
+                            tp.in_playing_xi = tp.player_id in selected_ids
+                
+                playing_xi = [player for tp, player in squad if tp.in_playing_xi]
+                bench_squad = [(tp, player) for tp, player in squad if not tp.in_playing_xi]
+                
+                # Impact player
+                best_tp = None
+                best_score = -1
+                for tp, player in bench_squad:
+                    if player.overall_score > best_score:
+                        best_score = player.overall_score
+                        best_tp = tp
+                
+                if best_tp:
+                    for tp, _ in squad:
+                        tp.is_impact_player = tp is best_tp
+                
+                # Team rating
+                if playing_xi:
+                    team_rating = ratings.get(team_id)
+                    if not team_rating:
+                        team_rating = TeamRating(team_id=team_id)
+                        session.add(team_rating)
+                    
+                    bench = [player for _, player in bench_squad]
+                    for field, value in compute_rating_components(playing_xi, bench).items():
+                        setattr(team_rating, field, value)
+            
+            session.commit()
+            
+            return True, "Room finalized successfully"
+        except Exception as e:
+            session.rollback()
+            return False, f"Error finalizing room: {str(e)}"
+
+
+def determine_winner(room_code, uow=None):
     """Determine the winning team based on highest rating."""
-    session = get_session()
-    try:
-        room = session.query(Room).filter_by(code=room_code).first()
+    with unit_of_work(uow) as uow:
+        room = uow.get_room(room_code)
         if not room:
             return None
         
-        teams = session.query(Team).filter_by(room_id=room.id).all()
-        
-        if not teams:
-            return None
+        # Highest rating wins; the first team wins ties
+        rows = uow.session.query(Team, TeamRating).join(
+            TeamRating, TeamRating.team_id == Team.id
+        ).filter(Team.room_id == room.id).order_by(Team.id).all()
         
         best_team = None
         best_rating = -1
         
-        for team in teams:
-            team_rating = session.query(TeamRating).filter_by(team_id=team.id).first()
-            if team_rating and team_rating.overall_rating > best_rating:
+        for team, team_rating in rows:
+            if team_rating.overall_rating > best_rating:
                 best_rating = team_rating.overall_rating
                 best_team = team
         
-        return best_team
-    finally:
-        session.close()
+        return TeamView.from_row(best_team)
@@ -1,19 +1,28 @@
-"""Auction engine service."""
+"""Auction engine service.
+
+Live auction state (current lot, bid, highest bidder and timer) is kept in
+the ``auction_states`` table, so every app process and every restart sees
+the same auction. Each change bumps the room's ``version``; pollers read
+only that column to find out whether anything changed.
+"""
 from datetime import datetime
-from models import get_session, Room, Player, AuctionPlayer, Team, TeamPlayer
+from sqlalchemy.exc import IntegrityError
+from models import unit_of_work, Room, Player, AuctionPlayer, Team, TeamPlayer, AuctionStateRecord, PlayerView
 from config import Config
 
 
 class AuctionState:
     """Class to represent current auction state."""
     def __init__(self, room_code, current_player=None, current_bid=None, 
-                 highest_bidder=None, timer_remaining=None, auction_complete=False):
+                 highest_bidder=None, timer_remaining=None, auction_complete=False,
+                 lot_seq=None):
         self.room_code = room_code
         self.current_player = current_player
         self.current_bid = current_bid
         self.highest_bidder = highest_bidder
         self.timer_remaining = timer_remaining
         self.auction_complete = auction_complete
+        self.lot_seq = lot_seq
 
 
 class BidResult:
@@ -25,162 +34,249 @@ class BidResult:
         self.highest_bidder = highest_bidder
 
 
-# Global state to track current auction state for each room
-_auction_states = {}
+def _get_state(session, room_code):
+    """Read a room's auction state record, or None if the auction has no state."""
+    # Live state is always re-read, even if the session already holds it
+    return session.query(AuctionStateRecord).populate_existing().filter_by(
+        room_code=room_code
+    ).first()
+
+
+def _new_state(session, room_code):
+    """Add a fresh auction state record for a room."""
+    state = AuctionStateRecord(
+        room_code=room_code,
+        bid_increment=5.0,
+        timer_duration=Config.TIMER_DURATION,
+        lot_seq=0,
+        version=0
+    )
+    session.add(state)
+    return state
 
 
-def initialize_auction(room_code):
+def initialize_auction(room_code, uow=None):
     """Initialize auction for a room by creating AuctionPlayer records."""
-    session = get_session()
-    try:
-        room = session.query(Room).filter_by(code=room_code).first()
-        if not room:
-            return False, "Room not found"
-        
-        # Get all players
-        all_players = session.query(Player).all()
-        
-        # Create AuctionPlayer records for this room
-        for player in all_players:
-            existing = session.query(AuctionPlayer).filter_by(
-                room_id=room.id, 
-                player_id=player.id
+    with unit_of_work(uow) as uow:
+        session = uow.session
+        try:
+            room = uow.get_room(room_code)
+            if not room:
+                return False, "Room not found"
+            
+            # Get all players
+            all_players = session.query(Player).all()
+            
+            # Create AuctionPlayer records for this room
+            for player in all_players:
+                existing = session.query(AuctionPlayer).filter_by(
+                    room_id=room.id, 
+                    player_id=player.id
+                ).first()
+                
+                if not existing:
+                    auction_player = AuctionPlayer(
+                        room_id=room.id,
+                        player_id=player.id,
+                        is_sold=False
+                    )
+                    session.add(auction_player)
+            
+            # Initialize auction state
+            state = _get_state(session, room_code) or _new_state(session, room_code)
+            state.current_player_id = None
+            state.current_bid = None
+            state.highest_bidder = None
+            state.bid_increment = 5.0
+            state.timer_duration = Config.TIMER_DURATION
+            state.timer_start = None
+            state.version += 1
+            
+            session.commit()
+            
+            return True, "Auction initialized successfully"
+        except Exception as e:
+            session.rollback()
+            return False, f"Error initializing auction: {str(e)}"
+
+
+def present_next_player(room_code, uow=None):
+    """
+    Present the next unsold player for auction.
+    
+    Every viewer may ask for the next lot at once; only one of them opens
+    it. The others get the player that is already up.
+    """
+    with unit_of_work(uow) as uow:
+        session = uow.session
+        try:
+            room = uow.get_room(room_code)
+            if not room:
+                return None
+            
+            state = _get_state(session, room_code)
+            if state is not None and state.current_player_id is not None:
+                return PlayerView.from_row(uow.get_player(state.current_player_id))
+            
+            unsold_auction_player = session.query(AuctionPlayer).filter_by(
+                room_id=room.id,
+                is_sold=False
             ).first()
             
-            if not existing:
-                auction_player = AuctionPlayer(
-                    room_id=room.id,
-                    player_id=player.id,
-                    is_sold=False
-                )
-                session.add(auction_player)
-        
-        session.commit()
-        
-        # Initialize auction state
-        _auction_states[room_code] = {
-            'current_player_id': None,
-            'current_bid': None,
-            'highest_bidder': None,
-            'bid_increment': 5.0,
-            'timer_duration': Config.TIMER_DURATION,
-            'timer_start': None
-        }
-        
-        return True, "Auction initialized successfully"
-    except Exception as e:
-        session.rollback()
-        return False, f"Error initializing auction: {str(e)}"
-    finally:
-        session.close()
-
-
-def present_next_player(room_code):
-    """Present the next unsold player for auction."""
-    session = get_session()
-    try:
-        room = session.query(Room).filter_by(code=room_code).first()
-        if not room:
-            return None
-        
-        unsold_auction_player = session.query(AuctionPlayer).filter_by(
-            room_id=room.id,
-            is_sold=False
-        ).first()
-        
-        if not unsold_auction_player:
-            return None
-        
-        player = unsold_auction_player.player
-        
-        if room_code not in _auction_states:
-            _auction_states[room_code] = {
-                'bid_increment': 5.0,
-                'timer_duration': Config.TIMER_DURATION
-            }
-        
-        _auction_states[room_code]['current_player_id'] = player.id
-        _auction_states[room_code]['current_bid'] = player.base_price
-        _auction_states[room_code]['highest_bidder'] = None
-        _auction_states[room_code]['timer_start'] = datetime.utcnow()
-        
-        return player
-    finally:
-        session.close()
+            if not unsold_auction_player:
+                return None
+            
+            player = PlayerView.from_row(unsold_auction_player.player)
+            
+            if state is None:
+                state = _new_state(session, room_code)
+                session.flush()
+            
+            # Open the lot only if nobody changed the state since we read it
+            opened = session.query(AuctionStateRecord).filter_by(
+                room_code=room_code,
+                version=state.version
+            ).update({
+                'current_player_id': player.id,
+                'current_bid': player.base_price,
+                'highest_bidder': None,
+                'timer_start': datetime.utcnow(),
+                'lot_seq': state.lot_seq + 1,
+                'version': state.version + 1
+            }, synchronize_session=False)
+            session.commit()
+            
+            if not opened:
+                return _get_current_player(uow, room_code)
+            
+            return player
+        except IntegrityError:
+            # Another session created the room's state first
+            session.rollback()
+            return _get_current_player(uow, room_code)
+
+
+def _get_current_player(uow, room_code):
+    """Re-read the room's state and get the player currently up, if any."""
+    uow.session.expire_all()
+    state = _get_state(uow.session, room_code)
+    if state is None or state.current_player_id is None:
+        return None
+    return PlayerView.from_row(uow.get_player(state.current_player_id))
 
 
-def place_bid(room_code, username):
+def place_bid(room_code, username, uow=None):
     """Place a bid for the current player."""
-    if room_code not in _auction_states:
-        return BidResult(False, "Auction not initialized", None, None)
-    
-    state = _auction_states[room_code]
-    
-    if state['current_player_id'] is None:
-        return BidResult(False, "No player currently being auctioned", None, None)
-    
-    session = get_session()
-    try:
-        room = session.query(Room).filter_by(code=room_code).first()
+    with unit_of_work(uow) as uow:
+        session = uow.session
+        state = _get_state(session, room_code)
+        if state is None:
+            return BidResult(False, "Auction not initialized", None, None)
+        
+        if state.current_player_id is None:
+            return BidResult(False, "No player currently being auctioned", None, None)
+        
+        room = uow.get_room(room_code)
         if not room:
             return BidResult(False, "Room not found", None, None)
         
-        team = session.query(Team).filter_by(room_id=room.id, username=username).first()
+        team = uow.get_team(room.id, username)
         if not team:
             return BidResult(False, "Team not found", None, None)
         
-        current_bid = state['current_bid']
-        bid_increment = state['bid_increment']
-        new_bid = current_bid + bid_increment
+        new_bid = state.current_bid + state.bid_increment
         
         if team.purse_left < new_bid:
             return BidResult(False, "Insufficient purse for this bid", None, None)
         
-        state['current_bid'] = new_bid
-        state['highest_bidder'] = username
+        # Only store the bid if nobody changed the state since we read it
+        updated = session.query(AuctionStateRecord).filter_by(
+            room_code=room_code,
+            version=state.version
+        ).update({
+            'current_bid': new_bid,
+            'highest_bidder': username,
+            'version': state.version + 1
+        }, synchronize_session=False)
+        session.commit()
+        
+        if not updated:
+            return BidResult(False, "Bid was superseded by another bid, please try again", None, None)
         
         return BidResult(True, "Bid placed successfully", new_bid, username)
-    finally:
-        session.close()
 
 
-def handle_timer_expiry(room_code):
-    """Handle timer expiry and assign player to highest bidder."""
-    if room_code not in _auction_states:
-        return None
+def handle_timer_expiry(room_code, lot_seq=None, uow=None):
+    """
+    Handle timer expiry and assign player to highest bidder.
     
-    state = _auction_states[room_code]
+    Every viewer sees the timer run out, but only one of them settles the
+    lot. It claims the lot by clearing the room's state at the version it
+    read, then sells the player with an update that only matches while it
+    is unsold, so a player is never sold or paid for twice.
     
-    if state['current_player_id'] is None:
-        return None
-    
-    session = get_session()
-    try:
-        room = session.query(Room).filter_by(code=room_code).first()
-        if not room:
-            return None
-        
-        player_id = state['current_player_id']
-        sold_price = state['current_bid']
-        highest_bidder = state['highest_bidder']
-        
-        auction_player = session.query(AuctionPlayer).filter_by(
-            room_id=room.id,
-            player_id=player_id
-        ).first()
-        
-        if not auction_player:
-            return None
-        
-        auction_player.is_sold = True
-        auction_player.sold_price = sold_price
-        auction_player.sold_at = datetime.utcnow()
+    Args:
+        room_code: Code of the room
+        lot_seq: Lot the caller saw expire; ignored if the room moved on
         
-        if highest_bidder:
-            team = session.query(Team).filter_by(room_id=room.id, username=highest_bidder).first()
+    Returns:
+        dict or None: Information about the sold player, or None if there
+            was nothing to settle or another session settled it
+    """
+    with unit_of_work(uow) as uow:
+        session = uow.session
+        try:
+            state = _get_state(session, room_code)
+            if state is None or state.current_player_id is None:
+                return None
+            
+            if lot_seq is not None and state.lot_seq != lot_seq:
+                return None
+            
+            room = uow.get_room(room_code)
+            if not room:
+                return None
+            
+            player_id = state.current_player_id
+            sold_price = state.current_bid
+            highest_bidder = state.highest_bidder
+            
+            # Claim the lot; fails if it was settled or bid on since we read it
+            claimed = session.query(AuctionStateRecord).filter_by(
+                room_code=room_code,
+                version=state.version
+            ).update({
+                'current_player_id': None,
+                'current_bid': None,
+                'highest_bidder': None,
+                'timer_start': None,
+                'version': state.version + 1
+            }, synchronize_session=False)
+            
+            if not claimed:
+                session.rollback()
+                return None
+            
+            team = None
+            if highest_bidder:
+                team = uow.get_team(room.id, highest_bidder)
+            
+            sold = session.query(AuctionPlayer).filter_by(
+                room_id=room.id,
+                player_id=player_id,
+                is_sold=False
+            ).update({
+                'is_sold': True,
+                'sold_price': sold_price,
+                'sold_at': datetime.utcnow(),
+                'sold_to_team_id': team.id if team else None
+            }, synchronize_session=False)
+            
+            if not sold:
+                session.rollback()
+                return None
+            
             if team:
-                auction_player.sold_to_team_id = team.id
-                
                 team_player = TeamPlayer(
                     team_id=team.id,
                     player_id=player_id,
@@ -188,67 +284,83 @@ def handle_timer_expiry(room_code):
                 )
                 session.add(team_player)
                 
-                team.purse_left -= sold_price
-        
-        session.commit()
-        
-        state['current_player_id'] = None
-        state['current_bid'] = None
-        state['highest_bidder'] = None
-        state['timer_start'] = None
-        
-        player = session.query(Player).get(player_id)
-        
-        return {
-            'player': player,
-            'sold_price': sold_price,
-            'sold_to': highest_bidder,
-            'team_id': auction_player.sold_to_team_id
-        }
-    except Exception as e:
-        session.rollback()
-        return None
-    finally:
-        session.close()
+                session.query(Team).filter_by(id=team.id).update({
+                    'purse_left': Team.purse_left - sold_price
+                }, synchronize_session=False)
+            
+            session.commit()
+            
+            player = PlayerView.from_row(uow.get_player(player_id))
+            
+            return {
+                'player': player,
+                'sold_price': sold_price,
+                'sold_to': highest_bidder,
+                'team_id': team.id if team else None
+            }
+        except Exception as e:
+            session.rollback()
+            return None
 
 
-def get_current_auction_state(room_code):
+def get_current_auction_state(room_code, uow=None):
     """Get current state of the auction."""
-    if room_code not in _auction_states:
-        return AuctionState(room_code, auction_complete=False)
-    
-    state = _auction_states[room_code]
-    
-    session = get_session()
-    try:
+    with unit_of_work(uow) as uow:
+        session = uow.session
+        state = _get_state(session, room_code)
+        if state is None:
+            return AuctionState(room_code, auction_complete=False)
+        
         current_player = None
-        if state['current_player_id']:
-            current_player = session.query(Player).get(state['current_player_id'])
+        if state.current_player_id:
+            current_player = PlayerView.from_row(uow.get_player(state.current_player_id))
         
-        room = session.query(Room).filter_by(code=room_code).first()
-        auction_complete = False
-        if room:
-            unsold_count = session.query(AuctionPlayer).filter_by(
-                room_id=room.id,
-                is_sold=False
-            ).count()
-            total_count = session.query(AuctionPlayer).filter_by(room_id=room.id).count()
-            auction_complete = (total_count > 0 and unsold_count == 0)
+        room = uow.get_room(room_code)
+        auction_complete = _auction_complete(session, room.id) if room else False
         
         return AuctionState(
             room_code=room_code,
             current_player=current_player,
-            current_bid=state['current_bid'],
-            highest_bidder=state['highest_bidder'],
-            timer_remaining=state.get('timer_duration', Config.TIMER_DURATION),
-            auction_complete=auction_complete
+            current_bid=state.current_bid,
+            highest_bidder=state.highest_bidder,
+            timer_remaining=state.timer_duration,
+            auction_complete=auction_complete,
+            lot_seq=state.lot_seq
         )
-    finally:
-        session.close()
 
 
-def get_timer_start(room_code):
+def is_auction_complete(room_code, uow=None):
+    """Check whether a room's auction has lots and every one of them is sold."""
+    with unit_of_work(uow) as uow:
+        room = uow.get_room(room_code)
+        if not room:
+            return False
+        return _auction_complete(uow.session, room.id)
+
+
+def _auction_complete(session, room_id):
+    """Check whether a room has lots and none of them is unsold."""
+    unsold_count = session.query(AuctionPlayer).filter_by(
+        room_id=room_id,
+        is_sold=False
+    ).count()
+    total_count = session.query(AuctionPlayer).filter_by(room_id=room_id).count()
+    return total_count > 0 and unsold_count == 0
+
+
+def get_timer_start(room_code, uow=None):
     """Get timer start timestamp for a room."""
-    if room_code in _auction_states:
-        return _auction_states[room_code].get('timer_start')
-    return None
+    with unit_of_work(uow) as uow:
+        return uow.session.query(AuctionStateRecord.timer_start).filter_by(
+            room_code=room_code
+        ).scalar()
+
+
+def get_state_version(room_code, uow=None):
+    """Get the version of a room's auction state; it changes on every lot, bid and settlement."""
+    with unit_of_work(uow) as uow:
+        version = uow.session.query(AuctionStateRecord.version).filter_by(
+            room_code=room_code
+        ).scalar()
+        return version or 0
+
@@ -1,8 +1,12 @@
 """Data service for loading and seeding database."""
 import pandas as pd
 from pathlib import Path
+from sqlalchemy import insert, update
 from models import get_session, Player
 from config import Config
+from services.columnar_catalog import load_or_compile
+from services import scoring
+from services.scoring import calculate_overall_scores, rescore
 
 
 def load_players_from_csv():
@@ -26,29 +30,59 @@ def load_players_from_csv():
         return []
 
 
+def build_players_frame():
+    """
+    Read the players CSV, scoring players with the shared weights.
+    
+    Overall scores are computed from the batting and bowling scores rather
+    than read from the file, so players are rated the same way as in the
+    backend.
+    
+    Returns:
+        DataFrame: Player data
+    """
+    players = pd.read_csv(Config.PLAYERS_CSV)
+    players['overall_score'] = calculate_overall_scores(
+        players['batting_score'], players['bowling_score'], players['role']
+    ).round(2)
+    return players
+
+
+def load_player_catalog():
+    """
+    Load the compiled player catalog, recompiling it if the CSV or the
+    scoring module has changed.
+    
+    Returns:
+        ColumnarCatalog or None: Players, or None if there is no players CSV
+    """
+    if not Path(Config.PLAYERS_CSV).exists():
+        return None
+    # Overall scores are computed while compiling, so new weights recompile too
+    return load_or_compile(Config.PLAYERS_CATALOG, Config.PLAYERS_CSV, build_players_frame,
+                           dependencies=(scoring.__file__,))
+
+
 def seed_database():
-    """Seed database with players from CSV."""
+    """
+    Seed database with players from the compiled player catalog.
+    
+    Players already in the database (matched by name) are skipped; the
+    rest are inserted in one batch.
+    """
     session = get_session()
     try:
-        players_data = load_players_from_csv()
-        
-        for player_data in players_data:
-            # Check if player already exists
-            existing = session.query(Player).filter_by(name=player_data['name']).first()
-            if existing:
-                continue
+        catalog = load_player_catalog()
+        if catalog is not None:
+            seen = {name for (name,) in session.query(Player.name)}
+            new_players = []
+            for record in catalog.records():
+                if record['name'] not in seen:
+                    seen.add(record['name'])
+                    new_players.append(record)
             
-            player = Player(
-                name=player_data['name'],
-                role=player_data['role'],
-                country=player_data['country'],
-                base_price=float(player_data['base_price']),
-                batting_score=float(player_data['batting_score']),
-                bowling_score=float(player_data['bowling_score']),
-                overall_score=float(player_data['overall_score']),
-                is_overseas=bool(player_data['is_overseas'])
-            )
-            session.add(player)
+            if new_players:
+                session.execute(insert(Player), new_players)
         
         session.commit()
         return True
@@ -72,6 +106,39 @@ def seed_database_if_empty():
         session.close()
 
 
+def rescore_players():
+    """
+    Recompute every stored player's overall score with the current weights.
+    
+    All players are read in one query and rescored in one vectorized pass;
+    only the players whose score changed are updated.
+    
+    Returns:
+        int: Number of players whose overall score changed
+    """
+    session = get_session()
+    try:
+        rows = session.query(
+            Player.id, Player.role, Player.batting_score,
+            Player.bowling_score, Player.overall_score
+        ).all()
+        players = pd.DataFrame(rows, columns=['id', 'role', 'batting_score',
+                                              'bowling_score', 'overall_score'])
+        if players.empty:
+            return 0
+        
+        changed = rescore(players)
+        if not changed.empty:
+            session.execute(update(Player), changed.astype(object).to_dict('records'))
+            session.commit()
+        return len(changed)
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+
 def get_all_players():
     """Get all players from database."""
     session = get_session()
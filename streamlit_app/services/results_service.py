@@ -0,0 +1,51 @@
+"""Auction results service."""
+from models import (
+    unit_of_work, Team, TeamRating, TeamPlayer, Player,
+    TeamView, TeamPlayerView, PlayerView, RatingView, TeamResultsView
+)
+
+
+def get_team_results(room_code, uow=None):
+    """
+    Get every team's rating and squad in a room with a single query.
+    
+    Args:
+        room_code: Code of the room
+        uow: Optional UnitOfWork shared with the rest of the rerun
+    
+    Returns:
+        list: One TeamResultsView per team, in team order
+    """
+    with unit_of_work(uow) as uow:
+        room = uow.get_room(room_code)
+        if not room:
+            return []
+        
+        rows = uow.session.query(Team, TeamRating, TeamPlayer, Player).outerjoin(
+            TeamRating, TeamRating.team_id == Team.id
+        ).outerjoin(
+            TeamPlayer, TeamPlayer.team_id == Team.id
+        ).outerjoin(
+            Player, Player.id == TeamPlayer.player_id
+        ).filter(Team.room_id == room.id).order_by(Team.id, TeamRating.id, TeamPlayer.id).all()
+        
+        teams = {}
+        for team, team_rating, team_player, player in rows:
+            entry = teams.get(team.id)
+            if entry is None:
+                entry = teams[team.id] = {
+                    'team': TeamView.from_row(team),
+                    'rating': RatingView.from_row(team_rating),
+                    'squad': {}
+                }
+            # A team with several ratings repeats its squad; keep the first
+            if team_player is not None and player is not None:
+                entry['squad'].setdefault(
+                    team_player.id,
+                    (TeamPlayerView.from_row(team_player), PlayerView.from_row(player))
+                )
+        
+        return [
+            TeamResultsView(entry['team'], entry['rating'], tuple(entry['squad'].values()))
+            for entry in teams.values()
+        ]
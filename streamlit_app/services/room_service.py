@@ -2,216 +2,183 @@
 import random
 import string
 from datetime import datetime
-from models import get_session, Room, User
+from models import unit_of_work, Room, User, RoomView, UserView
 
 
-def generate_room_code(length=6):
+def generate_room_code(length=6, uow=None):
     """
     Generate a unique room code.
     
     Args:
         length: Length of the room code (default 6)
+        uow: Optional UnitOfWork shared with the rest of the rerun
         
     Returns:
         str: Unique room code
     """
-    session = get_session()
-    try:
+    with unit_of_work(uow) as uow:
         while True:
             # Generate random code with uppercase letters and digits
             code = ''.join(random.choices(string.ascii_uppercase + string.digits, k=length))
             
             # Check if code already exists
-            existing_room = session.query(Room).filter_by(code=code).first()
+            existing_room = uow.session.query(Room.id).filter_by(code=code).first()
             if not existing_room:
                 return code
-    finally:
-        session.close()
 
 
-def create_room(host_username):
+def create_room(host_username, uow=None):
     """
     Create a new auction room.
     
     Args:
         host_username: Username of the host creating the room
+        uow: Optional UnitOfWork shared with the rest of the rerun
         
     Returns:
-        Room: Created room object (detached from session)
+        RoomView: Created room
     """
-    session = get_session()
-    try:
-        # Generate unique room code
-        room_code = generate_room_code()
-        
-        # Create room
-        room = Room(
-            code=room_code,
-            host_username=host_username,
-            status='lobby'
-        )
-        
-        session.add(room)
-        session.flush()  # Flush to get the ID without committing
-        
-        # Extract data while session is still open
-        room_code_val = room.code
-        room_id = room.id
-        room_status = room.status
-        room_host = room.host_username
-        room_min_users = room.min_users
-        room_max_users = room.max_users
-        
-        # Add host as first user
-        host_user = User(username=host_username, room_id=room.id)
-        session.add(host_user)
-        session.commit()
-        
-        # Create a detached copy with the extracted data
-        room_data = type('Room', (), {
-            'code': room_code_val,
-            'id': room_id,
-            'status': room_status,
-            'host_username': room_host,
-            'min_users': room_min_users,
-            'max_users': room_max_users
-        })()
-        
-        return room_data
-    except Exception as e:
-        session.rollback()
-        raise e
-    finally:
-        session.close()
+    with unit_of_work(uow) as uow:
+        try:
+            # Generate unique room code
+            room_code = generate_room_code(uow=uow)
+            
+            # Create room
+            room = Room(
+                code=room_code,
+                host_username=host_username,
+                status='lobby'
+            )
+            
+            uow.session.add(room)
+            uow.session.flush()  # Flush to get the ID without committing
+            
+            # Copy the room before the commit expires it
+            room_view = RoomView.from_row(room)
+            
+            # Add host as first user
+            host_user = User(username=host_username, room_id=room.id)
+            uow.session.add(host_user)
+            uow.commit()
+            
+            return room_view
+        except Exception as e:
+            uow.rollback()
+            raise e
 
 
-def join_room(room_code, username):
+def join_room(room_code, username, uow=None):
     """
     Join an existing auction room.
     
     Args:
         room_code: Code of the room to join
         username: Username of the user joining
+        uow: Optional UnitOfWork shared with the rest of the rerun
         
     Returns:
-        tuple: (success: bool, message: str, user: User or None)
+        tuple: (success: bool, message: str, user: UserView or None)
     """
-    session = get_session()
-    try:
-        # Validate room exists
-        room = session.query(Room).filter_by(code=room_code).first()
-        if not room:
-            return False, "Room not found", None
-        
-        # Check if room is active or completed
-        if room.status != 'lobby':
-            return False, "Cannot join active auction", None
-        
-        # Check room capacity
-        current_participants = len(room.users)
-        if current_participants >= room.max_users:
-            return False, "Room is full", None
-        
-        # Create user and add to room
-        user = User(username=username, room_id=room.id)
-        session.add(user)
-        session.commit()
-        
-        return True, "Successfully joined room", user
-    except Exception as e:
-        session.rollback()
-        return False, f"Error joining room: {str(e)}", None
-    finally:
-        session.close()
+    with unit_of_work(uow) as uow:
+        try:
+            # Validate room exists
+            room = uow.get_room(room_code)
+            if not room:
+                return False, "Room not found", None
+            
+            # Check if room is active or completed
+            if room.status != 'lobby':
+                return False, "Cannot join active auction", None
+            
+            # Check room capacity
+            current_participants = len(room.users)
+            if current_participants >= room.max_users:
+                return False, "Room is full", None
+            
+            # Create user and add to room
+            user = User(username=username, room_id=room.id)
+            uow.session.add(user)
+            uow.session.flush()  # Flush to get the ID without committing
+            user_view = UserView.from_row(user)
+            uow.commit()
+            
+            return True, "Successfully joined room", user_view
+        except Exception as e:
+            uow.rollback()
+            return False, f"Error joining room: {str(e)}", None
 
 
-def get_room_participants(room_code):
+def get_room_participants(room_code, uow=None):
     """
     Get list of participants in a room.
     
     Args:
         room_code: Code of the room
+        uow: Optional UnitOfWork shared with the rest of the rerun
         
     Returns:
-        list: List of User objects
+        list: List of UserView objects, in joining order
     """
-    session = get_session()
-    try:
-        room = session.query(Room).filter_by(code=room_code).first()
+    with unit_of_work(uow) as uow:
+        room = uow.get_room(room_code)
         if not room:
             return []
         
-        return room.users
-    finally:
-        session.close()
+        rows = uow.session.query(*UserView.columns(User)).filter(
+            User.room_id == room.id
+        ).order_by(User.id).all()
+        
+        return UserView.from_rows(rows)
 
 
-def start_auction(room_code, host_username):
+def start_auction(room_code, host_username, uow=None):
     """
     Start the auction for a room.
     
     Args:
         room_code: Code of the room
         host_username: Username of the host (for authorization)
+        uow: Optional UnitOfWork shared with the rest of the rerun
         
     Returns:
         tuple: (success: bool, message: str)
     """
-    session = get_session()
-    try:
-        # Get room
-        room = session.query(Room).filter_by(code=room_code).first()
-        if not room:
-            return False, "Room not found"
-        
-        # Verify host
-        if room.host_username != host_username:
-            return False, "Only host can start auction"
-        
-        # Check minimum participants
-        current_participants = len(room.users)
-        if current_participants < room.min_users:
-            return False, f"At least {room.min_users} participants required to start auction"
-        
-        # Transition room to active
-        room.status = 'active'
-        session.commit()
-        
-        return True, "Auction started successfully"
-    except Exception as e:
-        session.rollback()
-        return False, f"Error starting auction: {str(e)}"
-    finally:
-        session.close()
+    with unit_of_work(uow) as uow:
+        try:
+            # Get room
+            room = uow.get_room(room_code)
+            if not room:
+                return False, "Room not found"
+            
+            # Verify host
+            if room.host_username != host_username:
+                return False, "Only host can start auction"
+            
+            # Check minimum participants
+            current_participants = len(room.users)
+            if current_participants < room.min_users:
+                return False, f"At least {room.min_users} participants required to start auction"
+            
+            # Transition room to active
+            room.status = 'active'
+            uow.commit()
+            
+            return True, "Auction started successfully"
+        except Exception as e:
+            uow.rollback()
+            return False, f"Error starting auction: {str(e)}"
 
 
-def get_room(room_code):
+def get_room(room_code, uow=None):
     """
     Get room by code.
     
     Args:
         room_code: Code of the room
+        uow: Optional UnitOfWork shared with the rest of the rerun
         
     Returns:
-        Room or None: Room object if found
+        RoomView or None: Room if found
     """
-    session = get_session()
-    try:
-        room = session.query(Room).filter_by(code=room_code).first()
-        if not room:
-            return None
-        
-        # Create a detached copy with the data we need
-        room_data = type('Room', (), {
-            'code': room.code,
-            'id': room.id,
-            'status': room.status,
-            'host_username': room.host_username,
-            'min_users': room.min_users,
-            'max_users': room.max_users,
-            'users': list(room.users)  # Copy the users list
-        })()
-        
-        return room_data
-    finally:
-        session.close()
+    with unit_of_work(uow) as uow:
+        return RoomView.from_row(uow.get_room(room_code))
@@ -0,0 +1,189 @@
+"""Player scoring: batting, bowling and overall scores.
+
+This is the one definition of how players are rated. Every score the apps
+store, whether it was scraped, seeded or rescored, comes from here. Each
+formula has a scalar entry point for a single player and an array entry
+point that scores whole columns at once. The two give the same results.
+
+When the formulas or role weights change, run ``rescore_players.py`` to
+recompute the scores already stored.
+
+The Flask backend keeps an identical copy in ``app/services/scoring.py``.
+"""
+from typing import Dict
+import numpy as np
+import pandas as pd
+
+# Highest batting, bowling or overall score
+MAX_SCORE = 100.0
+
+# (batting weight, bowling weight) of a player's overall score, by role
+OVERALL_WEIGHTS = {
+    'BAT': (0.8, 0.2),
+    'BOWL': (0.2, 0.8),
+    'AR': (0.5, 0.5),
+    'WK': (0.7, 0.3),  # Keeping is not factored in this simple model
+}
+DEFAULT_OVERALL_WEIGHTS = (0.5, 0.5)
+
+
+def calculate_batting_score(stats: Dict) -> float:
+    """
+    Calculate batting score from raw statistics.
+    
+    Args:
+        stats: Dictionary containing batting statistics (runs, average, strike_rate, etc.)
+    
+    Returns:
+        Batting score as a float
+    """
+    # Extract stats with defaults
+    runs = stats.get('runs', 0)
+    average = stats.get('average', 0)
+    strike_rate = stats.get('strike_rate', 0)
+    
+    # Weighted formula for batting score
+    # Normalize to 0-100 scale
+    batting_score = (runs / 100) * 0.4 + average * 0.3 + (strike_rate / 2) * 0.3
+    return min(batting_score, MAX_SCORE)
+
+
+def calculate_bowling_score(stats: Dict) -> float:
+    """
+    Calculate bowling score from raw statistics.
+    
+    Args:
+        stats: Dictionary containing bowling statistics (wickets, economy, average, etc.)
+    
+    Returns:
+        Bowling score as a float
+    """
+    # Extract stats with defaults
+    wickets = stats.get('wickets', 0)
+    economy = stats.get('economy', 10)  # Lower is better
+    bowling_avg = stats.get('bowling_average', 50)  # Lower is better
+    
+    # Weighted formula for bowling score
+    # Normalize to 0-100 scale
+    wickets_score = min(wickets * 2, 50)  # Cap at 50
+    economy_score = max(0, (10 - economy) * 5)  # Lower economy = higher score
+    avg_score = max(0, (50 - bowling_avg) / 2)  # Lower average = higher score
+    
+    bowling_score = wickets_score * 0.5 + economy_score * 0.3 + avg_score * 0.2
+    return min(bowling_score, MAX_SCORE)
+
+
+def calculate_overall_score(batting_score: float, bowling_score: float, role: str) -> float:
+    """
+    Compute overall player score based on role and statistics.
+    
+    Args:
+        batting_score: Player's batting score
+        bowling_score: Player's bowling score
+        role: Player's role (BAT, BOWL, AR, WK)
+    
+    Returns:
+        Overall score as a float
+    """
+    batting_weight, bowling_weight = OVERALL_WEIGHTS.get(role, DEFAULT_OVERALL_WEIGHTS)
+    return batting_score * batting_weight + bowling_score * bowling_weight
+
+
+def calculate_batting_scores(runs, average, strike_rate) -> np.ndarray:
+    """
+    Calculate batting scores for many players at once.
+    
+    Same formula as calculate_batting_score, applied to whole columns.
+    
+    Args:
+        runs: Array-like of career runs
+        average: Array-like of batting averages
+        strike_rate: Array-like of strike rates
+    
+    Returns:
+        Array of batting scores
+    """
+    runs = np.asarray(runs, dtype=float)
+    average = np.asarray(average, dtype=float)
+    strike_rate = np.asarray(strike_rate, dtype=float)
+    
+    batting_scores = (runs / 100) * 0.4 + average * 0.3 + (strike_rate / 2) * 0.3
+    return np.minimum(batting_scores, MAX_SCORE)
+
+
+def calculate_bowling_scores(wickets, economy, bowling_avg) -> np.ndarray:
+    """
+    Calculate bowling scores for many players at once.
+    
+    Same formula as calculate_bowling_score, applied to whole columns.
+    
+    Args:
+        wickets: Array-like of career wickets
+        economy: Array-like of economy rates
+        bowling_avg: Array-like of bowling averages
+    
+    Returns:
+        Array of bowling scores
+    """
+    wickets = np.asarray(wickets, dtype=float)
+    economy = np.asarray(economy, dtype=float)
+    bowling_avg = np.asarray(bowling_avg, dtype=float)
+    
+    # fmax ignores NaN the way max(0, x) does
+    wickets_score = np.minimum(wickets * 2, 50)
+    economy_score = np.fmax(0, (10 - economy) * 5)
+    avg_score = np.fmax(0, (50 - bowling_avg) / 2)
+    
+    bowling_scores = wickets_score * 0.5 + economy_score * 0.3 + avg_score * 0.2
+    return np.minimum(bowling_scores, MAX_SCORE)
+
+
+def calculate_overall_scores(batting_scores, bowling_scores, roles) -> np.ndarray:
+    """
+    Compute overall scores for many players at once.
+    
+    Same role weights as calculate_overall_score, applied to whole columns.
+    
+    Args:
+        batting_scores: Array-like of batting scores
+        bowling_scores: Array-like of bowling scores
+        roles: Array-like of roles (BAT, BOWL, AR, WK)
+    
+    Returns:
+        Array of overall scores
+    """
+    roles = pd.Series(roles, dtype=object)
+    batting_weights = roles.map(
+        {role: weights[0] for role, weights in OVERALL_WEIGHTS.items()}
+    ).fillna(DEFAULT_OVERALL_WEIGHTS[0]).to_numpy(dtype=float)
+    bowling_weights = roles.map(
+        {role: weights[1] for role, weights in OVERALL_WEIGHTS.items()}
+    ).fillna(DEFAULT_OVERALL_WEIGHTS[1]).to_numpy(dtype=float)
+    
+    return (np.asarray(batting_scores, dtype=float) * batting_weights
+            + np.asarray(bowling_scores, dtype=float) * bowling_weights)
+
+
+def rescore(players: pd.DataFrame) -> pd.DataFrame:
+    """
+    Recompute stored overall scores and keep the ones that changed.
+    
+    Raw statistics are not stored, so overall scores are recomputed from
+    the stored batting and bowling scores, rounded as they are stored.
+    
+    Args:
+        players: DataFrame with id, role, batting_score, bowling_score and
+            overall_score columns
+    
+    Returns:
+        DataFrame of id and new overall_score for players whose score changed
+    """
+    overall_scores = np.round(calculate_overall_scores(
+        players['batting_score'], players['bowling_score'], players['role']
+    ), 2)
+    changed = ~np.isclose(overall_scores, players['overall_score'].to_numpy(dtype=float))
+    
+    return pd.DataFrame({
+        'id': players['id'].to_numpy()[changed],
+        'overall_score': overall_scores[changed]
+    })
@@ -2,10 +2,10 @@
 import os
 import uuid
 from pathlib import Path
-from models import get_session, Team, TeamPlayer, Player
+from models import unit_of_work, Team, TeamPlayer, Player, TeamView, TeamPlayerView, PlayerView
 
 
-def configure_team(room_id, username, team_name, purse, logo_url=None):
+def configure_team(room_id, username, team_name, purse, logo_url=None, uow=None):
     """
     Configure team details for a user in a room.
     
@@ -15,50 +15,49 @@ def configure_team(room_id, username, team_name, purse, logo_url=None):
         team_name: Name of the team
         purse: Starting purse amount
         logo_url: Optional URL/path to team logo
+        uow: Optional UnitOfWork shared with the rest of the rerun
         
     Returns:
-        tuple: (success: bool, message: str, team: Team or None)
+        tuple: (success: bool, message: str, team: TeamView or None)
     """
-    session = get_session()
-    try:
-        # Validate team name
-        if not team_name or not team_name.strip():
-            return False, "Team name cannot be empty", None
-        
-        # Validate purse amount
-        if not isinstance(purse, (int, float)) or purse <= 0:
-            return False, "Purse must be a positive number", None
-        
-        # Check if team already exists for this user in this room
-        existing_team = session.query(Team).filter_by(room_id=room_id, username=username).first()
-        if existing_team:
-            # Update existing team
-            existing_team.team_name = team_name.strip()
-            existing_team.logo_url = logo_url
-            existing_team.initial_purse = purse
-            existing_team.purse_left = purse
-            session.commit()
-            return True, "Team updated successfully", existing_team
-        
-        # Create new team
-        team = Team(
-            room_id=room_id,
-            username=username,
-            team_name=team_name.strip(),
-            logo_url=logo_url,
-            initial_purse=purse,
-            purse_left=purse
-        )
-        
-        session.add(team)
-        session.commit()
-        
-        return True, "Team configured successfully", team
-    except Exception as e:
-        session.rollback()
-        return False, f"Error configuring team: {str(e)}", None
-    finally:
-        session.close()
+    with unit_of_work(uow) as uow:
+        try:
+            # Validate team name
+            if not team_name or not team_name.strip():
+                return False, "Team name cannot be empty", None
+            
+            # Validate purse amount
+            if not isinstance(purse, (int, float)) or purse <= 0:
+                return False, "Purse must be a positive number", None
+            
+            # Check if team already exists for this user in this room
+            existing_team = uow.get_team(room_id, username)
+            if existing_team:
+                # Update existing team
+                existing_team.team_name = team_name.strip()
+                existing_team.logo_url = logo_url
+                existing_team.initial_purse = purse
+                existing_team.purse_left = purse
+                uow.commit()
+                return True, "Team updated successfully", TeamView.from_row(existing_team)
+            
+            # Create new team
+            team = Team(
+                room_id=room_id,
+                username=username,
+                team_name=team_name.strip(),
+                logo_url=logo_url,
+                initial_purse=purse,
+                purse_left=purse
+            )
+            
+            uow.session.add(team)
+            uow.commit()
+            
+            return True, "Team configured successfully", TeamView.from_row(team)
+        except Exception as e:
+            uow.rollback()
+            return False, f"Error configuring team: {str(e)}", None
 
 
 def save_logo(uploaded_file, upload_folder='uploads/logos'):
@@ -94,39 +93,38 @@ def save_logo(uploaded_file, upload_folder='uploads/logos'):
         return False, f"Failed to upload logo: {str(e)}", None
 
 
-def update_purse(team_id, amount):
+def update_purse(team_id, amount, uow=None):
     """
     Update team's remaining purse.
     
     Args:
         team_id: ID of the team
         amount: New purse amount
+        uow: Optional UnitOfWork shared with the rest of the rerun
         
     Returns:
-        tuple: (success: bool, message: str, team: Team or None)
+        tuple: (success: bool, message: str, team: TeamView or None)
     """
-    session = get_session()
-    try:
-        team = session.query(Team).get(team_id)
-        if not team:
-            return False, "Team not found", None
-        
-        # Validate amount
-        if not isinstance(amount, (int, float)) or amount < 0:
-            return False, "Purse amount must be non-negative", None
-        
-        team.purse_left = amount
-        session.commit()
-        
-        return True, "Purse updated successfully", team
-    except Exception as e:
-        session.rollback()
-        return False, f"Error updating purse: {str(e)}", None
-    finally:
-        session.close()
+    with unit_of_work(uow) as uow:
+        try:
+            team = uow.session.get(Team, team_id)
+            if not team:
+                return False, "Team not found", None
+            
+            # Validate amount
+            if not isinstance(amount, (int, float)) or amount < 0:
+                return False, "Purse amount must be non-negative", None
+            
+            team.purse_left = amount
+            uow.commit()
+            
+            return True, "Purse updated successfully", TeamView.from_row(team)
+        except Exception as e:
+            uow.rollback()
+            return False, f"Error updating purse: {str(e)}", None
 
 
-def add_player_to_team(team_id, player_id, price):
+def add_player_to_team(team_id, player_id, price, uow=None):
     """
     Add a player to a team's squad.
     
@@ -134,116 +132,109 @@ def add_player_to_team(team_id, player_id, price):
         team_id: ID of the team
         player_id: ID of the player
         price: Purchase price of the player
+        uow: Optional UnitOfWork shared with the rest of the rerun
         
     Returns:
-        tuple: (success: bool, message: str, team_player: TeamPlayer or None)
+        tuple: (success: bool, message: str, team_player: TeamPlayerView or None)
     """
-    session = get_session()
-    try:
-        # Verify team exists
-        team = session.query(Team).get(team_id)
-        if not team:
-            return False, "Team not found", None
-        
-        # Verify player exists
-        player = session.query(Player).get(player_id)
-        if not player:
-            return False, "Player not found", None
-        
-        # Check if player already in team
-        existing = session.query(TeamPlayer).filter_by(team_id=team_id, player_id=player_id).first()
-        if existing:
-            return False, "Player already in team", None
-        
-        # Create team player record
-        team_player = TeamPlayer(
-            team_id=team_id,
-            player_id=player_id,
-            price=price
-        )
-        
-        session.add(team_player)
-        
-        # Deduct from purse
-        team.purse_left -= price
-        
-        session.commit()
-        
-        return True, "Player added to team successfully", team_player
-    except Exception as e:
-        session.rollback()
-        return False, f"Error adding player to team: {str(e)}", None
-    finally:
-        session.close()
+    with unit_of_work(uow) as uow:
+        session = uow.session
+        try:
+            # Verify team exists
+            team = session.get(Team, team_id)
+            if not team:
+                return False, "Team not found", None
+            
+            # Verify player exists
+            player = uow.get_player(player_id)
+            if not player:
+                return False, "Player not found", None
+            
+            # Check if player already in team
+            existing = session.query(TeamPlayer.id).filter_by(team_id=team_id, player_id=player_id).first()
+            if existing:
+                return False, "Player already in team", None
+            
+            # Create team player record
+            team_player = TeamPlayer(
+                team_id=team_id,
+                player_id=player_id,
+                price=price
+            )
+            
+            session.add(team_player)
+            
+            # Deduct from purse
+            team.purse_left -= price
+            
+            session.flush()  # Flush to fill in the row's ID and defaults
+            team_player_view = TeamPlayerView.from_row(team_player)
+            uow.commit()
+            
+            return True, "Player added to team successfully", team_player_view
+        except Exception as e:
+            uow.rollback()
+            return False, f"Error adding player to team: {str(e)}", None
 
 
-def get_team_squad(team_id):
+def get_team_squad(team_id, uow=None):
     """
     Get all players in a team's squad.
     
     Args:
         team_id: ID of the team
+        uow: Optional UnitOfWork shared with the rest of the rerun
         
     Returns:
-        list: List of Player objects
+        list: List of PlayerView objects
     """
-    session = get_session()
-    try:
-        team = session.query(Team).get(team_id)
-        if not team:
-            return []
-        
-        # Get all team players
-        team_players = session.query(TeamPlayer).filter_by(team_id=team_id).all()
-        
-        # Extract player objects
-        players = [tp.player for tp in team_players]
+    with unit_of_work(uow) as uow:
+        # Read just the player columns of the whole squad in one query
+        rows = uow.session.query(*PlayerView.columns(Player)).join(
+            TeamPlayer, TeamPlayer.player_id == Player.id
+        ).filter(TeamPlayer.team_id == team_id).order_by(TeamPlayer.id).all()
         
-        return players
-    finally:
-        session.close()
+        return PlayerView.from_rows(rows)
 
 
-def get_team(room_code, username):
+def get_team(room_code, username, uow=None):
     """
     Get team for a user in a room.
     
     Args:
         room_code: Code of the room
         username: Username of the team owner
+        uow: Optional UnitOfWork shared with the rest of the rerun
         
     Returns:
-        Team or None: Team object if found
+        TeamView or None: Team if found
     """
-    from models import Room
-    session = get_session()
-    try:
-        room = session.query(Room).filter_by(code=room_code).first()
+    with unit_of_work(uow) as uow:
+        room = uow.get_room(room_code)
         if not room:
             return None
         
-        return session.query(Team).filter_by(room_id=room.id, username=username).first()
-    finally:
-        session.close()
+        return TeamView.from_row(uow.get_team(room.id, username))
 
 
-def get_all_teams(room_code):
+def get_all_teams(room_code, uow=None):
     """
     Get all teams in a room.
     
     Args:
         room_code: Code of the room
+        uow: Optional UnitOfWork shared with the rest of the rerun
         
     Returns:
-        list: List of Team objects
+        list: List of TeamView objects
     """
-    from models import Room
-    session = get_session()
-    try:
-        room = session.query(Room).filter_by(code=room_code).first()
+    with unit_of_work(uow) as uow:
+        room = uow.get_room(room_code)
         if not room:
             return []
         
-        return session.query(Team).filter_by(room_id=room.id).all()
-    finally:
-        session.close()
+        rows = uow.session.query(*TeamView.columns(Team)).filter(
+            Team.room_id == room.id
+        ).order_by(Team.id).all()
+        
+        return TeamView.from_rows(rows)
@@ -100,7 +100,7 @@ class TestCompleteAuctionFlow:
             # Step 9: Determine winner
             winner = ai_service.determine_winner(room.code)
             # Winner might be None if no teams have ratings yet
-            
+        
         finally:
             session.close()
 
@@ -129,6 +129,193 @@ class TestMultiUserSync:
         usernames2 = sorted([p.username for p in participants2])
         
         assert usernames1 == usernames2
+    
+    def test_state_version_changes_only_when_auction_moves(self, db_session):
+        """Test that the state version changes on lots, bids and settlement only."""
+        db_session.add(Player(name="Version Player", role="BAT", country="India",
+                              base_price=2.0, batting_score=50.0, bowling_score=10.0,
+                              overall_score=40.0, is_overseas=False))
+        db_session.commit()
+        
+        room = room_service.create_room("host")
+        room_service.join_room(room.code, "bidder")
+        team_service.configure_team(room.id, "bidder", "Version Team", 100.0)
+        
+        assert auction_service.get_state_version(room.code) == 0
+        auction_service.initialize_auction(room.code)
+        versions = [auction_service.get_state_version(room.code)]
+        
+        auction_service.present_next_player(room.code)
+        versions.append(auction_service.get_state_version(room.code))
+        
+        # Reading the state does not change it
+        auction_service.get_current_auction_state(room.code)
+        assert auction_service.get_state_version(room.code) == versions[-1]
+        
+        assert auction_service.place_bid(room.code, "bidder").success
+        versions.append(auction_service.get_state_version(room.code))
+        
+        auction_service.handle_timer_expiry(room.code)
+        versions.append(auction_service.get_state_version(room.code))
+        
+        assert versions == sorted(set(versions))
+    
+    def test_auction_state_is_shared_across_processes(self, db_session):
+        """Test that auction state lives in the database, not in the process."""
+        import importlib
+        from sqlalchemy import event
+        from models import engine
+        
+        db_session.add(Player(name="Shared Player", role="BOWL", country="India",
+                              base_price=2.0, batting_score=10.0, bowling_score=50.0,
+                              overall_score=40.0, is_overseas=False))
+        db_session.commit()
+        
+        room = room_service.create_room("host")
+        room_service.join_room(room.code, "bidder")
+        team_service.configure_team(room.id, "bidder", "Shared Team", 100.0)
+        auction_service.initialize_auction(room.code)
+        auction_service.present_next_player(room.code)
+        assert auction_service.place_bid(room.code, "bidder").success
+        version = auction_service.get_state_version(room.code)
+        
+        # A reloaded module stands in for a restarted or second process
+        reloaded = importlib.reload(auction_service)
+        state = reloaded.get_current_auction_state(room.code)
+        assert state.current_player.name == "Shared Player"
+        assert state.current_bid == 7.0
+        assert state.highest_bidder == "bidder"
+        
+        # Polling for changes is a single read
+        statements = []
+        def count_statement(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+        event.listen(engine, 'before_cursor_execute', count_statement)
+        try:
+            assert reloaded.get_state_version(room.code) == version
+        finally:
+            event.remove(engine, 'before_cursor_execute', count_statement)
+        assert len(statements) == 1
+    
+    def test_rerun_shares_one_unit_of_work(self, db_session):
+        """Test that services sharing a unit of work look up the room once."""
+        from sqlalchemy import event
+        from models import engine, UnitOfWork
+        
+        room = room_service.create_room("host")
+        room_service.join_room(room.code, "bidder")
+        team_service.configure_team(room.id, "bidder", "Shared UoW Team", 100.0)
+        
+        statements = []
+        def count_statement(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+        event.listen(engine, 'before_cursor_execute', count_statement)
+        try:
+            with UnitOfWork() as uow:
+                assert room_service.get_room(room.code, uow).code == room.code
+                participants = room_service.get_room_participants(room.code, uow)
+                team = team_service.get_team(room.code, "bidder", uow)
+                assert team_service.get_team(room.code, "bidder", uow) == team
+                assert len(team_service.get_all_teams(room.code, uow)) == 1
+                
+                assert {user.username for user in participants} == {"host", "bidder"}
+                assert team.team_name == "Shared UoW Team"
+        finally:
+            event.remove(engine, 'before_cursor_execute', count_statement)
+        
+        room_queries = [s for s in statements if 'FROM rooms' in s and 'JOIN' not in s]
+        assert len(room_queries) == 1
+    
+    def test_results_load_ratings_and_squads_in_one_query(self, db_session):
+        """Test that the results page's ratings and squads come from one query."""
+        from sqlalchemy import event
+        from models import engine, UnitOfWork, TeamPlayer, TeamRating
+        from services import results_service
+        
+        room = room_service.create_room("host")
+        players = [Player(name=f"Results Player {i}", role="BAT", country="India",
+                          base_price=1.0, batting_score=50.0, bowling_score=10.0,
+                          overall_score=40.0 + i, is_overseas=False) for i in range(4)]
+        db_session.add_all(players)
+        db_session.commit()
+        player_ids = [player.id for player in players]
+        for index, username in enumerate(["alpha", "beta"]):
+            room_service.join_room(room.code, username)
+            success, msg, team = team_service.configure_team(room.id, username, f"Team {username}", 100.0)
+            for player_id in player_ids[index * 2:index * 2 + 2]:
+                team_service.add_player_to_team(team.id, player_id, 5.0)
+            db_session.add(TeamRating(team_id=team.id, overall_rating=60.0 + index,
+                                      batting_rating=50.0, bowling_rating=40.0, balance_score=30.0,
+                                      bench_depth=20.0, role_coverage=10.0))
+            db_session.commit()
+        db_session.query(TeamPlayer).filter(TeamPlayer.player_id == player_ids[0]).update(
+            {'in_playing_xi': True, 'is_impact_player': True}
+        )
+        db_session.commit()
+        
+        statements = []
+        def count_statement(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+        with UnitOfWork() as uow:
+            uow.get_room(room.code)
+            event.listen(engine, 'before_cursor_execute', count_statement)
+            try:
+                results = results_service.get_team_results(room.code, uow)
+            finally:
+                event.remove(engine, 'before_cursor_execute', count_statement)
+        
+        assert len(statements) == 1
+        assert [result.team.team_name for result in results] == ["Team alpha", "Team beta"]
+        assert [result.rating.overall_rating for result in results] == [60.0, 61.0]
+        assert [[player.name for tp, player in result.squad] for result in results] == [
+            ["Results Player 0", "Results Player 1"], ["Results Player 2", "Results Player 3"]
+        ]
+        first_pick, first_player = results[0].squad[0]
+        assert (first_pick.in_playing_xi, first_pick.is_impact_player, first_pick.price) == (True, True, 5.0)
+        assert results_service.get_team_results("NOROOM") == []
+
+    
+    def test_services_return_picklable_views(self, db_session):
+        """Test that services return frozen views that compare and pickle by value."""
+        import pickle
+        import dataclasses
+        from models import RoomView, UserView, TeamView, TeamPlayerView, PlayerView, TeamResultsView
+        from services import results_service
+        
+        db_session.add(Player(name="View Player", role="WK", country="India",
+                              base_price=2.0, batting_score=40.0, bowling_score=0.0,
+                              overall_score=30.0, is_overseas=False))
+        db_session.commit()
+        
+        room = room_service.create_room("host")
+        success, msg, user = room_service.join_room(room.code, "bidder")
+        assert isinstance(user, UserView)
+        assert room_service.get_room_participants(room.code)[-1] == user
+        team_service.configure_team(room.id, "bidder", "View Team", 100.0)
+        auction_service.initialize_auction(room.code)
+        player = auction_service.present_next_player(room.code)
+        
+        fetched = room_service.get_room(room.code)
+        assert isinstance(fetched, RoomView)
+        assert fetched == room
+        team = team_service.get_team(room.code, "bidder")
+        assert isinstance(team, TeamView)
+        assert team_service.get_all_teams(room.code) == [team]
+        assert isinstance(player, PlayerView)
+        assert auction_service.get_current_auction_state(room.code).current_player == player
+        
+        success, msg, team_player = team_service.add_player_to_team(team.id, player.id, 2.0)
+        assert isinstance(team_player, TeamPlayerView)
+        assert (team_player.team_id, team_player.player_id, team_player.in_playing_xi) == (team.id, player.id, False)
+        
+        results = results_service.get_team_results(room.code)
+        assert results == [TeamResultsView(team_service.get_team(room.code, "bidder"), None, ((team_player, player),))]
+        
+        for view in (fetched, user, team, player, team_player, results[0]):
+            assert pickle.loads(pickle.dumps(view)) == view
+            assert not hasattr(view, '__dict__')
+            with pytest.raises(dataclasses.FrozenInstanceError):
+                view.id = 0
 
 
 class TestErrorRecovery:
@@ -236,3 +423,417 @@ class TestConcurrentOperations:
                 teams.append(team)
         
         assert len(teams) == 5
+    
+    def test_concurrent_settlement_has_one_winner(self, db_session):
+        """Test that viewers settling the same expired lot sell it exactly once."""
+        import threading
+        from models import Session, Team, TeamPlayer
+        
+        for i in range(2):
+            db_session.add(Player(name=f"Settle Player {i}", role="BAT", country="India",
+                                  base_price=2.0, batting_score=50.0, bowling_score=10.0,
+                                  overall_score=40.0, is_overseas=False))
+        db_session.commit()
+        
+        room = room_service.create_room("host")
+        room_service.join_room(room.code, "bidder")
+        team_service.configure_team(room.id, "bidder", "Settle Team", 100.0)
+        auction_service.initialize_auction(room.code)
+        first = auction_service.present_next_player(room.code)
+        assert auction_service.place_bid(room.code, "bidder").success
+        lot_seq = auction_service.get_current_auction_state(room.code).lot_seq
+        
+        viewers = 10
+        barrier = threading.Barrier(viewers)
+        results = []
+        presented = []
+        
+        def viewer():
+            barrier.wait()
+            result = auction_service.handle_timer_expiry(room.code, lot_seq)
+            if result:
+                results.append(result)
+                presented.append(auction_service.present_next_player(room.code).name)
+            Session.remove()
+        
+        threads = [threading.Thread(target=viewer) for _ in range(viewers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert len(results) == 1
+        assert results[0]['player'].name == first.name
+        assert results[0]['sold_price'] == 7.0
+        
+        db_session.expire_all()
+        team = db_session.query(Team).filter_by(room_id=room.id, username="bidder").one()
+        assert team.purse_left == 93.0
+        assert db_session.query(TeamPlayer).filter_by(team_id=team.id).count() == 1
+        
+        # Exactly one session advanced to the next lot
+        state = auction_service.get_current_auction_state(room.code)
+        assert state.lot_seq == lot_seq + 1
+        assert [state.current_player.name] == presented
+        
+        # Settling the old lot again is a no-op
+        assert auction_service.handle_timer_expiry(room.code, lot_seq) is None
+
+
+class TestRoomFinalization:
+    """Test room-wide AI finalization."""
+    
+    def test_finalize_room_completes_all_teams(self, db_session):
+        """Test finalize_room selects XI, impact player and rating for every team."""
+        from models import Room, Team, TeamPlayer, TeamRating
+        
+        room = Room(code="FIN001", host_username="host", status="active")
+        db_session.add(room)
+        db_session.commit()
+        room_id = room.id
+        
+        roles = ["WK"] * 2 + ["BAT"] * 5 + ["BOWL"] * 4 + ["AR"] * 3
+        for t in range(2):
+            team = Team(
+                room_id=room_id,
+                username=f"user{t}",
+                team_name=f"Team {t}",
+                initial_purse=100.0,
+                purse_left=100.0
+            )
+            db_session.add(team)
+            db_session.commit()
+            
+            for i, role in enumerate(roles):
+                player = Player(
+                    name=f"P{t}_{i}",
+                    role=role,
+                    country="India",
+                    base_price=1.0,
+                    batting_score=40.0 + i,
+                    bowling_score=60.0 - i,
+                    overall_score=30.0 + i * 2,
+                    is_overseas=False
+                )
+                db_session.add(player)
+                db_session.commit()
+                db_session.add(TeamPlayer(team_id=team.id, player_id=player.id, price=1.0))
+            db_session.commit()
+        
+        success, msg = ai_service.finalize_room("FIN001")
+        assert success is True
+        
+        assert db_session.query(Room).filter_by(code="FIN001").one().status == "completed"
+        
+        for team in db_session.query(Team).filter_by(room_id=room_id).all():
+            team_players = db_session.query(TeamPlayer).filter_by(team_id=team.id).all()
+            playing_xi = [tp.player for tp in team_players if tp.in_playing_xi]
+            assert ai_service.is_valid_combination(playing_xi)
+            
+            impact = [tp for tp in team_players if tp.is_impact_player]
+            assert len(impact) == 1
+            assert not impact[0].in_playing_xi
+            
+            assert db_session.query(TeamRating).filter_by(team_id=team.id).count() == 1
+        
+        # Running again is a no-op
+        success, msg = ai_service.finalize_room("FIN001")
+        assert success is True
+
+
+    def test_finalize_room_runs_once_for_racing_viewers(self, db_session):
+        """Test a viewer that saw the room unfinished does not finalize it again."""
+        from models import Room, Team, UnitOfWork, new_session
+        
+        room = Room(code="FIN002", host_username="host", status="active")
+        db_session.add(room)
+        db_session.commit()
+        db_session.add(Team(room_id=room.id, username="host", team_name="Host XI",
+                            initial_purse=100.0, purse_left=100.0))
+        db_session.commit()
+        
+        # This viewer read the room before another one finalized it
+        with UnitOfWork(new_session()) as uow:
+            assert uow.get_room("FIN002").status == "active"
+            
+            success, msg = ai_service.finalize_room("FIN002")
+            assert msg == "Room finalized successfully"
+            
+            success, msg = ai_service.finalize_room("FIN002", uow)
+            assert success is True
+            assert msg == "Room already finalized"
+    
+    def test_finalize_room_refuses_unfinished_auctions(self, db_session):
+        """Test a room in the lobby or with unsold lots is not finalized."""
+        from models import Room, Team
+        
+        room = Room(code="FIN003", host_username="host", status="lobby")
+        db_session.add(room)
+        db_session.commit()
+        db_session.add(Team(room_id=room.id, username="host", team_name="Host XI",
+                            initial_purse=100.0, purse_left=100.0))
+        player = Player(name="Unsold", role="BAT", country="India", base_price=1.0,
+                        batting_score=50.0, bowling_score=10.0, overall_score=42.0,
+                        is_overseas=False)
+        db_session.add(player)
+        db_session.commit()
+        db_session.add(AuctionPlayer(room_id=room.id, player_id=player.id, is_sold=False))
+        db_session.commit()
+        
+        assert ai_service.finalize_room("FIN003") == (False, "Auction is not complete")
+        
+        db_session.query(Room).filter_by(code="FIN003").update({"status": "active"})
+        db_session.commit()
+        assert auction_service.is_auction_complete("FIN003") is False
+        assert ai_service.finalize_room("FIN003") == (False, "Auction is not complete")
+        assert db_session.query(Room).filter_by(code="FIN003").one().status == "active"
+        
+        db_session.query(AuctionPlayer).update({"is_sold": True})
+        db_session.commit()
+        assert auction_service.is_auction_complete("FIN003") is True
+        assert ai_service.finalize_room("FIN003") == (True, "Room finalized successfully")
+
+
+class TestDatabaseSetup:
+    """Test one-time database setup."""
+    
+    def test_ensure_database_runs_once(self, monkeypatch):
+        """Test that setup runs on the first rerun only."""
+        from utils import db_utils
+        from services import data_service
+        
+        calls = []
+        monkeypatch.setattr(db_utils, 'init_db', lambda: calls.append('init_db'))
+        monkeypatch.setattr(data_service, 'seed_database_if_empty', lambda: calls.append('seed'))
+        monkeypatch.setattr(db_utils, '_database_ready', False)
+        
+        assert db_utils.ensure_database() is True
+        for _ in range(5):
+            assert db_utils.ensure_database() is False
+        
+        assert calls == ['init_db', 'seed']
+    
+    def test_migrations_upgrade_legacy_database_in_place(self, tmp_path):
+        """Test that an old database is migrated without losing its rooms."""
+        from sqlalchemy import create_engine, event, inspect, text
+        from models import Base, migrate
+        from models.base import DB_SCHEMA_VERSION
+        from models.migrations import MIGRATIONS, get_schema_version
+        
+        assert MIGRATIONS[-1][0] == DB_SCHEMA_VERSION
+        
+        engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+        legacy_tables = [table for table in Base.metadata.sorted_tables
+                         if table.name not in ('auction_states', 'schema_migrations')]
+        Base.metadata.create_all(engine, tables=legacy_tables)
+        with engine.begin() as conn:
+            conn.execute(text("INSERT INTO rooms (code, status, min_users, max_users, host_username) "
+                              "VALUES ('OLD001', 'active', 2, 10, 'host')"))
+        
+        assert migrate(engine) == [version for version, _, _ in MIGRATIONS]
+        
+        columns = {col['name'] for col in inspect(engine).get_columns('auction_states')}
+        assert 'lot_seq' in columns
+        with engine.connect() as conn:
+            assert conn.execute(text("SELECT code FROM rooms")).scalars().all() == ['OLD001']
+            assert get_schema_version(conn) == DB_SCHEMA_VERSION
+        
+        # Nothing to do is a single query
+        statements = []
+        def count_statement(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+        event.listen(engine, 'before_cursor_execute', count_statement)
+        try:
+            assert migrate(engine) == []
+        finally:
+            event.remove(engine, 'before_cursor_execute', count_statement)
+        assert len(statements) == 1
+        engine.dispose()
+    
+    def test_migrations_merge_duplicate_teams(self, tmp_path):
+        """Test that duplicate teams with players are merged so the unique index can be built."""
+        from sqlalchemy import create_engine, insert, text
+        from models import Base, migrate, Room, Team, TeamPlayer, TeamRating, AuctionPlayer
+        
+        engine = create_engine(f"sqlite:///{tmp_path / 'duplicates.db'}")
+        legacy_tables = [table for table in Base.metadata.sorted_tables
+                         if table.name not in ('auction_states', 'schema_migrations')]
+        Base.metadata.create_all(engine, tables=legacy_tables)
+        with engine.begin() as conn:
+            # A database from before the unique indexes, holding duplicates
+            conn.execute(text("DROP INDEX uq_teams_room_username"))
+            conn.execute(text("DROP INDEX uq_team_players_team_player"))
+            conn.execute(insert(Room), [{'id': 1, 'code': 'DUP001', 'host_username': 'host'}])
+            conn.execute(insert(Team), [
+                {'id': team_id, 'room_id': 1, 'username': username, 'team_name': username,
+                 'initial_purse': 100.0, 'purse_left': purse_left}
+                for team_id, username, purse_left in (
+                    (1, 'host', 90.0), (2, 'host', 80.0), (3, 'host', 100.0), (4, 'rival', 100.0)
+                )
+            ])
+            conn.execute(insert(TeamPlayer), [
+                {'team_id': team_id, 'player_id': player_id, 'price': price}
+                for team_id, player_id, price in ((1, 1, 10.0), (2, 2, 20.0), (3, 1, 10.0))
+            ])
+            conn.execute(insert(AuctionPlayer), [
+                {'room_id': 1, 'player_id': player_id, 'is_sold': True, 'sold_to_team_id': team_id}
+                for player_id, team_id in ((1, 1), (2, 2))
+            ])
+            conn.execute(insert(TeamRating), [
+                dict({field: 50.0 for field in ('overall_rating', 'batting_rating', 'bowling_rating',
+                                                'balance_score', 'bench_depth', 'role_coverage')},
+                     team_id=team_id)
+                for team_id in (2, 3)
+            ])
+        
+        migrate(engine)
+        
+        with engine.connect() as conn:
+            teams = dict(conn.execute(text("SELECT id, purse_left FROM teams")).all())
+            assert teams == {1: 70.0, 4: 100.0}
+            squad = conn.execute(text("SELECT team_id, player_id FROM team_players ORDER BY player_id")).all()
+            assert [tuple(row) for row in squad] == [(1, 1), (1, 2)]
+            assert conn.execute(text("SELECT DISTINCT sold_to_team_id FROM auction_players")).scalars().all() == [1]
+            assert conn.execute(text("SELECT team_id FROM team_ratings")).scalars().all() == [1]
+            indexes = {row[1]: row[2] for row in conn.execute(text("PRAGMA index_list('teams')"))}
+            assert indexes['uq_teams_room_username'] == 1
+        engine.dispose()
+    
+    def test_migrations_create_new_database_at_current_version(self, tmp_path):
+        """Test that a new database gets the current schema directly."""
+        from sqlalchemy import create_engine, inspect
+        from models import Base, migrate
+        from models.base import DB_SCHEMA_VERSION
+        
+        engine = create_engine(f"sqlite:///{tmp_path / 'new.db'}")
+        assert migrate(engine) == [DB_SCHEMA_VERSION]
+        assert set(Base.metadata.tables) <= set(inspect(engine).get_table_names())
+        assert migrate(engine) == []
+        engine.dispose()
+    
+    def test_configured_engine_has_no_lock_errors_under_contention(self, tmp_path):
+        """Test that concurrent bidders on the configured SQLite engine never see a lock error."""
+        from sqlalchemy import text
+        from models import base
+        from models.db_config import create_configured_engine
+        from benchmarks.bid_contention import run_contention, _bind
+        
+        engine = create_configured_engine(f"sqlite:///{tmp_path / 'contention.db'}")
+        try:
+            with engine.connect() as conn:
+                assert conn.execute(text("PRAGMA journal_mode")).scalar() == 'wal'
+                assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+            
+            result = run_contention(engine, bidders=10, bids_per_bidder=5)
+        finally:
+            _bind(base.engine)
+            engine.dispose()
+        
+        assert result['lock_errors'] == 0
+        assert result['accepted'] >= 1
+        assert result['accepted'] + result['superseded'] == result['attempts']
+    
+    def test_hot_queries_use_indexes_with_10k_rooms(self, tmp_path):
+        """Test that lot, squad and team lookups use an index over a large history."""
+        from sqlalchemy import create_engine, insert, text
+        from sqlalchemy.orm import Session as OrmSession
+        from models import migrate, Room, Team, TeamPlayer, AuctionPlayer
+        
+        engine = create_engine(f"sqlite:///{tmp_path / 'history.db'}")
+        migrate(engine)
+        
+        rooms = 10000
+        with engine.begin() as conn:
+            conn.execute(insert(Room), [
+                {'id': i, 'code': f'R{i:05d}', 'status': 'completed', 'host_username': 'host'}
+                for i in range(1, rooms + 1)
+            ])
+            conn.execute(insert(Team), [
+                {'id': i * 2 + seat, 'room_id': i, 'username': f'user{seat}',
+                 'team_name': f'Team {seat}', 'initial_purse': 100.0, 'purse_left': 50.0}
+                for i in range(1, rooms + 1) for seat in range(2)
+            ])
+            conn.execute(insert(AuctionPlayer), [
+                {'room_id': i, 'player_id': player, 'is_sold': player % 2 == 0}
+                for i in range(1, rooms + 1) for player in range(1, 6)
+            ])
+            conn.execute(insert(TeamPlayer), [
+                {'team_id': i * 2, 'player_id': player, 'price': 5.0, 'in_playing_xi': player < 4}
+                for i in range(1, rooms + 1) for player in range(1, 6)
+            ])
+        
+        session = OrmSession(engine)
+        hot_queries = {
+            'unsold lots': session.query(AuctionPlayer).filter_by(room_id=5000, is_sold=False),
+            'lot to sell': session.query(AuctionPlayer).filter_by(room_id=5000, player_id=3, is_sold=False),
+            'playing xi': session.query(TeamPlayer).filter_by(team_id=10000, in_playing_xi=True),
+            'squad slot': session.query(TeamPlayer).filter_by(team_id=10000, player_id=3),
+            'user team': session.query(Team).filter_by(room_id=5000, username='user1'),
+        }
+        try:
+            with engine.connect() as conn:
+                for label, query in hot_queries.items():
+                    sql = str(query.statement.compile(engine, compile_kwargs={'literal_binds': True}))
+                    plan = ' '.join(row[-1] for row in conn.execute(text(f"EXPLAIN QUERY PLAN {sql}")))
+                    assert 'USING INDEX' in plan or 'USING COVERING INDEX' in plan, (label, plan)
+            
+            # Unique indexes stop a player being added to a squad twice
+            from sqlalchemy.exc import IntegrityError
+            with pytest.raises(IntegrityError):
+                with engine.begin() as conn:
+                    conn.execute(insert(TeamPlayer), [{'team_id': 2, 'player_id': 1, 'price': 9.0}])
+        finally:
+            session.close()
+            engine.dispose()
+    
+    def test_seed_and_rescore_use_shared_scoring(self, db_session, monkeypatch):
+        """Test that seeded and rescored players are rated by the scoring module."""
+        from models import Player
+        from services import data_service, scoring
+        
+        assert data_service.seed_database() is True
+        players = db_session.query(Player).all()
+        assert players
+        for player in players:
+            expected = scoring.calculate_overall_score(player.batting_score, player.bowling_score, player.role)
+            assert abs(player.overall_score - expected) <= 0.005 + 1e-9
+        
+        assert data_service.rescore_players() == 0
+        
+        monkeypatch.setitem(scoring.OVERALL_WEIGHTS, 'WK', (0.9, 0.1))
+        keepers = db_session.query(Player).filter_by(role='WK').count()
+        assert data_service.rescore_players() == keepers
+        
+        db_session.expire_all()
+        for player in db_session.query(Player).filter_by(role='WK'):
+            assert abs(player.overall_score - (player.batting_score * 0.9 + player.bowling_score * 0.1)) <= 0.005 + 1e-9
+    
+    def test_seed_database_from_compiled_catalog(self, db_session, tmp_path, monkeypatch):
+        """Test that seeding compiles the players CSV once and recompiles it when it changes."""
+        import pandas as pd
+        from config import Config
+        from models import Player
+        from services import data_service
+        
+        players_csv = tmp_path / 'players.csv'
+        players = pd.read_csv(Config.PLAYERS_CSV)
+        players.head(10).to_csv(players_csv, index=False)
+        monkeypatch.setattr(Config, 'PLAYERS_CSV', players_csv)
+        monkeypatch.setattr(Config, 'PLAYERS_CATALOG', tmp_path / 'players.npz')
+        
+        builds = []
+        build_players_frame = data_service.build_players_frame
+        monkeypatch.setattr(data_service, 'build_players_frame',
+                            lambda: builds.append(1) or build_players_frame())
+        
+        assert data_service.seed_database() is True
+        assert data_service.seed_database() is True
+        assert db_session.query(Player).count() == 10
+        assert len(builds) == 1
+        
+        # New players in the CSV are compiled and added; existing ones are kept
+        players.head(15).to_csv(players_csv, index=False)
+        assert data_service.seed_database() is True
+        assert db_session.query(Player).count() == 15
+        assert len(builds) == 2
+
@@ -1,4 +1,4 @@
 """Utilities package for Streamlit application."""
-from utils import validation, db_utils, timer
+from utils import validation, db_utils, timer, timing
 
-__all__ = ['validation', 'db_utils', 'timer']
+__all__ = ['validation', 'db_utils', 'timer', 'timing']
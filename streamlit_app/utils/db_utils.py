@@ -1,34 +1,11 @@
 """Database utilities."""
-import time
-from functools import wraps
+import threading
 from models import get_session, init_db
 
 
-def retry_on_lock(max_retries=3, delay=0.5):
-    """
-    Decorator to retry database operations on lock.
-    
-    Args:
-        max_retries: Maximum number of retry attempts
-        delay: Delay between retries in seconds
-        
-    Returns:
-        Decorated function
-    """
-    def decorator(func):
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            for attempt in range(max_retries):
-                try:
-                    return func(*args, **kwargs)
-                except Exception as e:
-                    if 'database is locked' in str(e).lower() and attempt < max_retries - 1:
-                        time.sleep(delay * (2 ** attempt))  # Exponential backoff
-                        continue
-                    raise e
-            return None
-        return wrapper
-    return decorator
+# One-time database setup state for this process
+_database_ready = False
+_database_lock = threading.Lock()
 
 
 def initialize_database():
@@ -41,6 +18,32 @@ def initialize_database():
         return False
 
 
+def ensure_database():
+    """
+    Create tables and seed players once per process.
+    
+    Streamlit reruns the app script on every interaction, so setup that
+    only needs to happen once is guarded here instead of repeated.
+    
+    Returns:
+        bool: True if this call ran the setup, False if it was already done
+    """
+    global _database_ready
+    
+    if _database_ready:
+        return False
+    
+    with _database_lock:
+        if _database_ready:
+            return False
+        
+        from services.data_service import seed_database_if_empty
+        init_db()
+        seed_database_if_empty()
+        _database_ready = True
+        return True
+
+
 def get_db_session():
     """Get a new database session."""
     return get_session()
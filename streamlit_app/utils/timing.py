@@ -0,0 +1,79 @@
+"""Timing instrumentation for script reruns.
+
+Streamlit re-executes the whole script on every interaction and on every
+auto-refresh, so fixed per-rerun costs add up. Durations are recorded per
+label in this process and summarized for the debug sidebar.
+"""
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# Number of recent samples kept per label
+MAX_SAMPLES = 200
+
+_samples = {}
+_samples_lock = threading.Lock()
+
+
+def record(label, elapsed_ms):
+    """
+    Record one duration.
+    
+    Args:
+        label: Name of the timed step
+        elapsed_ms: Duration in milliseconds
+    """
+    with _samples_lock:
+        samples = _samples.get(label)
+        if samples is None:
+            samples = _samples[label] = deque(maxlen=MAX_SAMPLES)
+        samples.append(elapsed_ms)
+
+
+@contextmanager
+def timed(label):
+    """
+    Time a block of code and record its duration under ``label``.
+    
+    The duration is recorded even if the block raises, e.g. when
+    ``st.rerun()`` interrupts the script.
+    
+    Args:
+        label: Name of the timed step
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(label, (time.perf_counter() - started) * 1000)
+
+
+def summary():
+    """
+    Summarize recorded durations.
+    
+    Returns:
+        dict: label -> {'count', 'last_ms', 'mean_ms', 'p95_ms'}
+    """
+    with _samples_lock:
+        snapshot = {label: list(samples) for label, samples in _samples.items()}
+    
+    result = {}
+    for label, samples in snapshot.items():
+        if not samples:
+            continue
+        ordered = sorted(samples)
+        result[label] = {
+            'count': len(samples),
+            'last_ms': samples[-1],
+            'mean_ms': sum(samples) / len(samples),
+            'p95_ms': ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+        }
+    return result
+
+
+def reset():
+    """Forget all recorded durations."""
+    with _samples_lock:
+        _samples.clear()